@@ -1,28 +1,35 @@
 import importlib.metadata as importlib_metadata
+import json
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from email import policy
-from time import sleep
+from time import monotonic, sleep
 
 import boto3
 import django
+from botocore.exceptions import ClientError
 from botocore.vendored.requests.packages.urllib3.exceptions import ResponseError
+from django.conf import settings as django_settings
 from django.core.mail import EmailMessage
 from django.core.mail.backends.base import BaseEmailBackend
 
 from django_ses import signals
+from django_ses.client_pool import client_pool, config_key
 from django_ses.conf import settings
+from django_ses.retry import SEND_ERRORS, RetryPolicy, SendOutcome
+from django_ses.throttle import get_rate_controller, get_rate_limiter, is_throttling_error
 
 __version__ = importlib_metadata.version(__name__)
 __all__ = ("SESBackend",)
 
-# These would be nice to make class-level variables, but the backend is
-# re-created for each outgoing email/batch.
-# recent_send_times also is not going to work quite right if there are multiple
-# email backends with different rate limits returned by SES, but that seems
-# like it would be rare.
+# This would be nice to make a class-level variable, but the backend is
+# re-created for each outgoing email/batch. The matching rate limiters live in
+# django_ses.throttle.
 cached_rate_limits = {}
-recent_send_times = []
+rate_limits_fetched_at = {}
+
+# SendBulkEmail accepts at most this many BulkEmailEntries per call.
+BULK_EMAIL_MAX_ENTRIES = 50
 
 logger = logging.getLogger("django_ses")
 
@@ -104,6 +111,7 @@ class SESBackend(BaseEmailBackend):
         ses_return_path_arn=None,
         use_ses_v2=False,
         aws_global_endpoint_id=None,
+        send_concurrency=None,
         **kwargs,
     ):
 
@@ -115,6 +123,7 @@ class SESBackend(BaseEmailBackend):
         self._region_name = aws_region_name if aws_region_name else settings.AWS_SES_REGION_NAME
         self._endpoint_url = aws_region_endpoint if aws_region_endpoint else settings.AWS_SES_REGION_ENDPOINT_URL
         self._throttle = cast_nonzero_to_float(aws_auto_throttle or settings.AWS_SES_AUTO_THROTTLE)
+        self._adaptive_throttle = settings.AWS_SES_ADAPTIVE_THROTTLE
         self._config = aws_config or settings.AWS_SES_CONFIG
 
         self.dkim_domain = dkim_domain or settings.DKIM_DOMAIN
@@ -137,7 +146,20 @@ class SESBackend(BaseEmailBackend):
                 "Global endpoints (Multi-Region Endpoints) are only supported by SES API v2."
             )
 
+        self._use_client_pool = settings.AWS_SES_CLIENT_POOL
+        self._send_concurrency = int(send_concurrency or settings.AWS_SES_SEND_CONCURRENCY or 1)
+
+        self._retry_policy = RetryPolicy(
+            max_retries=settings.AWS_SES_MAX_RETRIES,
+            base_delay=settings.AWS_SES_RETRY_BASE_DELAY,
+            max_delay=settings.AWS_SES_RETRY_MAX_DELAY,
+            budget_ratio=settings.AWS_SES_RETRY_BUDGET,
+        )
+        # The SendOutcome of every message handed to the last send_messages() call.
+        self.outcomes = []
+
         self.connection = None
+        self._client_pool_key = None
 
     def create_session(self) -> boto3.Session:
         if self._session_profile:
@@ -157,21 +179,51 @@ class SESBackend(BaseEmailBackend):
             return False
 
         try:
-            self.connection = self.create_session().client(
-                "sesv2" if self._use_ses_v2 else "ses",
-                region_name=self._region_name,
-                endpoint_url=self._endpoint_url,
-                config=self._config,
-            )
-
+            if self._use_client_pool:
+                key = self._get_client_pool_key()
+                self.connection = client_pool.borrow(key, self._create_client)
+                self._client_pool_key = key
+            else:
+                self.connection = self._create_client()
         except Exception:
             if not self.fail_silently:
                 raise
+            return False
+
+        return True
 
     def close(self):
-        """Close any open HTTP connections to the API server."""
+        """Close any open HTTP connections to the API server.
+
+        Pooled clients are handed back to the process-wide pool and stay
+        connected for the next backend instance.
+        """
+        if self._client_pool_key is not None:
+            client_pool.release(self._client_pool_key, self.connection)
+            self._client_pool_key = None
         self.connection = None
 
+    def _create_client(self):
+        return self.create_session().client(
+            "sesv2" if self._use_ses_v2 else "ses",
+            region_name=self._region_name,
+            endpoint_url=self._endpoint_url,
+            config=self._config,
+        )
+
+    def _get_client_pool_key(self):
+        return (
+            type(self),
+            self._session_profile,
+            self._access_key_id,
+            self._access_key,
+            self._session_token,
+            self._region_name,
+            self._endpoint_url,
+            config_key(self._config),
+            self._use_ses_v2,
+        )
+
     def send_messages(self, email_messages):
         """Sends one or more EmailMessage objects and returns the number of
         email messages sent.
@@ -184,131 +236,396 @@ class SESBackend(BaseEmailBackend):
             # Failed silently
             return
 
-        num_sent = 0
         source = settings.AWS_SES_FROM_EMAIL
         email_feedback = settings.AWS_SES_RETURN_PATH
-        for message in email_messages:
-            if settings.AWS_SES_USE_BLACKLIST:
-                from django_ses import utils
+        messages = self._prepare_messages(email_messages)
+        budget = self._retry_policy.budget(len(messages))
 
-                message.to = utils.filter_blacklisted_recipients(message.to)
-                message.cc = utils.filter_blacklisted_recipients(message.cc)
-                message.bcc = utils.filter_blacklisted_recipients(message.bcc)
+        try:
+            if self._send_concurrency > 1 and len(messages) > 1:
+                self.outcomes = self._send_messages_concurrently(messages, source, email_feedback, budget)
+            else:
+                self.outcomes = [self._send_message(message, source, email_feedback, budget) for message in messages]
+        finally:
+            if new_conn_created:
+                self.close()
 
-                if len(message.to) + len(message.cc) + len(message.bcc) == 0:
-                    logger.debug("Refusing to send email. All recipients were filtered by the blacklist")
-                    continue
+        return self._count_sent(self.outcomes)
+
+    def _count_sent(self, outcomes):
+        """Return the number of messages sent, raising the first failure unless ``fail_silently``."""
+        if not self.fail_silently:
+            for outcome in outcomes:
+                if outcome.error is not None:
+                    raise outcome.error
+        return sum(1 for outcome in outcomes if outcome.sent)
+
+    def _prepare_messages(self, email_messages):
+        """Return the messages that should be sent, ready to be serialized."""
+        blacklisted = None
+        if settings.AWS_SES_USE_BLACKLIST:
+            from django_ses import utils
+
+            # Look up the recipients of the whole batch at once rather than
+            # querying the blacklist for every message.
+            blacklisted = utils.get_blacklisted_emails(
+                address for message in email_messages for address in message.recipients()
+            )
+        return [message for message in email_messages if self._prepare_message(message, blacklisted)]
 
-            # SES Configuration sets. If the AWS_SES_CONFIGURATION_SET setting
-            # is not None, append the appropriate header to the message so that
-            # SES knows which configuration set it belongs to.
-            #
-            # If settings.AWS_SES_CONFIGURATION_SET is a callable, pass it the
-            # message object and dkim settings and expect it to return a string
-            # containing the SES Configuration Set name.
-            if settings.AWS_SES_CONFIGURATION_SET and "X-SES-CONFIGURATION-SET" not in message.extra_headers:
-                if callable(settings.AWS_SES_CONFIGURATION_SET):
-                    message.extra_headers["X-SES-CONFIGURATION-SET"] = settings.AWS_SES_CONFIGURATION_SET(
-                        message,
-                        dkim_domain=self.dkim_domain,
-                        dkim_key=self.dkim_key,
-                        dkim_selector=self.dkim_selector,
-                        dkim_headers=self.dkim_headers,
-                    )
-                else:
-                    message.extra_headers["X-SES-CONFIGURATION-SET"] = settings.AWS_SES_CONFIGURATION_SET
+    def _prepare_message(self, message, blacklisted=None):
+        """Apply the blacklist and configuration set to ``message``.
+
+        ``blacklisted`` is the set of blacklisted addresses among the
+        recipients of the batch. Returns False if the message should not be
+        sent at all.
+        """
+        if settings.AWS_SES_USE_BLACKLIST:
+            from django_ses import utils
+
+            if blacklisted is None:
+                blacklisted = utils.get_blacklisted_emails(message.recipients())
+            message.to = utils.filter_blacklisted_recipients(message.to, blacklisted)
+            message.cc = utils.filter_blacklisted_recipients(message.cc, blacklisted)
+            message.bcc = utils.filter_blacklisted_recipients(message.bcc, blacklisted)
+
+            if len(message.to) + len(message.cc) + len(message.bcc) == 0:
+                logger.debug("Refusing to send email. All recipients were filtered by the blacklist")
+                return False
+
+        # SES Configuration sets. If the AWS_SES_CONFIGURATION_SET setting
+        # is not None, append the appropriate header to the message so that
+        # SES knows which configuration set it belongs to.
+        #
+        # If settings.AWS_SES_CONFIGURATION_SET is a callable, pass it the
+        # message object and dkim settings and expect it to return a string
+        # containing the SES Configuration Set name.
+        if settings.AWS_SES_CONFIGURATION_SET and "X-SES-CONFIGURATION-SET" not in message.extra_headers:
+            if callable(settings.AWS_SES_CONFIGURATION_SET):
+                message.extra_headers["X-SES-CONFIGURATION-SET"] = settings.AWS_SES_CONFIGURATION_SET(
+                    message,
+                    dkim_domain=self.dkim_domain,
+                    dkim_key=self.dkim_key,
+                    dkim_selector=self.dkim_selector,
+                    dkim_headers=self.dkim_headers,
+                )
+            else:
+                message.extra_headers["X-SES-CONFIGURATION-SET"] = settings.AWS_SES_CONFIGURATION_SET
+
+        return True
+
+    def _send_message(self, message, source, email_feedback, budget=None):
+        """Send a single prepared message, retrying transient failures.
 
-            # Automatic throttling. Assumes that this is the only SES client
-            # currently operating. The AWS_SES_AUTO_THROTTLE setting is a
-            # factor to apply to the rate limit, with a default of 0.5 to stay
-            # well below the actual SES throttle.
+        Returns a ``SendOutcome``. Errors are recorded on the outcome and the
+        message rather than raised, so that the rest of the batch is sent.
+        """
+        if budget is None:
+            budget = self._retry_policy.budget(1)
+        kwargs = self._get_send_email_parameters(message, source, email_feedback)
+        send = self.connection.send_email if self._use_ses_v2 else self.connection.send_raw_email
+
+        response, attempts, err = self._call_with_retries(lambda: send(**kwargs), budget)
+        if err is not None:
+            self._record_send_failure(message, err)
+            return SendOutcome(message, False, attempts, err)
+
+        self._record_send_success(message, response)
+        signals.message_sent.send(sender=SESBackend, message=message)
+        return SendOutcome(message, True, attempts, None)
+
+    def _call_with_retries(self, call, budget, sends=1):
+        """Make an SES request with ``call()``, retrying transient failures.
+
+        Each attempt is throttled for ``sends`` messages. Returns a
+        ``(response, attempts, error)`` tuple where ``error`` is the exception
+        of the last attempt if every attempt failed.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            # Automatic throttling. With AWS_SES_RATE_LIMITER = 'local' (the
+            # default) sends are paced by a token bucket shared only within
+            # this process, so other processes sending with the same account
+            # are not accounted for. With 'cache' the bucket lives in the
+            # Django cache and is shared by every process using it. The
+            # AWS_SES_AUTO_THROTTLE setting is a factor to apply to the rate
+            # limit, with a default of 0.5 to stay well below the actual SES
+            # throttle.
             # Set the setting to 0 or None to disable throttling.
             if self._throttle:
-                self._update_throttling()
-
-            kwargs = self._get_send_email_parameters(message, source, email_feedback)
+                self._update_throttling(sends=sends)
 
             try:
-                response = (
-                    self.connection.send_email(**kwargs)
-                    if self._use_ses_v2
-                    else self.connection.send_raw_email(**kwargs)
+                response = call()
+            except (ResponseError,) + SEND_ERRORS as err:
+                self._record_throttling_outcome(err)
+                delay = self._retry_policy.get_delay(err, attempt, budget)
+                if delay is None:
+                    return None, attempt, err
+                logger.debug("send_messages.retry attempt='{}' delay='{}' error='{}'".format(attempt, delay, err))
+                sleep(delay)
+            else:
+                self._record_throttling_outcome()
+                return response, attempt, None
+
+    def _record_send_failure(self, message, err):
+        # Store failure information so to post process it if required
+        error_keys = ["status", "reason", "body", "request_id", "error_code", "error_message"]
+        for key in error_keys:
+            message.extra_headers[key] = getattr(err, key, None)
+        if isinstance(err, ClientError):
+            metadata = err.response.get("ResponseMetadata", {})
+            error = err.response.get("Error", {})
+            message.extra_headers["status"] = metadata.get("HTTPStatusCode")
+            message.extra_headers["request_id"] = metadata.get("RequestId")
+            message.extra_headers["error_code"] = error.get("Code")
+            message.extra_headers["error_message"] = error.get("Message")
+        logger.warning(
+            "send_messages.failed from='{}' recipients='{}' error='{}'".format(
+                message.from_email, ", ".join(message.recipients()), err
+            )
+        )
+
+    def _record_send_success(self, message, response):
+        message.extra_headers["status"] = 200
+        message.extra_headers["message_id"] = response["MessageId"]
+        message.extra_headers["request_id"] = response["ResponseMetadata"]["RequestId"]
+        if "X-SES-CONFIGURATION-SET" in message.extra_headers:
+            logger.debug(
+                "send_messages.sent from='{}' recipients='{}' message_id='{}' request_id='{}' "
+                "ses-configuration-set='{}'".format(
+                    message.from_email,
+                    ", ".join(message.recipients()),
+                    message.extra_headers["message_id"],
+                    message.extra_headers["request_id"],
+                    message.extra_headers["X-SES-CONFIGURATION-SET"],
                 )
-                message.extra_headers["status"] = 200
-                message.extra_headers["message_id"] = response["MessageId"]
-                message.extra_headers["request_id"] = response["ResponseMetadata"]["RequestId"]
-                num_sent += 1
-                if "X-SES-CONFIGURATION-SET" in message.extra_headers:
-                    logger.debug(
-                        "send_messages.sent from='{}' recipients='{}' message_id='{}' request_id='{}' "
-                        "ses-configuration-set='{}'".format(
-                            message.from_email,
-                            ", ".join(message.recipients()),
-                            message.extra_headers["message_id"],
-                            message.extra_headers["request_id"],
-                            message.extra_headers["X-SES-CONFIGURATION-SET"],
-                        )
-                    )
-                else:
-                    logger.debug(
-                        "send_messages.sent from='{}' recipients='{}' message_id='{}' request_id='{}'".format(
-                            message.from_email,
-                            ", ".join(message.recipients()),
-                            message.extra_headers["message_id"],
-                            message.extra_headers["request_id"],
-                        )
+            )
+        else:
+            logger.debug(
+                "send_messages.sent from='{}' recipients='{}' message_id='{}' request_id='{}'".format(
+                    message.from_email,
+                    ", ".join(message.recipients()),
+                    message.extra_headers["message_id"],
+                    message.extra_headers["request_id"],
+                )
+            )
+
+    def _send_messages_concurrently(self, messages, source, email_feedback, budget):
+        """Send prepared messages through a bounded pool of worker threads.
+
+        boto3 clients are thread-safe, so every worker shares
+        ``self.connection``. Returns the outcomes in the order of ``messages``.
+        """
+        max_workers = min(self._send_concurrency, len(messages))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="django_ses") as executor:
+            futures = [
+                executor.submit(self._send_message, message, source, email_feedback, budget) for message in messages
+            ]
+            return [future.result() for future in futures]
+
+    def send_bulk(self, template, entries, from_email=None, template_data=None, configuration_set=None):
+        """Send a stored SES template to many destinations with ``SendBulkEmail``.
+
+        ``template`` is the name or ARN of an SES email template. Each entry is
+        a dict with a ``to`` list and optional ``cc``, ``bcc``,
+        ``template_data`` (a dict rendered into the template for that entry)
+        and ``tags`` (a dict of message tags). Entries are packed into
+        ``SendBulkEmail`` calls of up to ``BULK_EMAIL_MAX_ENTRIES`` each.
+
+        Returns a list with one dict per entry, in order, holding the
+        ``status``, ``message_id`` and ``error`` reported by SES. Entries whose
+        recipients were all removed by the blacklist get the ``BLACKLISTED``
+        status and are not sent. Requires ``USE_SES_V2``.
+
+        Every chunk is sent even if an earlier one fails; unless
+        ``fail_silently``, the first error is then raised with the list of
+        results as its ``results`` attribute. A callable
+        ``AWS_SES_CONFIGURATION_SET`` needs a message to choose from, so it is
+        ignored here; pass ``configuration_set`` instead.
+        """
+        if not self._use_ses_v2:
+            raise ValueError("send_bulk requires USE_SES_V2=True. SendBulkEmail is only supported by SES API v2.")
+
+        entries = list(entries)
+        results = [{"status": None, "message_id": None, "error": None} for _ in entries]
+        if not entries:
+            return results
+
+        new_conn_created = self.open()
+        if not self.connection:
+            # Failed silently
+            return results
+
+        if configuration_set is None and not callable(settings.AWS_SES_CONFIGURATION_SET):
+            configuration_set = settings.AWS_SES_CONFIGURATION_SET
+
+        params = dict(
+            FromEmailAddress=from_email or settings.AWS_SES_FROM_EMAIL or django_settings.DEFAULT_FROM_EMAIL,
+            DefaultContent={"Template": self._get_bulk_template(template, template_data or {})},
+        )
+        if self.ses_from_arn or self.ses_source_arn:
+            params["FromEmailAddressIdentityArn"] = self.ses_from_arn or self.ses_source_arn
+        if settings.AWS_SES_RETURN_PATH is not None:
+            params["FeedbackForwardingEmailAddress"] = settings.AWS_SES_RETURN_PATH
+        if configuration_set:
+            params["ConfigurationSetName"] = configuration_set
+        if self._global_endpoint_id:
+            params["EndpointId"] = self._global_endpoint_id
+
+        blacklisted = None
+        if settings.AWS_SES_USE_BLACKLIST:
+            from django_ses import utils
+
+            blacklisted = utils.get_blacklisted_emails(
+                address
+                for entry in entries
+                for key in ("to", "cc", "bcc")
+                for address in self._get_bulk_entry_addresses(entry, key)
+            )
+
+        pending = []
+        for index, entry in enumerate(entries):
+            bulk_entry = self._get_bulk_email_entry(entry, blacklisted)
+            if bulk_entry is None:
+                results[index]["status"] = "BLACKLISTED"
+                continue
+            pending.append((index, bulk_entry))
+
+        budget = self._retry_policy.budget((len(pending) + BULK_EMAIL_MAX_ENTRIES - 1) // BULK_EMAIL_MAX_ENTRIES)
+        first_error = None
+        try:
+            for start in range(0, len(pending), BULK_EMAIL_MAX_ENTRIES):
+                chunk = pending[start : start + BULK_EMAIL_MAX_ENTRIES]
+                bulk_entries = [bulk_entry for _, bulk_entry in chunk]
+
+                response, _, err = self._call_with_retries(
+                    lambda: self.connection.send_bulk_email(BulkEmailEntries=bulk_entries, **params),
+                    budget,
+                    sends=len(chunk),
+                )
+                if err is not None:
+                    for index, _ in chunk:
+                        results[index]["status"] = getattr(err, "status", None)
+                        results[index]["error"] = getattr(err, "error_message", None) or str(err)
+                        if isinstance(err, ClientError):
+                            results[index]["status"] = err.response.get("Error", {}).get("Code")
+                            results[index]["error"] = err.response.get("Error", {}).get("Message")
+                    first_error = first_error or err
+                    continue
+
+                for (index, _), entry_result in zip(chunk, response["BulkEmailEntryResults"]):
+                    results[index]["status"] = entry_result.get("Status")
+                    results[index]["message_id"] = entry_result.get("MessageId")
+                    results[index]["error"] = entry_result.get("Error")
+
+                logger.debug(
+                    "send_bulk.sent template='{}' entries='{}' request_id='{}'".format(
+                        template, len(chunk), response["ResponseMetadata"]["RequestId"]
                     )
+                )
+        finally:
+            if new_conn_created:
+                self.close()
 
-                signals.message_sent.send(sender=SESBackend, message=message)
+        if first_error is not None and not self.fail_silently:
+            # The other chunks were still sent; their results travel with the error.
+            first_error.results = results
+            raise first_error
+        return results
+
+    def _get_bulk_template(self, template, template_data):
+        key = "TemplateArn" if template.startswith("arn:") else "TemplateName"
+        return {key: template, "TemplateData": json.dumps(template_data)}
+
+    def _get_bulk_entry_addresses(self, entry, key):
+        addresses = entry.get(key) or []
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        return addresses
+
+    def _get_bulk_email_entry(self, entry, blacklisted=None):
+        """Build a ``BulkEmailEntry``, or return None if nobody is left to send to."""
+        destination = {}
+        for key, field in (("to", "ToAddresses"), ("cc", "CcAddresses"), ("bcc", "BccAddresses")):
+            addresses = self._get_bulk_entry_addresses(entry, key)
+            if settings.AWS_SES_USE_BLACKLIST:
+                from django_ses import utils
 
-            except ResponseError as err:
-                # Store failure information so to post process it if required
-                error_keys = ["status", "reason", "body", "request_id", "error_code", "error_message"]
-                for key in error_keys:
-                    message.extra_headers[key] = getattr(err, key, None)
-                if not self.fail_silently:
-                    raise
+                addresses = utils.filter_blacklisted_recipients(addresses, blacklisted)
+            if addresses:
+                destination[field] = list(addresses)
 
-        if new_conn_created:
-            self.close()
+        if not destination:
+            logger.debug("Refusing to send bulk entry. All recipients were filtered by the blacklist")
+            return None
 
-        return num_sent
+        bulk_entry = {"Destination": destination}
+        if entry.get("template_data") is not None:
+            bulk_entry["ReplacementEmailContent"] = {
+                "ReplacementTemplate": {"ReplacementTemplateData": json.dumps(entry["template_data"])}
+            }
+        if entry.get("tags"):
+            bulk_entry["ReplacementTags"] = [{"Name": name, "Value": value} for name, value in entry["tags"].items()]
+        return bulk_entry
 
-    def _update_throttling(self):
-        global recent_send_times
-        now = datetime.now()
+    def _update_throttling(self, sends=1):
         # Get and cache the current SES max-per-second rate limit
         # returned by the SES API.
-        rate_limit = self.get_rate_limit()
+        delay = self._get_throttle_delay(self.get_rate_limit(), sends)
+        if delay > 0:
+            sleep(delay)
+
+    @property
+    def rate_limiter(self):
+        """The limiter shared by every backend sending with these credentials.
+
+        Returns None when throttling is disabled or the rate limit has not
+        been fetched yet. Its ``level`` is the number of sends currently
+        available and ``total_wait`` the seconds callers have been delayed.
+        """
+        if not self._throttle or self._access_key_id not in cached_rate_limits:
+            return None
+        return get_rate_limiter(
+            self._get_rate_limiter_key(), cached_rate_limits[self._access_key_id] * self._get_throttle_factor()
+        )
+
+    @property
+    def rate_controller(self):
+        """The AIMD controller adapting the throttle factor, if AWS_SES_ADAPTIVE_THROTTLE is on."""
+        if not self._throttle or not self._adaptive_throttle:
+            return None
+        return get_rate_controller(self._get_rate_limiter_key(), self._throttle)
+
+    def _get_rate_limiter_key(self):
+        # SES quotas apply per account and region.
+        return "%s:%s" % (self._session_profile or self._access_key_id, self._region_name)
+
+    def _get_throttle_factor(self):
+        controller = self.rate_controller
+        return controller.factor if controller else self._throttle
+
+    def _get_throttle_delay(self, rate_limit, sends=1):
+        """Take ``sends`` from the rate limiter and return how many seconds to wait before them."""
         logger.debug("send_messages.throttle rate_limit='{}'".format(rate_limit))
-        # Prune from recent_send_times anything more than a few seconds
-        # ago. Even though SES reports a maximum per-second, the way
-        # they enforce the limit may not be on a one-second window.
-        # To be safe, we use a two-second window (but allow 2 times the
-        # rate limit) and then also have a default rate limit factor of
-        # 0.5 so that we really limit the one-second amount in two
-        # seconds.
-        window = 2.0  # seconds
-        window_start = now - timedelta(seconds=window)
-        new_send_times = []
-        for time in recent_send_times:
-            if time > window_start:
-                new_send_times.append(time)
-        recent_send_times = new_send_times
-        # If the number of recent send times in the last 1/_throttle
-        # seconds exceeds the rate limit, add a delay.
-        # Since I'm not sure how Amazon determines at exactly what
-        # point to throttle, better be safe than sorry and let in, say,
-        # half of the allowed rate.
-        if len(new_send_times) > rate_limit * window * self._throttle:
-            # Sleep the remainder of the window period.
-            delta = now - new_send_times[0]
-            total_seconds = (delta.microseconds + (delta.seconds + delta.days * 24 * 3600) * 10**6) / 10**6
-            delay = window - total_seconds
-            if delay > 0:
-                sleep(delay)
-        recent_send_times.append(now)
-        # end of throttling
+        # Since I'm not sure how Amazon determines at exactly what point to
+        # throttle, better be safe than sorry and let in, say, half of the
+        # allowed rate (AWS_SES_AUTO_THROTTLE defaults to 0.5). With
+        # AWS_SES_ADAPTIVE_THROTTLE that factor is only the starting point.
+        limiter = get_rate_limiter(self._get_rate_limiter_key(), rate_limit * self._get_throttle_factor())
+        return limiter.reserve(sends)
+
+    def _record_throttling_outcome(self, err=None):
+        """Feed the result of a send to the adaptive throttle."""
+        controller = self.rate_controller
+        if controller is None:
+            return
+        if err is None:
+            controller.on_success()
+        elif is_throttling_error(err):
+            logger.warning("send_messages.throttled factor='{}'".format(controller.factor))
+            controller.on_throttled()
 
     def _get_send_email_parameters(self, message, source, email_feedack):
         return (
@@ -375,7 +692,7 @@ class SESBackend(BaseEmailBackend):
         return params
 
     def get_rate_limit(self):
-        if self._access_key_id in cached_rate_limits:
+        if self._access_key_id in cached_rate_limits and not self._rate_limit_expired():
             return cached_rate_limits[self._access_key_id]
 
         new_conn_created = self.open()
@@ -393,15 +710,20 @@ class SESBackend(BaseEmailBackend):
         https://boto3.amazonaws.com/v1/documentation/api/1.26.31/reference/services/sesv2.html#SESV2.Client.get_account
         """
         account_dict = self.connection.get_account()
-        quota_dict = account_dict["SendQuota"]
-        max_per_second = quota_dict["MaxSendRate"]
-        ret = float(max_per_second)
-        cached_rate_limits[self._access_key_id] = ret
-        return ret
+        return self._cache_send_quota(account_dict["SendQuota"])
 
     def _get_v1_send_quota(self):
         quota_dict = self.connection.get_send_quota()
+        return self._cache_send_quota(quota_dict)
+
+    def _cache_send_quota(self, quota_dict):
         max_per_second = quota_dict["MaxSendRate"]
         ret = float(max_per_second)
         cached_rate_limits[self._access_key_id] = ret
+        rate_limits_fetched_at[self._access_key_id] = monotonic()
         return ret
+
+    def _rate_limit_expired(self):
+        ttl = settings.AWS_SES_RATE_LIMIT_TTL
+        fetched_at = rate_limits_fetched_at.get(self._access_key_id)
+        return ttl is not None and fetched_at is not None and monotonic() - fetched_at > ttl
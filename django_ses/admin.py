@@ -1,8 +1,130 @@
+import io
+
+from django import forms
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 
-from .models import SESStat
+from .blacklist import (
+    import_emails,
+    invalidate_blacklist_cache,
+    normalize_email,
+    parse_domain_rule,
+    read_emails,
+    search_emails,
+)
+from .models import BlacklistedDomain, BlacklistedEmail, SESStat
+from .paginator import EstimatedCountPaginator
 
 
 @admin.register(SESStat)
 class SESStatAdmin(admin.ModelAdmin):
     list_display = ("date", "delivery_attempts", "bounces", "complaints", "rejects")
+
+
+class InvalidateBlacklistCacheMixin:
+    """Rebuild the blacklist cache of every process after an edit."""
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_blacklist_cache()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_blacklist_cache()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_blacklist_cache()
+
+
+class BlacklistedEmailForm(forms.ModelForm):
+    # Rows without an address would have no digest either and match nothing.
+    email = forms.EmailField(max_length=255)
+
+    class Meta:
+        model = BlacklistedEmail
+        fields = ("email", "expires_at")
+
+    def clean_email(self):
+        return normalize_email(self.cleaned_data["email"])
+
+
+class BlacklistImportForm(forms.Form):
+    file = forms.FileField(help_text="A CSV or text file with an email address in the first column of every row.")
+
+
+@admin.register(BlacklistedEmail)
+class BlacklistedEmailAdmin(InvalidateBlacklistCacheMixin, admin.ModelAdmin):
+    """
+    Built for a blacklist of millions of rows: the change list never counts
+    the whole table and searches are indexed prefix matches (see
+    ``search_emails()``).
+    """
+
+    form = BlacklistedEmailForm
+    change_list_template = "admin/django_ses/blacklistedemail/change_list.html"
+    list_display = ("email", "expires_at")
+    search_fields = ("email",)
+    search_help_text = "An address prefix, @domain, or *.domain to include its subdomains."
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_emails(queryset, search_term), False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="django_ses_blacklistedemail_import",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Add the addresses of an uploaded CSV file, streamed in batches."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = BlacklistImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig", newline="")
+            count = import_emails(read_emails(upload))
+            self.message_user(request, f"Imported {count} emails.")
+            return redirect("admin:django_ses_blacklistedemail_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "form": form,
+            "title": "Import blacklisted emails",
+        }
+        return TemplateResponse(request, "admin/django_ses/blacklistedemail/import.html", context)
+
+
+class BlacklistedDomainForm(forms.ModelForm):
+    class Meta:
+        model = BlacklistedDomain
+        fields = ("domain", "include_subdomains")
+        help_texts = {"domain": "example.com, @example.com, or *.example.com to include its subdomains."}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("domain"):
+            # Parsed before the unique check, which then sees the stored form.
+            domain, include_subdomains = parse_domain_rule(cleaned_data["domain"])
+            cleaned_data["domain"] = domain
+            cleaned_data["include_subdomains"] = cleaned_data.get("include_subdomains") or include_subdomains
+        return cleaned_data
+
+
+@admin.register(BlacklistedDomain)
+class BlacklistedDomainAdmin(InvalidateBlacklistCacheMixin, admin.ModelAdmin):
+    form = BlacklistedDomainForm
+    list_display = ("domain", "include_subdomains")
+    list_filter = ("include_subdomains",)
+    search_fields = ("domain",)
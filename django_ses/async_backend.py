@@ -0,0 +1,164 @@
+import asyncio
+import contextlib
+
+from asgiref.sync import sync_to_async
+from botocore.endpoint import MAX_POOL_CONNECTIONS
+from botocore.vendored.requests.packages.urllib3.exceptions import ResponseError
+from django.core.exceptions import ImproperlyConfigured
+
+from django_ses import SESBackend, cached_rate_limits, signals
+from django_ses.client_pool import async_client_pool
+from django_ses.conf import settings
+from django_ses.retry import SEND_ERRORS, SendOutcome
+
+__all__ = ("AsyncSESBackend",)
+
+
+class AsyncSESBackend(SESBackend):
+    """
+    An SES email backend that can also send from async code without blocking
+    the event loop.
+
+    ``send_messages_async`` talks to SES through aiobotocore, which has to be
+    installed with the ``async`` extra - e.g. ``pip install django-ses[async]``.
+    The synchronous ``send_messages`` keeps working exactly like ``SESBackend``.
+
+    Unless ``send_concurrency`` or ``AWS_SES_SEND_CONCURRENCY`` is set, as many
+    messages are in flight at once as the client keeps HTTP connections.
+    """
+
+    _REQ_DEP_TMPL = (
+        "%s is required for sending email asynchronously. Please install "
+        "`django-ses` with the `async` extra - e.g. "
+        "`pip install django-ses[async]`."
+    )
+
+    def __init__(self, *args, send_concurrency=None, **kwargs):
+        super().__init__(*args, send_concurrency=send_concurrency, **kwargs)
+        self._async_send_concurrency = int(
+            send_concurrency
+            or settings.AWS_SES_SEND_CONCURRENCY
+            or getattr(self._config, "max_pool_connections", None)
+            or MAX_POOL_CONNECTIONS
+        )
+
+    def create_async_client(self):
+        """Return an async context manager yielding an aiobotocore SES client."""
+        try:
+            from aiobotocore.session import AioSession
+        except ImportError:
+            raise ImproperlyConfigured(self._REQ_DEP_TMPL % "`aiobotocore`")
+
+        if self._session_profile:
+            session = AioSession(profile=self._session_profile)
+            credentials = {}
+        else:
+            session = AioSession()
+            credentials = dict(
+                aws_access_key_id=self._access_key_id,
+                aws_secret_access_key=self._access_key,
+                aws_session_token=self._session_token,
+            )
+
+        return session.create_client(
+            "sesv2" if self._use_ses_v2 else "ses",
+            region_name=self._region_name,
+            endpoint_url=self._endpoint_url,
+            config=self._config,
+            **credentials,
+        )
+
+    async def send_messages_async(self, email_messages):
+        """Sends one or more EmailMessage objects and returns the number of
+        email messages sent.
+        """
+        if not email_messages:
+            return
+
+        # The blacklist lookup and a user supplied configuration set callable
+        # may touch the database, which must not happen on the event loop.
+        messages = await sync_to_async(self._prepare_messages)(email_messages)
+        if not messages:
+            return 0
+
+        source = settings.AWS_SES_FROM_EMAIL
+        email_feedback = settings.AWS_SES_RETURN_PATH
+
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                client = await self._open_async_client(stack)
+            except ImproperlyConfigured:
+                raise
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                return
+
+            budget = self._retry_policy.budget(len(messages))
+            semaphore = asyncio.Semaphore(self._async_send_concurrency)
+
+            async def send(message):
+                async with semaphore:
+                    return await self._send_message_async(client, message, source, email_feedback, budget)
+
+            self.outcomes = await asyncio.gather(*(send(message) for message in messages))
+
+        return self._count_sent(self.outcomes)
+
+    async def _open_async_client(self, stack):
+        """Return an aiobotocore client, pooled per event loop if AWS_SES_CLIENT_POOL is on."""
+        if self._use_client_pool:
+            return await async_client_pool.borrow(self._get_client_pool_key(), self.create_async_client)
+        return await stack.enter_async_context(self.create_async_client())
+
+    async def _send_message_async(self, client, message, source, email_feedback, budget=None):
+        """Send a single prepared message, retrying transient failures. Returns a ``SendOutcome``."""
+        if budget is None:
+            budget = self._retry_policy.budget(1)
+        kwargs = self._get_send_email_parameters(message, source, email_feedback)
+        send = client.send_email if self._use_ses_v2 else client.send_raw_email
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if self._throttle:
+                await self._update_throttling_async(client)
+
+            try:
+                response = await send(**kwargs)
+            except (ResponseError,) + SEND_ERRORS as err:
+                self._record_throttling_outcome(err)
+                delay = self._retry_policy.get_delay(err, attempt, budget)
+                if delay is None:
+                    self._record_send_failure(message, err)
+                    return SendOutcome(message, False, attempt, err)
+                await asyncio.sleep(delay)
+            else:
+                break
+
+        self._record_throttling_outcome()
+        self._record_send_success(message, response)
+        if hasattr(signals.message_sent, "asend"):
+            await signals.message_sent.asend(sender=SESBackend, message=message)
+        else:
+            await sync_to_async(signals.message_sent.send)(sender=SESBackend, message=message)
+        return SendOutcome(message, True, attempt, None)
+
+    async def _update_throttling_async(self, client):
+        rate_limit = await self._get_rate_limit_async(client)
+        if settings.AWS_SES_RATE_LIMITER == "cache":
+            # Reserving sends from the Django cache is a blocking round trip.
+            delay = await sync_to_async(self._get_throttle_delay)(rate_limit)
+        else:
+            delay = self._get_throttle_delay(rate_limit)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _get_rate_limit_async(self, client):
+        if self._access_key_id in cached_rate_limits and not self._rate_limit_expired():
+            return cached_rate_limits[self._access_key_id]
+
+        if self._use_ses_v2:
+            account_dict = await client.get_account()
+            return self._cache_send_quota(account_dict["SendQuota"])
+        return self._cache_send_quota(await client.get_send_quota())
@@ -0,0 +1,769 @@
+import csv
+import hashlib
+import io
+import logging
+import math
+import threading
+import uuid
+from email.utils import parseaddr
+from time import monotonic
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "django_ses:blacklist:version"
+
+
+def normalize_email(address):
+    """Return the bare, lowercased email address of ``address``."""
+    return parseaddr(address)[1].lower()
+
+
+def get_domain(email):
+    """Return the domain of a normalized address."""
+    return email.rpartition("@")[2]
+
+
+def reverse_domain(domain):
+    """Return ``domain`` with its labels reversed and a trailing dot: ``com.example.mail.``"""
+    return ".".join(reversed(domain.strip(".").split("."))) + "."
+
+
+def parse_domain_rule(rule):
+    """
+    Parse a domain suppression rule into ``(domain, include_subdomains)``.
+
+    ``example.com`` and ``@example.com`` match addresses at that domain only,
+    ``*.example.com`` also matches every subdomain.
+    """
+    rule = rule.strip().lower().lstrip("@")
+    if rule.startswith("*."):
+        return rule[2:], True
+    return rule, False
+
+
+class DomainMatcher:
+    """
+    Decides whether an address is suppressed by a domain rule.
+
+    Rules are kept in two sets, so a lookup costs one set membership test per
+    label of the recipient's domain, whatever the number of rules.
+    """
+
+    def __init__(self, rules=()):
+        self.domains = set()
+        self.parents = set()
+        for domain, include_subdomains in rules:
+            self.domains.add(domain)
+            if include_subdomains:
+                self.parents.add(domain)
+
+    def __len__(self):
+        return len(self.domains)
+
+    def matches(self, email):
+        domain = get_domain(email)
+        if domain in self.domains:
+            return True
+        if not self.parents:
+            return False
+        # Check "b.example.com", "example.com" and "com" for "a.b.example.com".
+        while "." in domain:
+            domain = domain.partition(".")[2]
+            if domain in self.parents:
+                return True
+        return False
+
+    @classmethod
+    def for_emails(cls, emails, using=None):
+        """Return a matcher with the rules that may apply to ``emails``, loaded with one query per chunk."""
+        from django_ses import models
+
+        candidates = set()
+        for email in emails:
+            domain = get_domain(email)
+            candidates.add(domain)
+            while "." in domain:
+                domain = domain.partition(".")[2]
+                candidates.add(domain)
+        return cls(values_in(models.BlacklistedDomain, "domain", sorted(candidates), using, "include_subdomains"))
+
+    @classmethod
+    def load(cls, using=None):
+        """Return a matcher with every rule in the database."""
+        from django_ses import models
+
+        queryset = models.BlacklistedDomain.objects.using(using)
+        return cls(queryset.values_list("domain", "include_subdomains").iterator())
+
+
+def values_in(model, field, values, using, *fields):
+    """
+    Yield ``values_list(field, *fields)`` of the rows whose ``field`` is in
+    ``values``, with one query per chunk of values small enough for the database.
+    """
+    from django_ses.utils import _get_in_query_chunk_size
+
+    if not values:
+        return
+    chunk_size = _get_in_query_chunk_size(using)
+    for start in range(0, len(values), chunk_size):
+        queryset = model.objects.using(using).filter(**{field + "__in": values[start : start + chunk_size]})
+        yield from queryset.values_list(field, *fields, flat=not fields)
+
+
+def email_digest(email):
+    """Return the 128 bit digest stored in ``BlacklistedEmail.email_digest`` for a normalized address."""
+    return uuid.UUID(bytes=hashlib.blake2b(email.encode("utf-8"), digest_size=16, person=b"django-ses").digest())
+
+
+def use_digests():
+    from django_ses.conf import settings
+
+    return settings.AWS_SES_BLACKLIST_DIGEST
+
+
+def get_lookup(emails):
+    """
+    Return the field blacklisted addresses are looked up by and a dict mapping
+    the value of that field to each of the normalized ``emails``.
+    """
+    if use_digests():
+        return "email_digest", {email_digest(email): email for email in emails}
+    return "email", {email: email for email in emails}
+
+
+def new_blacklisted_email(email, expires_at=None):
+    """Return an unsaved ``BlacklistedEmail`` for the normalized ``email``."""
+    from django_ses import models
+    from django_ses.conf import settings
+
+    return models.BlacklistedEmail(
+        email=email if settings.AWS_SES_BLACKLIST_STORE_EMAIL else None,
+        email_digest=email_digest(email),
+        reversed_domain=reverse_domain(get_domain(email)),
+        expires_at=expires_at,
+    )
+
+
+class BloomFilter:
+    """
+    A fixed-size set of strings that can answer "definitely not present" or
+    "probably present".
+
+    Sized for ``capacity`` items with a false positive rate of ``error_rate``,
+    it needs about 14 bits per item at the default 0.1%, so a million
+    addresses fit in under 2 MB.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: derive every position from two 64 bit hashes.
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def __len__(self):
+        return self.count
+
+
+class BlacklistCache:
+    """
+    A process-local Bloom filter of every blacklisted address.
+
+    Nearly all recipients are not blacklisted, and the filter rules those out
+    without a query. Only possible hits are left to be confirmed against the
+    database. The filter is rebuilt when the version stored under
+    ``VERSION_CACHE_KEY`` in the Django cache ``cache_alias`` changes, which
+    ``invalidate_blacklist_cache()`` does whenever the blacklist is modified,
+    so use a cache shared by every process that sends or blacklists email.
+    """
+
+    error_rate = 0.001
+
+    def __init__(self, cache_alias="default"):
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self._filter = None
+        self._matcher = None
+        self._version = None
+        self._building = False
+        self.builds = 0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    def get_version(self):
+        version = self.cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            # Another process may have set it first; use whichever won.
+            if not self.cache.add(VERSION_CACHE_KEY, version, None):
+                version = self.cache.get(VERSION_CACHE_KEY, version)
+        return version
+
+    def get_filter(self):
+        """Return a filter that is current with the shared version, or None while it is rebuilt."""
+        return self._get_current()[0]
+
+    def get_domain_matcher(self):
+        """
+        Return a ``DomainMatcher`` with every domain rule, current with the
+        shared version, or None while it is rebuilt.
+        """
+        return self._get_current()[1]
+
+    def _get_current(self):
+        version = self.get_version()
+        with self._lock:
+            if self._filter is not None and self._version == version:
+                return self._filter, self._matcher
+            if self._building:
+                # Rather than waiting for the thread that rebuilds the filter,
+                # or using a stale one, look the addresses up in the database.
+                return None, None
+            self._building = True
+        try:
+            # The version is read before the tables, so a change made while
+            # building bumps it again and triggers another rebuild.
+            bloom, using = self._build()
+            matcher = DomainMatcher.load(using)
+        finally:
+            with self._lock:
+                self._building = False
+        with self._lock:
+            self._filter, self._matcher, self._version = bloom, matcher, version
+        return bloom, matcher
+
+    def _build(self):
+        from django.db import router
+        from django.utils import timezone
+
+        from django_ses import models
+
+        # Built from the primary: rows missing from a lagging replica would
+        # stay missing from the filter until the next change.
+        using = router.db_for_write(models.BlacklistedEmail, consistent_read=True)
+        queryset = models.BlacklistedEmail.objects.using(using).exclude(expires_at__lte=timezone.now())
+        bloom = BloomFilter(int(queryset.count() * 1.1) + 1024, self.error_rate)
+        field = "email_digest" if use_digests() else "email"
+        for value in queryset.values_list(field, flat=True).iterator(chunk_size=10000):
+            if value is not None:
+                bloom.add(self._key(value))
+        self.builds += 1
+        logger.debug("blacklist_cache.built emails='{}' bytes='{}'".format(len(bloom), len(bloom._bits)))
+        return bloom, using
+
+    def _key(self, value):
+        return value.hex if isinstance(value, uuid.UUID) else value.lower()
+
+    def get_candidates(self, emails):
+        """Return the normalized ``emails`` that may be blacklisted."""
+        bloom = self.get_filter()
+        if bloom is None:
+            return list(emails)
+        if use_digests():
+            return [email for email in emails if email_digest(email).hex in bloom]
+        return [email for email in emails if email in bloom]
+
+    def invalidate(self):
+        self.cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        with self._lock:
+            self._filter = None
+            self._version = None
+
+
+_blacklist_cache = None
+_blacklist_cache_lock = threading.Lock()
+
+
+def get_blacklist_cache():
+    """Return the blacklist cache configured by ``AWS_SES_BLACKLIST_CACHE``, or None."""
+    global _blacklist_cache
+    from django_ses.conf import settings
+
+    cache_alias = settings.AWS_SES_BLACKLIST_CACHE
+    if not cache_alias:
+        return None
+    with _blacklist_cache_lock:
+        if _blacklist_cache is None or _blacklist_cache.cache_alias != cache_alias:
+            _blacklist_cache = BlacklistCache(cache_alias)
+        return _blacklist_cache
+
+
+def invalidate_blacklist_cache(using=None):
+    """
+    Make every process rebuild its blacklist filter before the next lookup.
+
+    This happens once the current transaction on ``using`` commits: a process
+    rebuilding its filter earlier would read the old rows and keep them
+    under the new version.
+    """
+    from django.db import router, transaction
+
+    from django_ses import models
+
+    blacklist_cache = get_blacklist_cache()
+    if blacklist_cache is not None:
+        transaction.on_commit(blacklist_cache.invalidate, using=using or router.db_for_write(models.BlacklistedEmail))
+
+
+def _get_or_create(field, value, email, expires_at=None):
+    from django_ses import models
+
+    blacklisted = new_blacklisted_email(email, expires_at)
+    _, created = models.BlacklistedEmail.objects.get_or_create(
+        **{field: value},
+        defaults={
+            "email": blacklisted.email,
+            "email_digest": blacklisted.email_digest,
+            "reversed_domain": blacklisted.reversed_domain,
+            "expires_at": expires_at,
+        },
+    )
+    return created
+
+
+def _extend_expiry(field, values, expires_at, using=None):
+    """
+    Make the existing entries among ``values`` last until ``expires_at``, or
+    forever if it is None. Entries are never shortened. Returns the number of
+    entries changed.
+    """
+    from django.db import router
+
+    from django_ses import models
+    from django_ses.utils import _get_in_query_chunk_size
+
+    using = using or router.db_for_write(models.BlacklistedEmail)
+    chunk_size = _get_in_query_chunk_size(using)
+    changed = 0
+    for start in range(0, len(values), chunk_size):
+        queryset = models.BlacklistedEmail.objects.using(using).filter(
+            **{field + "__in": values[start : start + chunk_size], "expires_at__isnull": False}
+        )
+        if expires_at is not None:
+            queryset = queryset.filter(expires_at__lt=expires_at)
+        changed += queryset.update(expires_at=expires_at)
+    return changed
+
+
+def blacklist_emails(recipients, expires_at=None):
+    """
+    Add ``recipients`` to the blacklist, skipping those already on it.
+
+    With ``expires_at`` the new entries stop suppressing the addresses at that
+    time. Existing entries that would expire sooner are extended, and existing
+    expiring entries become permanent when ``expires_at`` is None.
+    """
+    from django.db import NotSupportedError
+
+    from django_ses import models
+
+    if len(recipients) == 0:
+        return
+
+    recipients = list(dict.fromkeys(normalize_email(email) for email in recipients))
+    field, lookup = get_lookup(recipients)
+
+    # If we received only 1 recipients, don't waste extra queries trying to find
+    # out if the recipient has already been blacklisted; just attempt to
+    # blacklist it.
+    if len(recipients) == 1:
+        value, email = next(iter(lookup.items()))
+        # An extended entry may have expired already and been left out of the
+        # cached filter, so it is invalidated as well.
+        if _get_or_create(field, value, email, expires_at) or _extend_expiry(field, [value], expires_at):
+            invalidate_blacklist_cache()
+        return
+
+    qs = models.BlacklistedEmail.objects.filter(**{field + "__in": list(lookup)})
+    blacklisted_values = list(qs.values_list(field, flat=True))
+    blacklisted_emails = {lookup[value] for value in blacklisted_values}
+    unblacklisted_emails = [email for email in recipients if email not in blacklisted_emails]
+
+    # Try to bulk-insert the unblacklisted emails. If the operation fails (a
+    # possibility only when using Oracle because it doesn't support
+    # ignore_conflicts), fallback to one-by-one insertion.
+    try:
+        models.BlacklistedEmail.objects.bulk_create(
+            [new_blacklisted_email(email, expires_at) for email in unblacklisted_emails], ignore_conflicts=True
+        )
+    except NotSupportedError:  # Oracle doesn't support "ignore_conflicts"
+        for value, email in lookup.items():
+            if email not in blacklisted_emails:
+                _get_or_create(field, value, email, expires_at)
+
+    extended = _extend_expiry(field, blacklisted_values, expires_at) if blacklisted_values else 0
+    if unblacklisted_emails or extended:
+        invalidate_blacklist_cache()
+
+
+def write_blacklist_entries(entries):
+    """
+    Store ``entries``, a dict mapping normalized addresses to their expiry
+    (None for permanent entries), in one transaction.
+
+    Every new address is inserted by a single ``bulk_create(ignore_conflicts=True)``
+    without looking it up first, followed by at most two ``UPDATE`` queries to
+    extend the existing entries.
+    """
+    from django.db import NotSupportedError, router, transaction
+
+    from django_ses import models
+
+    field, lookup = get_lookup(list(entries))
+    objs = [new_blacklisted_email(email, entries[email]) for email in lookup.values()]
+    with transaction.atomic(using=router.db_for_write(models.BlacklistedEmail)):
+        try:
+            models.BlacklistedEmail.objects.bulk_create(objs, ignore_conflicts=True)
+        except NotSupportedError:  # Oracle doesn't support "ignore_conflicts"
+            for email, expires_at in entries.items():
+                blacklist_emails([email], expires_at)
+            return
+
+        permanent = [value for value, email in lookup.items() if entries[email] is None]
+        expiring = [value for value, email in lookup.items() if entries[email] is not None]
+        if permanent:
+            _extend_expiry(field, permanent, None)
+        if expiring:
+            # One expiry for the whole batch: the latest, at most one buffer
+            # interval later than that of any other entry.
+            _extend_expiry(field, expiring, max(entries[lookup[value]] for value in expiring))
+    invalidate_blacklist_cache()
+
+
+class _BufferedBatch:
+    def __init__(self):
+        self.entries = {}
+        self.done = False
+        self.failed = True
+
+    def add(self, emails, expires_at):
+        for email in emails:
+            if email in self.entries:
+                current = self.entries[email]
+                # Permanent entries win, otherwise the latest expiry does.
+                if current is None or expires_at is None:
+                    expires_at = None
+                else:
+                    expires_at = max(current, expires_at)
+            self.entries[email] = expires_at
+
+
+class BlacklistBuffer:
+    """
+    Combines the blacklist writes of concurrent threads into one query.
+
+    The first thread to add addresses waits up to ``interval`` seconds, or
+    until ``max_size`` addresses are pending, for other threads to add theirs,
+    then writes all of them with ``write_blacklist_entries()`` while the others
+    wait. Addresses added in the meantime start the next batch.
+
+    ``add()`` only returns once the addresses are stored, so a notification is
+    never acknowledged before its recipients are on the blacklist. If the
+    combined write fails, every thread stores its own addresses with
+    ``blacklist_emails()``, which raises if the database is unavailable so
+    that SNS delivers the notification again.
+
+    Threads inside a transaction (e.g. with ``ATOMIC_REQUESTS``) write their
+    addresses themselves, in that transaction: as a leader they would store
+    the addresses of other threads in a transaction that may still roll back.
+    """
+
+    def __init__(self, max_size=500, interval=0.05):
+        self.max_size = max_size
+        self.interval = interval
+        self._condition = threading.Condition()
+        self._batch = None
+        self.flushes = 0
+
+    def add(self, recipients, expires_at=None):
+        from django.db import connections, router
+
+        from django_ses import models
+
+        emails = [email for email in (normalize_email(recipient) for recipient in recipients) if email]
+        if not emails:
+            return
+        if connections[router.db_for_write(models.BlacklistedEmail)].in_atomic_block:
+            blacklist_emails(emails, expires_at)
+            return
+
+        with self._condition:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _BufferedBatch()
+            batch.add(emails, expires_at)
+            if len(batch.entries) >= self.max_size:
+                self._condition.notify_all()
+
+            if leader:
+                deadline = monotonic() + self.interval
+                while len(batch.entries) < self.max_size:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                self._batch = None
+            else:
+                while not batch.done:
+                    self._condition.wait()
+
+        if leader:
+            try:
+                write_blacklist_entries(batch.entries)
+                batch.failed = False
+            except Exception:
+                logger.warning("Could not write %d blacklisted emails at once", len(batch.entries), exc_info=True)
+            finally:
+                with self._condition:
+                    batch.done = True
+                    self.flushes += 1
+                    self._condition.notify_all()
+
+        if batch.failed:
+            blacklist_emails(emails, expires_at)
+
+
+_blacklist_buffer = None
+
+
+def get_blacklist_buffer():
+    """Return the buffer configured by ``AWS_SES_BLACKLIST_BUFFER_INTERVAL``, or None."""
+    global _blacklist_buffer
+    from django_ses.conf import settings
+
+    interval = settings.AWS_SES_BLACKLIST_BUFFER_INTERVAL
+    if interval is None:
+        return None
+    with _blacklist_cache_lock:
+        if _blacklist_buffer is None:
+            _blacklist_buffer = BlacklistBuffer(settings.AWS_SES_BLACKLIST_BUFFER_SIZE, interval)
+        return _blacklist_buffer
+
+
+def purge_expired_emails(batch_size=1000):
+    """
+    Delete the blacklist entries that have expired, ``batch_size`` rows at a
+    time, and yield the number of rows deleted by each batch.
+
+    Every batch is found through the index on ``expires_at`` and deleted by
+    primary key in its own transaction, so no lock is held for long.
+    """
+    from django.db import router
+    from django.utils import timezone
+
+    from django_ses import models
+
+    using = router.db_for_write(models.BlacklistedEmail)
+    now = timezone.now()
+    expired = models.BlacklistedEmail.objects.using(using).filter(expires_at__lte=now)
+    while True:
+        pks = list(expired.order_by("expires_at").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        deleted, _ = models.BlacklistedEmail.objects.using(using).filter(pk__in=pks).delete()
+        yield deleted
+
+
+def unblacklist_emails(recipients):
+    """Remove ``recipients`` from the blacklist. Returns the number of addresses removed."""
+    from django_ses import models
+
+    field, lookup = get_lookup({normalize_email(email) for email in recipients})
+    deleted, _ = models.BlacklistedEmail.objects.filter(**{field + "__in": list(lookup)}).delete()
+    if deleted:
+        invalidate_blacklist_cache()
+    return deleted
+
+
+def blacklist_domains(rules):
+    """Add domain rules such as ``example.com`` or ``*.example.com`` to the blacklist."""
+    from django_ses import models
+
+    for rule in rules:
+        domain, include_subdomains = parse_domain_rule(rule)
+        models.BlacklistedDomain.objects.update_or_create(
+            domain=domain, defaults={"include_subdomains": include_subdomains}
+        )
+    invalidate_blacklist_cache()
+
+
+def unblacklist_domains(rules):
+    """Remove domain rules from the blacklist. Returns the number of rules removed."""
+    from django_ses import models
+
+    domains = [parse_domain_rule(rule)[0] for rule in rules]
+    deleted, _ = models.BlacklistedDomain.objects.filter(domain__in=domains).delete()
+    if deleted:
+        invalidate_blacklist_cache()
+    return deleted
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_emails(addresses, batch_size=5000):
+    """
+    Add a stream of ``addresses`` to the blacklist, ``batch_size`` at a time.
+
+    Addresses already on the blacklist are skipped by the database rather than
+    looked up first, and their expiring entries become permanent. On
+    PostgreSQL every batch is loaded with ``COPY``, elsewhere with
+    ``bulk_create(ignore_conflicts=True)``. Returns the number of addresses
+    read.
+    """
+    from django.db import NotSupportedError, connections, router, transaction
+
+    from django_ses import models
+
+    using = router.db_for_write(models.BlacklistedEmail)
+    connection = connections[using]
+    emails = (normalize_email(address) for address in addresses)
+    total = 0
+    for chunk in _chunks((email for email in emails if email), batch_size):
+        unique = list(dict.fromkeys(chunk))
+        objs = [new_blacklisted_email(email) for email in unique]
+        total += len(chunk)
+        field, lookup = get_lookup(unique)
+        with transaction.atomic(using=using):
+            if connection.vendor == "postgresql":
+                _copy_blacklisted_emails(connection, objs)
+            else:
+                try:
+                    models.BlacklistedEmail.objects.using(using).bulk_create(objs, ignore_conflicts=True)
+                except NotSupportedError:  # Oracle doesn't support "ignore_conflicts"
+                    blacklist_emails(unique)
+            # Rows that already existed were left untouched; an import is a
+            # permanent suppression, like a permanent bounce.
+            _extend_expiry(field, list(lookup), None, using)
+
+    if total:
+        invalidate_blacklist_cache(using)
+    return total
+
+
+def _copy_blacklisted_emails(connection, objs):
+    """Insert ``objs`` through a temporary table filled with ``COPY``. Must run in a transaction."""
+    from django_ses import models
+
+    def escape(value):
+        if value is None:
+            return "\\N"
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+    table = connection.ops.quote_name(models.BlacklistedEmail._meta.db_table)
+    data = "".join(
+        "%s\t%s\t%s\n" % (escape(obj.email), escape(obj.email_digest), escape(obj.reversed_domain)) for obj in objs
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE django_ses_blacklist_import "
+            "(email varchar(255), email_digest uuid, reversed_domain varchar(255)) ON COMMIT DROP"
+        )
+        copy_sql = "COPY django_ses_blacklist_import (email, email_digest, reversed_domain) FROM STDIN"
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):  # psycopg2
+            raw_cursor.copy_expert(copy_sql, io.StringIO(data))
+        else:  # psycopg 3
+            with raw_cursor.copy(copy_sql) as copy:
+                copy.write(data)
+        cursor.execute(
+            "INSERT INTO %s (email, email_digest, reversed_domain) "
+            "SELECT email, email_digest, reversed_domain FROM django_ses_blacklist_import "
+            "ON CONFLICT DO NOTHING" % table
+        )
+        # ON COMMIT DROP only fires at the end of the outermost transaction, so
+        # drop the table now for the next chunk imported in the same transaction.
+        cursor.execute("DROP TABLE django_ses_blacklist_import")
+
+
+def read_emails(f):
+    """Yield the email in the first column of every row of a CSV or text file, skipping headers."""
+    for row in csv.reader(f):
+        if row and "@" in row[0]:
+            yield row[0].strip()
+
+
+def search_emails(queryset, term):
+    """
+    Filter a queryset of ``BlacklistedEmail`` with a prefix match on an indexed column.
+
+    ``@example.com`` finds the addresses at that domain, ``*.example.com`` also
+    those at its subdomains, anything else the addresses starting with ``term``.
+    """
+    term = term.strip().lower()
+    if not term:
+        return queryset
+    if term.startswith(("@", "*.")):
+        domain, include_subdomains = parse_domain_rule(term)
+        if include_subdomains:
+            return queryset.filter(reversed_domain__startswith=reverse_domain(domain))
+        return queryset.filter(reversed_domain=reverse_domain(domain))
+    return queryset.filter(email__startswith=term)
+
+
+def export_emails(batch_size=5000):
+    """
+    Yield every address on the blacklist in insertion order.
+
+    Rows are read in batches of ``batch_size`` by primary key (keyset
+    pagination), so memory use is constant and no count is needed. Addresses
+    only stored as a digest cannot be exported and are skipped.
+    """
+    from django.db import router
+
+    from django_ses import models
+
+    queryset = models.BlacklistedEmail.objects.using(router.db_for_read(models.BlacklistedEmail))
+    queryset = queryset.filter(email__isnull=False).order_by("pk")
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).values_list("pk", "email")[:batch_size])
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        for _, email in rows:
+            yield email
+
+
+@receiver(setting_changed)
+def clear_blacklist_cache(*, setting, **kwargs):
+    global _blacklist_cache, _blacklist_buffer
+    if setting in ("AWS_SES_BLACKLIST_CACHE", "AWS_SES_BLACKLIST_DIGEST", "CACHES"):
+        with _blacklist_cache_lock:
+            _blacklist_cache = None
+    if setting in ("AWS_SES_BLACKLIST_BUFFER_INTERVAL", "AWS_SES_BLACKLIST_BUFFER_SIZE"):
+        with _blacklist_cache_lock:
+            _blacklist_buffer = None
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+def config_key(config):
+    """Return a hashable representation of a ``botocore.config.Config``."""
+    if config is None:
+        return None
+    options = getattr(config, "_user_provided_options", None)
+    if options is None:
+        return repr(config)
+    return repr(sorted(options.items()))
+
+
+class ClientPool:
+    """
+    A process-wide pool of boto3 clients.
+
+    Creating a boto3 client loads the botocore service model, resolves
+    credentials and, on first use, performs a TLS handshake. The backend is
+    re-created for nearly every outgoing email, so clients are kept here and
+    shared between backend instances. boto3 clients are thread-safe, so a
+    single client is handed out per key.
+
+    The pool is fork-safe: a child process never reuses clients (and their
+    underlying sockets) that were created by its parent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._borrowed = {}
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_pid(self):
+        pid = os.getpid()
+        if pid != self._pid:
+            self._clients = {}
+            self._borrowed = {}
+            self._pid = pid
+
+    def borrow(self, key, factory):
+        """
+        Return the client stored under ``key``, creating it with ``factory``
+        if the pool does not hold one yet.
+        """
+        with self._lock:
+            self._check_pid()
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._borrowed[key] = self._borrowed.get(key, 0) + 1
+
+        if client is None:
+            try:
+                client = factory()
+            except Exception:
+                with self._lock:
+                    self._borrowed[key] -= 1
+                raise
+            with self._lock:
+                # Another thread may have created a client in the meantime;
+                # keep the first one so every borrower shares it.
+                client = self._clients.setdefault(key, client)
+        return client
+
+    def release(self, key, client):
+        """Return a borrowed client to the pool."""
+        with self._lock:
+            self._check_pid()
+            if self._borrowed.get(key):
+                self._borrowed[key] -= 1
+
+    def borrowed(self, key):
+        """Return the number of backends currently holding the client for ``key``."""
+        with self._lock:
+            return self._borrowed.get(key, 0)
+
+    def clear(self):
+        """Drop every pooled client and reset the hit/miss counters."""
+        with self._lock:
+            self._clients = {}
+            self._borrowed = {}
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            self._check_pid()
+            return len(self._clients)
+
+
+client_pool = ClientPool()
+
+
+class AsyncClientPool:
+    """
+    A process-wide pool of open aiobotocore clients.
+
+    aiobotocore clients are async context managers bound to the event loop
+    they were entered on, so clients are kept per loop and forgotten with it.
+    Concurrent borrowers of a missing key wait for the same client instead of
+    each opening one.
+    """
+
+    def __init__(self):
+        self._loops = weakref.WeakKeyDictionary()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_clients(self):
+        pid = os.getpid()
+        if pid != self._pid:
+            self._loops = weakref.WeakKeyDictionary()
+            self._pid = pid
+        return self._loops.setdefault(asyncio.get_running_loop(), {})
+
+    async def borrow(self, key, factory):
+        """
+        Return the client stored under ``key`` for the running loop, entering
+        the context manager returned by ``factory`` if there is none yet.
+        """
+        clients = self._get_clients()
+        entry = clients.get(key)
+        if entry is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            context = factory()
+            entry = clients[key] = (context, asyncio.ensure_future(context.__aenter__()))
+        try:
+            return await asyncio.shield(entry[1])
+        except Exception:
+            if clients.get(key) is entry:
+                del clients[key]
+            raise
+
+    async def close(self):
+        """Close every client opened on the running loop."""
+        clients = self._get_clients()
+        entries = list(clients.values())
+        clients.clear()
+        for context, future in entries:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                await context.__aexit__(None, None, None)
+
+    def clear(self):
+        """Forget every pooled client and reset the hit/miss counters."""
+        self._loops = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(len(clients) for clients in list(self._loops.values()))
+
+
+async_client_pool = AsyncClientPool()
+
+
+@receiver(setting_changed)
+def clear_client_pool(*, setting, **kwargs):
+    # Credentials, regions and endpoints are all part of the pool key, but
+    # settings such as AWS_SES_CONFIG may be mutated in place, so play safe.
+    if setting.startswith("AWS_") or setting == "USE_SES_V2":
+        client_pool.clear()
+        async_client_pool.clear()
@@ -1,6 +1,9 @@
 from typing import List, Optional
 
 from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 # Allow uppercase variable names for settings properties
 # ruff: noqa: N802
@@ -55,10 +58,54 @@ class SesSettings:
     def AWS_SES_AUTO_THROTTLE(self) -> float:
         return getattr(django_settings, "AWS_SES_AUTO_THROTTLE", 0.5)
 
+    @property
+    def AWS_SES_ADAPTIVE_THROTTLE(self) -> bool:
+        return getattr(django_settings, "AWS_SES_ADAPTIVE_THROTTLE", False)
+
+    @property
+    def AWS_SES_RATE_LIMIT_TTL(self) -> Optional[float]:
+        return getattr(django_settings, "AWS_SES_RATE_LIMIT_TTL", 3600)
+
+    @property
+    def AWS_SES_MAX_RETRIES(self) -> int:
+        return getattr(django_settings, "AWS_SES_MAX_RETRIES", 3)
+
+    @property
+    def AWS_SES_RETRY_BASE_DELAY(self) -> float:
+        return getattr(django_settings, "AWS_SES_RETRY_BASE_DELAY", 0.1)
+
+    @property
+    def AWS_SES_RETRY_MAX_DELAY(self) -> float:
+        return getattr(django_settings, "AWS_SES_RETRY_MAX_DELAY", 20.0)
+
+    @property
+    def AWS_SES_RETRY_BUDGET(self) -> float:
+        return getattr(django_settings, "AWS_SES_RETRY_BUDGET", 0.1)
+
+    @property
+    def AWS_SES_RATE_LIMITER(self) -> str:
+        return getattr(django_settings, "AWS_SES_RATE_LIMITER", "local")
+
+    @property
+    def AWS_SES_RATE_LIMITER_CACHE(self) -> str:
+        return getattr(django_settings, "AWS_SES_RATE_LIMITER_CACHE", "default")
+
     @property
     def AWS_SES_CONFIG(self):
         return getattr(django_settings, "AWS_SES_CONFIG", None)
 
+    @property
+    def AWS_SES_CLIENT_POOL(self) -> bool:
+        return getattr(django_settings, "AWS_SES_CLIENT_POOL", True)
+
+    @property
+    def AWS_SES_SEND_CONCURRENCY(self) -> Optional[int]:
+        return getattr(django_settings, "AWS_SES_SEND_CONCURRENCY", None)
+
+    @property
+    def AWS_SES_QUEUE_SEND_BACKEND(self) -> str:
+        return getattr(django_settings, "AWS_SES_QUEUE_SEND_BACKEND", "django_ses.SESBackend")
+
     @property
     def AWS_SES_RETURN_PATH(self) -> Optional[str]:
         return getattr(django_settings, "AWS_SES_RETURN_PATH", None)
@@ -144,6 +191,10 @@ class SesSettings:
     def AWS_SES_ADD_BOUNCE_TO_BLACKLIST(self) -> bool:
         return getattr(django_settings, "AWS_SES_ADD_BOUNCE_TO_BLACKLIST", False)
 
+    @property
+    def AWS_SES_TRANSIENT_BOUNCE_BLACKLIST_TTL(self) -> Optional[int]:
+        return getattr(django_settings, "AWS_SES_TRANSIENT_BOUNCE_BLACKLIST_TTL", None)
+
     @property
     def AWS_SES_ADD_COMPLAINT_TO_BLACKLIST(self) -> bool:
         return getattr(django_settings, "AWS_SES_ADD_COMPLAINT_TO_BLACKLIST", False)
@@ -152,6 +203,60 @@ class SesSettings:
     def AWS_SES_USE_BLACKLIST(self) -> bool:
         return getattr(django_settings, "AWS_SES_USE_BLACKLIST", False)
 
+    @property
+    def AWS_SES_BLACKLIST_CACHE(self) -> Optional[str]:
+        return getattr(django_settings, "AWS_SES_BLACKLIST_CACHE", None)
+
+    @property
+    def AWS_SES_BLACKLIST_DIGEST(self) -> bool:
+        return getattr(django_settings, "AWS_SES_BLACKLIST_DIGEST", False)
+
+    @property
+    def AWS_SES_BLACKLIST_STORE_EMAIL(self) -> bool:
+        return getattr(django_settings, "AWS_SES_BLACKLIST_STORE_EMAIL", True)
+
+    @property
+    def AWS_SES_BLACKLIST_BUFFER_INTERVAL(self) -> Optional[float]:
+        return getattr(django_settings, "AWS_SES_BLACKLIST_BUFFER_INTERVAL", None)
+
+    @property
+    def AWS_SES_BLACKLIST_BUFFER_SIZE(self) -> int:
+        return getattr(django_settings, "AWS_SES_BLACKLIST_BUFFER_SIZE", 500)
+
+    # Databases
+    @property
+    def AWS_SES_READ_DB(self) -> Optional[str]:
+        return getattr(django_settings, "AWS_SES_READ_DB", None)
+
+    @property
+    def AWS_SES_WRITE_DB(self) -> Optional[str]:
+        return getattr(django_settings, "AWS_SES_WRITE_DB", None)
+
+    @property
+    def AWS_SES_READ_AFTER_WRITE_DELAY(self) -> float:
+        return getattr(django_settings, "AWS_SES_READ_AFTER_WRITE_DELAY", 5.0)
+
+    # Events
+    @property
+    def AWS_SES_QUEUE_EVENTS(self) -> bool:
+        return getattr(django_settings, "AWS_SES_QUEUE_EVENTS", False)
+
+    @property
+    def AWS_SES_EVENT_DEDUP_CACHE(self) -> Optional[str]:
+        return getattr(django_settings, "AWS_SES_EVENT_DEDUP_CACHE", None)
+
+    @property
+    def AWS_SES_EVENT_DEDUP_TTL(self) -> int:
+        return getattr(django_settings, "AWS_SES_EVENT_DEDUP_TTL", 86400)
+
+    @property
+    def AWS_SES_EVENT_DEDUP_LRU_SIZE(self) -> int:
+        return getattr(django_settings, "AWS_SES_EVENT_DEDUP_LRU_SIZE", 0)
+
+    @property
+    def AWS_SES_FIREHOSE_ACCESS_KEY(self) -> Optional[str]:
+        return getattr(django_settings, "AWS_SES_FIREHOSE_ACCESS_KEY", None)
+
     # Inbound
     @property
     def AWS_SES_INBOUND_HANDLER(self) -> str:
@@ -172,4 +277,62 @@ class SesSettings:
         return getattr(django_settings, "AWS_SES_INBOUND_SESSION_TOKEN", "")
 
 
-settings = SesSettings()
+SETTING_NAMES = tuple(name for name, value in vars(SesSettings).items() if isinstance(value, property))
+
+
+def _validate(values):
+    """Raise ``ImproperlyConfigured`` for combinations of settings that cannot work."""
+    if not values["AWS_SES_BLACKLIST_STORE_EMAIL"] and not values["AWS_SES_BLACKLIST_DIGEST"]:
+        # Rows without an address could then never be looked up.
+        raise ImproperlyConfigured("AWS_SES_BLACKLIST_STORE_EMAIL = False requires AWS_SES_BLACKLIST_DIGEST = True.")
+
+
+class SettingsSnapshot:
+    """
+    A read-only copy of every ``SesSettings`` value.
+
+    The values are computed on first access and stored in slots, so reading a
+    setting afterwards is a plain attribute lookup instead of one or more
+    ``getattr`` calls on Django's settings. The snapshot is cleared whenever
+    Django sends ``setting_changed`` (e.g. from ``override_settings``) and is
+    built again on the next access. Settings modified at runtime without that
+    signal are not picked up until ``reload()`` is called.
+    """
+
+    __slots__ = SETTING_NAMES
+
+    def __getattr__(self, name):
+        # Only reached for empty slots, i.e. before the snapshot is built.
+        if name not in SETTING_NAMES:
+            raise AttributeError("%r object has no attribute %r" % (type(self).__name__, name))
+        self._load()
+        return object.__getattribute__(self, name)
+
+    def _load(self):
+        live = SesSettings()
+        values = [(name, getattr(live, name)) for name in SETTING_NAMES]
+        _validate(dict(values))
+        for name, value in values:
+            object.__setattr__(self, name, value)
+
+    def reload(self):
+        """Discard the snapshot so that it is built from Django's settings again."""
+        for name in SETTING_NAMES:
+            try:
+                object.__delattr__(self, name)
+            except AttributeError:
+                pass
+
+    def __setattr__(self, name, value):
+        raise AttributeError("django-ses settings are read-only, change the Django setting %s instead" % name)
+
+    def __delattr__(self, name):
+        raise AttributeError("django-ses settings are read-only")
+
+
+settings = SettingsSnapshot()
+
+
+@receiver(setting_changed)
+def reload_settings(**kwargs):
+    settings.reload()
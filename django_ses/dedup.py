@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+CACHE_KEY_PREFIX = "django_ses:sns:"
+
+
+class MessageDeduplicator:
+    """
+    Remembers the ``MessageId`` of every SNS notification that was processed,
+    for ``ttl`` seconds, so that the redeliveries of SNS can be acknowledged
+    without processing them again.
+
+    IDs are stored in the Django cache ``cache_alias``, shared by every
+    process, and the last ``lru_size`` of them also in memory so that most
+    redeliveries to the same process take no cache lookup.
+    """
+
+    def __init__(self, cache_alias="default", ttl=86400, lru_size=0):
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.lru_hits = 0
+        self.cache_hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    @property
+    def stats(self):
+        return {"lru_hits": self.lru_hits, "cache_hits": self.cache_hits, "misses": self.misses}
+
+    def _key(self, message_id):
+        return CACHE_KEY_PREFIX + message_id
+
+    def _remember(self, message_id):
+        if not self.lru_size:
+            return
+        with self._lock:
+            self._lru[message_id] = True
+            self._lru.move_to_end(message_id)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def seen_locally(self, message_id):
+        """Return whether ``message_id`` is in the in-memory LRU."""
+        with self._lock:
+            if message_id in self._lru:
+                self._lru.move_to_end(message_id)
+                self.lru_hits += 1
+                return True
+        return False
+
+    def is_duplicate(self, message_id):
+        """Return whether ``message_id`` was already processed (or is being processed)."""
+        if self.seen_locally(message_id):
+            return True
+        if self.cache.get(self._key(message_id)) is not None:
+            with self._lock:
+                self.cache_hits += 1
+            self._remember(message_id)
+            return True
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def claim(self, message_id):
+        """
+        Record ``message_id`` as processed. Returns False if another request
+        claimed it first, in which case it must not be processed.
+        """
+        if not self.cache.add(self._key(message_id), 1, self.ttl):
+            with self._lock:
+                self.cache_hits += 1
+            return False
+        self._remember(message_id)
+        return True
+
+    def release(self, message_id):
+        """Forget ``message_id`` after its processing failed, so that SNS can deliver it again."""
+        self.cache.delete(self._key(message_id))
+        with self._lock:
+            self._lru.pop(message_id, None)
+
+
+_deduplicator = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_event_deduplicator():
+    """Return the deduplicator configured by ``AWS_SES_EVENT_DEDUP_CACHE``, or None."""
+    global _deduplicator
+    from django_ses.conf import settings
+
+    cache_alias = settings.AWS_SES_EVENT_DEDUP_CACHE
+    if not cache_alias:
+        return None
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            _deduplicator = MessageDeduplicator(
+                cache_alias, settings.AWS_SES_EVENT_DEDUP_TTL, settings.AWS_SES_EVENT_DEDUP_LRU_SIZE
+            )
+        return _deduplicator
+
+
+@receiver(setting_changed)
+def clear_event_deduplicator(*, setting, **kwargs):
+    global _deduplicator
+    if setting.startswith("AWS_SES_EVENT_DEDUP_") or setting == "CACHES":
+        with _deduplicator_lock:
+            _deduplicator = None
@@ -0,0 +1,157 @@
+import json
+import logging
+import threading
+
+from django.db import close_old_connections, connections
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+
+from django_ses import models
+from django_ses.workers import BaseQueueWorker
+
+logger = logging.getLogger(__name__)
+
+
+def build_view(view_class, raw_message):
+    """
+    Return an instance of the webhook ``view_class`` set up as if it had
+    received ``raw_message``, since handlers read the raw message from the request.
+    """
+    request = HttpRequest()
+    request.method = "POST"
+    request._body = raw_message
+    view = view_class()
+    view.setup(request)
+    return view
+
+
+def _handler_path(view_class):
+    return f"{view_class.__module__}.{view_class.__qualname__}"
+
+
+def enqueue_event(view_class, raw_message):
+    """Store a verified notification for ``EventWorker`` to process with ``view_class``."""
+    models.QueuedEvent.objects.create(handler=_handler_path(view_class), raw_message=raw_message)
+
+
+def enqueue_events(view_class, raw_messages):
+    """Store several verified notifications with a single query, like ``enqueue_event()``."""
+    handler = _handler_path(view_class)
+    models.QueuedEvent.objects.bulk_create(
+        [models.QueuedEvent(handler=handler, raw_message=raw_message) for raw_message in raw_messages]
+    )
+
+
+class EventWorker(BaseQueueWorker):
+    """
+    Claims batches of ``QueuedEvent`` rows and dispatches each notification
+    to the signals through the ``process_notification()`` method of the view
+    that received it, as that view would have without ``AWS_SES_QUEUE_EVENTS``.
+    """
+
+    model = models.QueuedEvent
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._view_classes = {}
+
+    def get_view(self, row):
+        if row.handler not in self._view_classes:
+            self._view_classes[row.handler] = import_string(row.handler)
+        return build_view(self._view_classes[row.handler], bytes(row.raw_message))
+
+    def process_rows(self, rows):
+        processed = []
+        for row in rows:
+            try:
+                view = self.get_view(row)
+                view.process_notification(json.loads(view.request.body.decode("utf-8")))
+            except Exception as exc:
+                logger.warning("Could not process queued event %s: %s", row.pk, exc, exc_info=True)
+                self.record_failure(row, exc)
+            else:
+                processed.append(row.pk)
+        return processed
+
+
+class SQSConsumer:
+    """
+    Receives SES events from an SQS queue subscribed to the SNS topic, in
+    batches of up to 10 messages per long poll, and processes each one with
+    ``handle_notification()`` of the webhook ``view_class``.
+
+    Messages are SNS notifications, verified unless ``verify`` is False, or
+    with ``raw`` the SES events themselves (SNS raw message delivery).
+    Processed messages, and messages that can never be processed, are deleted
+    with one ``DeleteMessageBatch`` call per batch. Messages whose processing
+    raised are left in the queue, for SQS to deliver again once their
+    visibility timeout expires.
+    """
+
+    max_messages = 10
+
+    def __init__(self, client, queue_url, view_class, raw=False, verify=None, wait_time=20, visibility_timeout=None):
+        self.client = client
+        self.queue_url = queue_url
+        self.view_class = view_class
+        self.raw = raw
+        self.verify = verify
+        self.wait_time = wait_time
+        self.visibility_timeout = visibility_timeout
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    def receive(self):
+        params = {
+            "QueueUrl": self.queue_url,
+            "MaxNumberOfMessages": self.max_messages,
+            "WaitTimeSeconds": self.wait_time,
+        }
+        if self.visibility_timeout is not None:
+            params["VisibilityTimeout"] = self.visibility_timeout
+        return self.client.receive_message(**params).get("Messages", [])
+
+    def handle_message(self, message):
+        """Process one SQS message. Returns whether it can be deleted."""
+        body = message["Body"]
+        raw_message = body.encode("utf-8")
+        view = build_view(self.view_class, raw_message)
+        if self.raw:
+            notification = {"Type": "Notification", "MessageId": message["MessageId"], "Message": body}
+            verify = False
+        else:
+            notification = view.load_notification(raw_message)
+            if notification is None:
+                return True
+            verify = self.verify
+        try:
+            view.handle_notification(notification, raw_message, verify=verify, defer=False)
+        except Exception as exc:
+            logger.warning("Could not process SQS message %s: %s", message["MessageId"], exc, exc_info=True)
+            return False
+        return True
+
+    def process_batch(self):
+        """Receive and process one batch of messages and return how many were received."""
+        close_old_connections()
+        messages = self.receive()
+        done = [message for message in messages if self.handle_message(message)]
+        if done:
+            response = self.client.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": message["ReceiptHandle"]} for i, message in enumerate(done)],
+            )
+            for failure in response.get("Failed", []):
+                logger.warning("Could not delete SQS message: %s", failure)
+        with self._lock:
+            self.processed += len(done)
+        return len(messages)
+
+    def run(self, stop, once=False):
+        """Process batches until ``stop`` (a ``threading.Event``) is set, or the queue is empty with ``once``."""
+        try:
+            while not stop.is_set():
+                if not self.process_batch() and once:
+                    return
+        finally:
+            connections.close_all()
@@ -1,10 +1,24 @@
 #!/usr/bin/env python
 # encoding: utf-8
 
+import contextlib
+import sys
+
 from django.core.management.base import BaseCommand
 from django.core.paginator import Paginator
 
 from django_ses import models
+from django_ses.blacklist import (
+    blacklist_domains,
+    blacklist_emails,
+    export_emails,
+    import_emails,
+    parse_domain_rule,
+    read_emails,
+    reverse_domain,
+    unblacklist_domains,
+    unblacklist_emails,
+)
 
 
 def _add_options(target):
@@ -20,6 +34,41 @@ def _add_options(target):
             help="Outputs all blacklisted emails",
         ),
         target("-s", "--search", dest="search_email", default=False, help="Search for blacklisted emails"),
+        target(
+            "--search-domain",
+            dest="search_domain",
+            default=False,
+            help="Lists blacklisted emails at a domain or any of its subdomains",
+        ),
+        target(
+            "--search-prefix",
+            dest="search_prefix",
+            default=False,
+            help="Lists blacklisted emails starting with a prefix",
+        ),
+        target(
+            "--add-domain",
+            dest="domain_to_add",
+            default=False,
+            help="Blacklists every email at a domain, or also at its subdomains with *.example.com",
+        ),
+        target("--delete-domain", dest="domain_to_delete", default=False, help="Removes a domain from your blacklist"),
+        target(
+            "--list-domains",
+            dest="list_domains",
+            default=False,
+            action="store_true",
+            help="Outputs all blacklisted domains",
+        ),
+        target("--import", dest="import_file", default=False, help="Adds the emails listed in a CSV or text file"),
+        target("--export", dest="export_file", default=False, help="Writes all blacklisted emails to a file"),
+        target(
+            "--batch-size",
+            dest="batch_size",
+            default=5000,
+            type=int,
+            help="Number of emails written to or read from the database at a time by --import and --export.",
+        ),
         target("--page", dest="page", default=1, type=int, help="Page in the results. Starts at 1."),
         target(
             "--limit",
@@ -31,6 +80,13 @@ def _add_options(target):
     )
 
 
+def _open(path, mode, stdio):
+    """Open ``path``, or wrap the command's stdin/stdout if it is ``-``."""
+    if path == "-":
+        return contextlib.nullcontext(stdio)
+    return open(path, mode, newline="", encoding="utf-8")
+
+
 class Command(BaseCommand):
     """Add, delete or list blacklisted email addresses"""
 
@@ -45,18 +101,69 @@ class Command(BaseCommand):
         email_to_delete="",
         list_emails="",
         search_email="",
+        search_domain="",
+        search_prefix="",
+        domain_to_add="",
+        domain_to_delete="",
+        list_domains=False,
+        import_file="",
+        export_file="",
+        batch_size=5000,
         page=1,
         limit=1000,
         **options,
     ):
-        if email_to_add:
+        if import_file:
+            with _open(import_file, "r", sys.stdin) as f:
+                count = import_emails(read_emails(f), batch_size=batch_size)
+            if verbosity != "0":
+                self.stderr.write(f"Imported {count} emails")
+        elif export_file:
+            count = 0
+            with _open(export_file, "w", self.stdout) as f:
+                for email in export_emails(batch_size=batch_size):
+                    f.write(email + "\n")
+                    count += 1
+            if verbosity != "0":
+                self.stderr.write(f"Exported {count} emails")
+        elif domain_to_add:
+            if verbosity != "0":
+                self.stdout.write(f"Adding domain: {domain_to_add}")
+            blacklist_domains([domain_to_add])
+        elif domain_to_delete:
+            if verbosity != "0":
+                self.stdout.write(f"Removing domain {domain_to_delete}")
+            unblacklist_domains([domain_to_delete])
+        elif list_domains:
+            if verbosity != "0":
+                self.stdout.write("Listing blacklisted domains:")
+            for obj in models.BlacklistedDomain.objects.order_by("reversed_domain"):
+                self.stdout.write(str(obj))
+        elif search_domain or search_prefix:
+            if verbosity != "0":
+                self.stdout.write("Searching blacklisted emails:")
+            # Both searches are prefix matches on an indexed column.
+            if search_domain:
+                domain, _ = parse_domain_rule(search_domain)
+                objs = models.BlacklistedEmail.objects.filter(reversed_domain__startswith=reverse_domain(domain))
+            else:
+                objs = models.BlacklistedEmail.objects.filter(email__startswith=search_prefix.lower())
+            objs = objs.order_by("pk")
+
+            # Slice rather than paginate to avoid counting the matches.
+            if limit > 0:
+                objs = objs[(page - 1) * limit : page * limit]
+
+            for obj in objs:
+                self.stdout.write(str(obj))
+        elif email_to_add:
             if verbosity != "0":
                 self.stdout.write(f"Adding email: {email_to_add}")
-            models.BlacklistedEmail.objects.get_or_create(email=email_to_add.lower())
+            blacklist_emails([email_to_add])
         elif email_to_delete:
             if verbosity != "0":
                 self.stdout.write(f"Removing email {email_to_delete}")
-            models.BlacklistedEmail.objects.filter(email=email_to_delete.lower()).delete()
+            unblacklist_emails([email_to_delete])
         elif list_emails:
             if verbosity != "0":
                 self.stdout.write("Listing blacklisted emails:")
@@ -68,7 +175,7 @@ class Command(BaseCommand):
                 objs = paginator.page(page).object_list
 
             for obj in objs:
-                self.stdout.write(obj.email)
+                self.stdout.write(str(obj))
         elif search_email:
             if verbosity != "0":
                 self.stdout.write("Searching blacklisted emails:")
@@ -79,4 +186,4 @@ class Command(BaseCommand):
                 objs = paginator.page(page).object_list
 
             for obj in objs:
-                self.stdout.write(obj.email)
+                self.stdout.write(str(obj))
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_ses import models
+from django_ses.blacklist import email_digest, get_domain, invalidate_blacklist_cache, reverse_domain
+
+
+class Command(BaseCommand):
+    """Store the digest and domain of every blacklisted email that does not have them yet"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", dest="batch_size", default=1000, type=int, help="Number of rows updated at a time."
+        )
+        parser.add_argument(
+            "--clear-emails",
+            dest="clear_emails",
+            default=False,
+            action="store_true",
+            help="Afterwards remove the plain text address of every row, leaving only its digest.",
+        )
+
+    def handle(self, *args, verbosity=1, batch_size=1000, clear_emails=False, **options):
+        updated, removed = self.backfill(batch_size)
+        domains = self.backfill_domains(batch_size)
+        cleared = self.clear_emails(batch_size) if clear_emails else 0
+        invalidate_blacklist_cache()
+
+        if verbosity > 0:
+            self.stdout.write(
+                f"Stored {updated} digests and {domains} domains, "
+                f"removed {removed} duplicates, cleared {cleared} emails"
+            )
+
+    def backfill(self, batch_size):
+        updated = removed = 0
+        last_pk = 0
+        while True:
+            rows = list(
+                models.BlacklistedEmail.objects.filter(pk__gt=last_pk, email_digest__isnull=True, email__isnull=False)
+                .order_by("pk")
+                .only("pk", "email")[:batch_size]
+            )
+            if not rows:
+                return updated, removed
+            last_pk = rows[-1].pk
+
+            with transaction.atomic():
+                by_digest = {}
+                duplicates = []
+                for row in rows:
+                    row.email_digest = email_digest(row.email.lower())
+                    # Addresses that only differ in case share a digest.
+                    if row.email_digest in by_digest:
+                        duplicates.append(row.pk)
+                    else:
+                        by_digest[row.email_digest] = row
+                existing = models.BlacklistedEmail.objects.filter(email_digest__in=list(by_digest))
+                for digest in existing.values_list("email_digest", flat=True):
+                    duplicates.append(by_digest.pop(digest).pk)
+
+                models.BlacklistedEmail.objects.filter(pk__in=duplicates).delete()
+                models.BlacklistedEmail.objects.bulk_update(list(by_digest.values()), ["email_digest"])
+            updated += len(by_digest)
+            removed += len(duplicates)
+
+    def backfill_domains(self, batch_size):
+        updated = 0
+        last_pk = 0
+        while True:
+            rows = list(
+                models.BlacklistedEmail.objects.filter(pk__gt=last_pk, reversed_domain="", email__isnull=False)
+                .order_by("pk")
+                .only("pk", "email")[:batch_size]
+            )
+            if not rows:
+                return updated
+            last_pk = rows[-1].pk
+            for row in rows:
+                row.reversed_domain = reverse_domain(get_domain(row.email.lower()))
+            models.BlacklistedEmail.objects.bulk_update(rows, ["reversed_domain"])
+            updated += len(rows)
+
+    def clear_emails(self, batch_size):
+        cleared = 0
+        last_pk = 0
+        queryset = models.BlacklistedEmail.objects.filter(email_digest__isnull=False, email__isnull=False)
+        while True:
+            pks = list(queryset.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return cleared
+            last_pk = pks[-1]
+            cleared += models.BlacklistedEmail.objects.filter(pk__in=pks).update(email=None)
@@ -0,0 +1,99 @@
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from django_ses import SESBackend
+from django_ses.events import SQSConsumer
+
+
+class Command(BaseCommand):
+    """
+    Process SES events delivered to an SQS queue subscribed to the SNS topic,
+    as an alternative to receiving them with the webhook view.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("queue_url", help="URL of the SQS queue.")
+        parser.add_argument(
+            "--threads", dest="threads", default=1, type=int, help="Number of threads polling the queue."
+        )
+        parser.add_argument(
+            "--wait-time", dest="wait_time", default=20, type=int, help="Seconds each long poll waits for messages."
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            dest="visibility_timeout",
+            default=None,
+            type=int,
+            help="Seconds received messages stay hidden from other consumers. Defaults to the queue's setting.",
+        )
+        parser.add_argument(
+            "--raw",
+            dest="raw",
+            default=False,
+            action="store_true",
+            help="The subscription uses raw message delivery, so messages are SES events without an SNS envelope.",
+        )
+        parser.add_argument(
+            "--no-verify",
+            dest="verify",
+            default=None,
+            action="store_false",
+            help="Do not verify the SNS signature of the messages.",
+        )
+        parser.add_argument(
+            "--view",
+            dest="view",
+            default="django_ses.views.SESEventWebhookView",
+            help="Dotted path of the webhook view whose handlers process the events.",
+        )
+        parser.add_argument(
+            "--once", dest="once", default=False, action="store_true", help="Stop once the queue is empty."
+        )
+
+    def handle(
+        self,
+        queue_url,
+        *args,
+        verbosity=1,
+        threads=1,
+        wait_time=20,
+        visibility_timeout=None,
+        raw=False,
+        verify=None,
+        view="django_ses.views.SESEventWebhookView",
+        once=False,
+        **options,
+    ):
+        # Clients, unlike sessions, can be shared between threads. The session
+        # is the backend's, so AWS_SESSION_PROFILE is honoured.
+        backend = SESBackend()
+        client = backend.create_session().client("sqs", region_name=backend._region_name, config=backend._config)
+        consumer = SQSConsumer(
+            client,
+            queue_url,
+            import_string(view),
+            raw=raw,
+            verify=verify,
+            wait_time=0 if once else wait_time,
+            visibility_timeout=visibility_timeout,
+        )
+
+        stop = threading.Event()
+        workers = [threading.Thread(target=consumer.run, args=(stop, once), daemon=True) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                # A timeout keeps the main thread responsive to Ctrl+C.
+                while worker.is_alive():
+                    worker.join(1)
+        except KeyboardInterrupt:
+            # Let the threads finish the batch they are processing.
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+        if verbosity > 0:
+            self.stdout.write(f"Processed {consumer.processed} messages")
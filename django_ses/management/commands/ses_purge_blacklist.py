@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_ses.blacklist import purge_expired_emails
+
+
+class Command(BaseCommand):
+    """Delete the blacklist entries that have expired, a batch at a time"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", dest="batch_size", default=1000, type=int, help="Number of rows deleted at a time."
+        )
+        parser.add_argument(
+            "--sleep",
+            dest="sleep",
+            default=0.0,
+            type=float,
+            help="Seconds to wait between batches, to leave room for other writes.",
+        )
+
+    def handle(self, *args, verbosity=1, batch_size=1000, sleep=0.0, **options):
+        # Expired entries are already ignored by lookups, so removing them
+        # does not require the blacklist cache to be rebuilt.
+        purged = 0
+        for deleted in purge_expired_emails(batch_size):
+            purged += deleted
+            if sleep:
+                time.sleep(sleep)
+
+        if verbosity > 0:
+            self.stdout.write(f"Purged {purged} expired emails")
@@ -0,0 +1,77 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from django_ses.outbound import QueueWorker
+
+
+class Command(BaseCommand):
+    """Send the messages queued by QueuedSESBackend through SES"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", dest="batch_size", default=100, type=int, help="Number of messages claimed at a time."
+        )
+        parser.add_argument(
+            "--max-attempts",
+            dest="max_attempts",
+            default=5,
+            type=int,
+            help="Messages that failed this many times are left in the queue and no longer sent.",
+        )
+        parser.add_argument(
+            "--claim-timeout",
+            dest="claim_timeout",
+            default=600,
+            type=int,
+            help="Seconds after which a claim by a crashed worker expires.",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            dest="retry_delay",
+            default=60,
+            type=int,
+            help="Seconds before a failed row is retried, doubled after every attempt up to an hour.",
+        )
+        parser.add_argument(
+            "--sleep",
+            dest="sleep",
+            default=5.0,
+            type=float,
+            help="Seconds to wait before polling again once the queue is empty.",
+        )
+        parser.add_argument(
+            "--once", dest="once", default=False, action="store_true", help="Exit once the queue is drained."
+        )
+
+    def handle(
+        self,
+        *args,
+        verbosity=1,
+        batch_size=100,
+        max_attempts=5,
+        claim_timeout=600,
+        retry_delay=60,
+        sleep=5.0,
+        once=False,
+        **options,
+    ):
+        worker = QueueWorker(
+            batch_size=batch_size,
+            max_attempts=max_attempts,
+            claim_timeout=timedelta(seconds=claim_timeout),
+            retry_delay=timedelta(seconds=retry_delay),
+        )
+        total = 0
+        while True:
+            processed = worker.process_batch()
+            total += processed
+            if processed:
+                continue
+            if once:
+                break
+            time.sleep(sleep)
+
+        if verbosity > 0:
+            self.stdout.write(f"Processed {total} queued emails")
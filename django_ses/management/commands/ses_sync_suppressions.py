@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from django_ses import SESBackend, settings
+from django_ses.blacklist import import_emails
+from django_ses.models import SuppressionListSync
+
+
+def _list_suppressed_emails(client, start, end, reasons, page_size):
+    """Yield pages of addresses added to the suppression list between ``start`` and ``end``."""
+    params = {"EndDate": end, "PageSize": page_size}
+    if start is not None:
+        params["StartDate"] = start
+    if reasons:
+        params["Reasons"] = reasons
+    while True:
+        response = client.list_suppressed_destinations(**params)
+        yield [summary["EmailAddress"] for summary in response.get("SuppressedDestinationSummaries", [])]
+        if not response.get("NextToken"):
+            return
+        params["NextToken"] = response["NextToken"]
+
+
+class Command(BaseCommand):
+    """
+    Copy the addresses on the SES account-level suppression list into the
+    blacklist. Each run only fetches the addresses suppressed since the
+    previous one.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", dest="full", default=False, action="store_true", help="Fetch the whole suppression list."
+        )
+        parser.add_argument(
+            "--reason",
+            dest="reasons",
+            action="append",
+            choices=["BOUNCE", "COMPLAINT"],
+            help="Only copy addresses suppressed for this reason. May be repeated.",
+        )
+        parser.add_argument(
+            "--page-size", dest="page_size", default=1000, type=int, help="Addresses fetched per request (max 1000)."
+        )
+        parser.add_argument(
+            "--overlap",
+            dest="overlap",
+            default=300,
+            type=int,
+            help="Seconds before the previous run to start from, to catch late updates.",
+        )
+
+    def handle(self, *args, verbosity=1, full=False, reasons=None, page_size=1000, overlap=300, **options):
+        # Created like the backend's client, so AWS_SESSION_PROFILE is honoured.
+        client = SESBackend(use_ses_v2=True)._create_client()
+        key = "%s:%s" % (settings.ACCESS_KEY or settings.AWS_SESSION_PROFILE or "", settings.AWS_SES_REGION_NAME)
+        if reasons:
+            key += ":" + ",".join(sorted(reasons))
+
+        state = SuppressionListSync.objects.filter(key=key).first()
+        start = None
+        if state is not None and not full:
+            start = state.synced_until - timedelta(seconds=overlap)
+        end = timezone.now()
+
+        total = 0
+        for emails in _list_suppressed_emails(client, start, end, reasons, page_size):
+            total += import_emails(emails, batch_size=page_size)
+
+        # Only move the cursor once every page has been stored, so that a
+        # failed run is simply repeated.
+        SuppressionListSync.objects.update_or_create(key=key, defaults={"synced_until": end})
+
+        if verbosity > 0:
+            self.stdout.write(f"Synced {total} suppressed addresses")
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0002_blacklistedemail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedEmail",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("message_data", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("claimed_by", models.CharField(blank=True, db_index=True, max_length=64, null=True)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Queued Email",
+                "ordering": ["pk"],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0003_queuedemail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blacklistedemail",
+            name="email_digest",
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="blacklistedemail",
+            name="email",
+            field=models.EmailField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
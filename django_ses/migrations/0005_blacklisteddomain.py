@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0004_blacklistedemail_email_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlacklistedDomain",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("domain", models.CharField(max_length=255, unique=True)),
+                ("include_subdomains", models.BooleanField(default=False)),
+                ("reversed_domain", models.CharField(db_index=True, editable=False, max_length=255)),
+            ],
+            options={
+                "verbose_name": "Blacklisted Domain",
+            },
+        ),
+        migrations.AddField(
+            model_name="blacklistedemail",
+            name="reversed_domain",
+            field=models.CharField(blank=True, db_index=True, default="", editable=False, max_length=255),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0005_blacklisteddomain"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SuppressionListSync",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=255, unique=True)),
+                ("synced_until", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Suppression List Sync",
+            },
+        ),
+    ]
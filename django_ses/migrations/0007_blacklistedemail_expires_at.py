@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0006_suppressionlistsync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blacklistedemail",
+            name="expires_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0007_blacklistedemail_expires_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedEvent",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("handler", models.CharField(max_length=255)),
+                ("raw_message", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("claimed_by", models.CharField(blank=True, db_index=True, max_length=64, null=True)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Queued Event",
+                "ordering": ["pk"],
+            },
+        ),
+    ]
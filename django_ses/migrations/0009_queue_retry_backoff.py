@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_ses", "0008_queuedevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queuedemail",
+            name="envelope",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="queuedemail",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="queuedevent",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -17,7 +17,110 @@ class SESStat(models.Model):
 
 
 class BlacklistedEmail(models.Model):
-    email = models.EmailField(max_length=255, unique=True)
+    # Empty when AWS_SES_BLACKLIST_STORE_EMAIL is False; the address is then
+    # only known by its digest.
+    email = models.EmailField(max_length=255, unique=True, null=True, blank=True)
+    # A 128 bit BLAKE2b digest of the normalized address, see
+    # django_ses.blacklist.email_digest().
+    email_digest = models.UUIDField(unique=True, null=True, blank=True, editable=False)
+    # The domain of the address with its labels reversed and a trailing dot
+    # ("com.example.mail."), so that an indexed prefix search finds a domain
+    # and all of its subdomains.
+    reversed_domain = models.CharField(max_length=255, blank=True, default="", db_index=True, editable=False)
+    # When the address stops being suppressed. Empty for permanent entries;
+    # set for transient bounces when AWS_SES_TRANSIENT_BOUNCE_BLACKLIST_TTL is.
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     def __str__(self):
-        return self.email
+        return self.email or str(self.email_digest)
+
+    def save(self, *args, **kwargs):
+        if self.email:
+            from django_ses.blacklist import email_digest, get_domain, normalize_email, reverse_domain
+
+            # Addresses are looked up in their normalized form.
+            self.email = normalize_email(self.email)
+            self.email_digest = email_digest(self.email)
+            self.reversed_domain = reverse_domain(get_domain(self.email))
+        super().save(*args, **kwargs)
+
+
+class BlacklistedDomain(models.Model):
+    """Suppresses every address of a domain and, optionally, of its subdomains."""
+
+    domain = models.CharField(max_length=255, unique=True)
+    include_subdomains = models.BooleanField(default=False)
+    reversed_domain = models.CharField(max_length=255, db_index=True, editable=False)
+
+    class Meta:
+        verbose_name = "Blacklisted Domain"
+
+    def __str__(self):
+        return "*.%s" % self.domain if self.include_subdomains else self.domain
+
+    def save(self, *args, **kwargs):
+        from django_ses.blacklist import parse_domain_rule, reverse_domain
+
+        # Accept rules such as "@example.com" and "*.example.com".
+        self.domain, include_subdomains = parse_domain_rule(self.domain)
+        self.include_subdomains = self.include_subdomains or include_subdomains
+        self.reversed_domain = reverse_domain(self.domain)
+        super().save(*args, **kwargs)
+
+
+class SuppressionListSync(models.Model):
+    """How far the SES account suppression list of a region has been copied into the blacklist."""
+
+    key = models.CharField(max_length=255, unique=True)
+    synced_until = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Suppression List Sync"
+
+    def __str__(self):
+        return self.key
+
+
+class QueuedEmail(models.Model):
+    """An outgoing message waiting to be sent by the ``ses_send_worker`` command."""
+
+    # The MIME bytes of the message, and its sender and recipients.
+    message_data = models.BinaryField()
+    envelope = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    # Failed rows are retried with an exponential backoff.
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    # Set while a worker processes the row.
+    claimed_by = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Queued Email"
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"Queued email {self.pk}"
+
+
+class QueuedEvent(models.Model):
+    """A verified SNS notification waiting to be processed by the ``ses_process_events`` command."""
+
+    # The dotted path of the SESEventWebhookView (sub)class that received it.
+    handler = models.CharField(max_length=255)
+    raw_message = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    # Set while a worker processes the row.
+    claimed_by = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Queued Event"
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"Queued event {self.pk}"
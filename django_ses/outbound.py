@@ -0,0 +1,146 @@
+import email
+import email.message
+import email.policy
+import logging
+from email.header import decode_header, make_header
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from django_ses import get_message_bytes, models
+from django_ses.conf import settings
+from django_ses.workers import BaseQueueWorker
+
+logger = logging.getLogger(__name__)
+
+__all__ = ("QueuedSESBackend",)
+
+
+class _StoredMIMEMessage(email.message.Message):
+    """A parsed stored message, written back as it was stored whatever the policy asked for."""
+
+    def as_bytes(self, unixfrom=False, policy=None, linesep="\r\n"):
+        return super().as_bytes(unixfrom, policy=email.policy.compat32.clone(linesep=linesep))
+
+
+class QueuedMessage(EmailMessage):
+    """
+    A message read back from a ``QueuedEmail``: its MIME bytes are sent as
+    they were serialized, to the recipients of its envelope. Headers the
+    sending backend adds (e.g. the configuration set) are added to them.
+    """
+
+    def __init__(self, mime, from_email, to=None, cc=None, bcc=None):
+        self.mime = bytes(mime)
+        subject = self._parse().get("Subject", "")
+        super().__init__(subject=str(make_header(decode_header(subject))), from_email=from_email, to=to, cc=cc, bcc=bcc)
+
+    def _parse(self):
+        return email.message_from_bytes(self.mime, _class=_StoredMIMEMessage)
+
+    def message(self, **kwargs):
+        msg = self._parse()
+        for name, value in self.extra_headers.items():
+            if name not in msg:
+                msg[name] = value
+        return msg
+
+
+def serialize_message(message):
+    """
+    Return the MIME bytes and the envelope of ``message`` to store in a
+    ``QueuedEmail``. Unlike a pickle, neither can run code when read back.
+    """
+    envelope = {
+        "from_email": message.from_email,
+        "to": list(message.to),
+        "cc": list(message.cc),
+        "bcc": list(message.bcc),
+    }
+    return get_message_bytes(message), envelope
+
+
+def deserialize_message(queued):
+    """Return the ``QueuedMessage`` stored in the ``QueuedEmail`` ``queued``."""
+    return QueuedMessage(queued.message_data, **queued.envelope)
+
+
+class QueuedSESBackend(BaseEmailBackend):
+    """
+    An email backend that stores outgoing messages in the database instead of
+    sending them. Run ``manage.py ses_send_worker`` to send them through
+    ``SESBackend``.
+    """
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+
+        try:
+            queued = [
+                models.QueuedEmail(message_data=message_data, envelope=envelope)
+                for message_data, envelope in map(serialize_message, email_messages)
+            ]
+            models.QueuedEmail.objects.bulk_create(queued)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(queued)
+
+
+class QueueWorker(BaseQueueWorker):
+    """
+    Claims batches of ``QueuedEmail`` rows and sends them through the
+    backend named by ``AWS_SES_QUEUE_SEND_BACKEND`` (``SESBackend`` by default).
+    See ``BaseQueueWorker`` for how rows are claimed.
+    """
+
+    model = models.QueuedEmail
+
+    def __init__(self, backend=None, **kwargs):
+        super().__init__(**kwargs)
+        self.backend = backend or get_connection(settings.AWS_SES_QUEUE_SEND_BACKEND)
+
+    def process_rows(self, rows):
+        messages = {}
+        for row in rows:
+            try:
+                messages[row.pk] = deserialize_message(row)
+            except Exception as exc:
+                logger.warning("Could not read queued email %s: %s", row.pk, exc, exc_info=True)
+                self.record_failure(row, exc)
+
+        # Send the whole batch at once, so that SESBackend looks up the
+        # recipients in the blacklist with a single query, and map its
+        # outcomes back to the rows.
+        if hasattr(self.backend, "outcomes"):
+            self.backend.outcomes = None
+        error = None
+        try:
+            self.backend.send_messages(list(messages.values()))
+        except Exception as exc:
+            error = exc
+        outcomes = getattr(self.backend, "outcomes", None)
+        if outcomes is not None:
+            outcomes = {id(outcome.message): outcome for outcome in outcomes}
+
+        sent = []
+        for row in rows:
+            if row.pk not in messages:
+                continue
+            if outcomes is None:
+                # The backend does not report outcomes, or failed before
+                # sending anything.
+                row_error = error
+            elif id(messages[row.pk]) in outcomes:
+                row_error = outcomes[id(messages[row.pk])].error
+            else:
+                # Every recipient was blacklisted.
+                row_error = None
+            if row_error is None:
+                sent.append(row.pk)
+            else:
+                logger.warning("Could not send queued email %s: %s", row.pk, row_error)
+                self.record_failure(row, row_error)
+        return sent
@@ -0,0 +1,53 @@
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using=None):
+    """
+    Return the number of rows in the table of ``model`` according to the
+    statistics of the database, or None where those are not available.
+
+    This costs one lookup in the catalog whatever the size of the table, but
+    the estimate is only as recent as the last ``ANALYZE``.
+    """
+    connection = connections[using or router.db_for_read(model)]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", [connection.ops.quote_name(table)]
+            )
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    # PostgreSQL reports -1 for tables that were never analyzed.
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator for tables too large to count.
+
+    An unfiltered queryset is counted from the database statistics when they
+    report more than ``max_count`` rows. Otherwise at most ``max_count`` rows
+    are counted, so a filter matching more rows only shows that many.
+    """
+
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.max_count:
+                return estimate
+        return queryset[: self.max_count].count()
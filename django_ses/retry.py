@@ -0,0 +1,102 @@
+import random
+import threading
+from collections import namedtuple
+
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+
+from django_ses.throttle import is_throttling_error
+
+# Error codes of transient SES failures that are worth sending again.
+RETRYABLE_ERROR_CODES = frozenset(
+    (
+        "InternalFailure",
+        "InternalServerError",
+        "RequestTimeout",
+        "RequestTimeoutException",
+        "ServiceUnavailable",
+        "ServiceUnavailableException",
+    )
+)
+
+# Exceptions a single send may raise that are turned into a failed outcome
+# instead of aborting the whole batch.
+SEND_ERRORS = (ClientError, BotoConnectionError, HTTPClientError)
+
+SendOutcome = namedtuple("SendOutcome", ["message", "sent", "attempts", "error"])
+SendOutcome.__doc__ = """The result of sending one message: whether SES accepted it, after how
+many attempts, and the last error raised if it did not."""
+
+
+def is_retryable(err):
+    """
+    Return True if ``err`` is a transient failure: throttling, an SES 5xx
+    response, or a connection error or timeout before SES answered.
+    Exceeding the daily sending quota and rejected messages are permanent.
+    """
+    if isinstance(err, (BotoConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(err, ClientError):
+        return False
+    if is_throttling_error(err):
+        return True
+    code = err.response.get("Error", {}).get("Code", "")
+    if code in RETRYABLE_ERROR_CODES:
+        return True
+    status = err.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+    return status >= 500
+
+
+class RetryBudget:
+    """
+    A thread-safe number of retries shared by every message of one batch.
+
+    Once it is spent, failed messages are not retried anymore, so an outage
+    of SES cannot stretch a large batch by ``max_retries`` sends per message.
+    """
+
+    def __init__(self, retries):
+        self._lock = threading.Lock()
+        self.remaining = retries
+
+    def consume(self):
+        """Take one retry from the budget. Returns False if none is left."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed send is attempted again.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` and use
+    "full jitter" (a random delay between zero and that bound), so senders
+    that were throttled together do not retry together.
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.1, max_delay=20.0, budget_ratio=0.1, random=random.random):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self._random = random
+
+    def budget(self, batch_size):
+        """Return the retry budget for a batch of ``batch_size`` messages."""
+        return RetryBudget(max(self.max_retries, int(batch_size * self.budget_ratio)))
+
+    def backoff(self, attempt):
+        """Return the delay before retry number ``attempt`` (starting at 1)."""
+        return self._random() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    def get_delay(self, err, attempt, budget):
+        """
+        Return the number of seconds to wait before retrying after ``attempt``
+        failed with ``err``, or None if the send should not be retried.
+        """
+        if attempt > self.max_retries or not is_retryable(err) or not budget.consume():
+            return None
+        return self.backoff(attempt)
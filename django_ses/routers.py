@@ -0,0 +1,56 @@
+from time import monotonic
+
+from django.db import DEFAULT_DB_ALIAS
+
+from django_ses.conf import settings
+
+# Workers claim rows from these, so they are never read from a replica.
+QUEUE_MODELS = {"queuedemail", "queuedevent"}
+
+
+class SESRouter:
+    """
+    Routes the queries of the django_ses models to the databases named by
+    ``AWS_SES_READ_DB`` and ``AWS_SES_WRITE_DB``, so that blacklist lookups
+    and stats can be served by a replica. Add it to ``DATABASE_ROUTERS``.
+
+    After this process writes to one of the models, its reads of that model
+    go to the write database for ``AWS_SES_READ_AFTER_WRITE_DELAY`` seconds,
+    so it sees its own writes before they reach the replica. The queues are
+    always read from the write database, and writing to them does not move
+    the reads of other models. The ``consistent_read`` hint gets the write
+    database for a read without counting it as a write.
+    """
+
+    def __init__(self, clock=monotonic):
+        self.clock = clock
+        self.last_writes = {}
+
+    def _get_write_db(self):
+        return settings.AWS_SES_WRITE_DB or DEFAULT_DB_ALIAS
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != "django_ses":
+            return None
+        read_db = settings.AWS_SES_READ_DB
+        if read_db is None or model._meta.model_name in QUEUE_MODELS:
+            return settings.AWS_SES_WRITE_DB
+        last_write = self.last_writes.get(model._meta.model_name)
+        if last_write is not None and self.clock() - last_write < settings.AWS_SES_READ_AFTER_WRITE_DELAY:
+            return self._get_write_db()
+        return read_db
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != "django_ses":
+            return None
+        if model._meta.model_name not in QUEUE_MODELS and not hints.get("consistent_read"):
+            self.last_writes[model._meta.model_name] = self.clock()
+        return settings.AWS_SES_WRITE_DB
+
+    def allow_migrate(self, db, app_label, **hints):
+        if app_label != "django_ses":
+            return None
+        # The replica gets its tables from the write database.
+        if db == settings.AWS_SES_READ_DB and db != self._get_write_db():
+            return False
+        return None
@@ -0,0 +1,264 @@
+import threading
+import time
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter driven by a monotonic clock.
+
+    Tokens are added at ``rate`` per second up to ``capacity``. Each send
+    takes one token. Callers that find the bucket empty are not blocked while
+    holding the lock; instead ``reserve`` hands out a token from the future and
+    tells the caller how long to wait for it, so concurrent senders queue up
+    behind each other at exactly ``rate``.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = clock()
+        self.waits = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def set_rate(self, rate, capacity=None):
+        """Change the refill rate, keeping the tokens accumulated so far."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = float(rate)
+            self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def reserve(self, tokens=1):
+        """Take ``tokens`` and return the number of seconds to wait before using them."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.waits += 1
+            self.total_wait += delay
+            return delay
+
+    def acquire(self, tokens=1, sleep=time.sleep):
+        """Take ``tokens``, sleeping until they are available. Returns the time waited."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+    @property
+    def level(self):
+        """The number of tokens currently available (negative when callers are queued)."""
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+class CacheRateLimiter:
+    """
+    A rate limiter shared by every process using the same Django cache.
+
+    It follows the generic cell rate algorithm: a single counter holds the
+    time, in microseconds, at which the next send is allowed. A send moves it
+    ``1 / rate`` seconds ahead with an atomic ``incr`` and waits until its
+    slot has passed, so bursts of up to ``capacity`` sends go through at once.
+    The limit only spans the processes that share the cache: use Redis or
+    Memcached, as the local-memory cache is private to each process. The
+    counter follows the wall clock, so hosts sharing a limiter should keep
+    their clocks synchronized.
+
+    After an idle period the counter lags behind the clock and is moved up
+    with a plain ``set``; senders racing at that moment may each be let
+    through at once.
+    """
+
+    def __init__(self, key, rate, cache_alias="default", clock=time.time):
+        from django.core.cache import caches
+
+        self._cache = caches[cache_alias]
+        self._clock = clock
+        self.key = "django_ses:ratelimit:%s" % key
+        self.waits = 0
+        self.total_wait = 0.0
+        self.set_rate(rate)
+
+    def set_rate(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+
+    @staticmethod
+    def _ticks(seconds):
+        return int(round(seconds * 1000000))
+
+    def _incr(self, initial, ticks):
+        # The counter never expires: it is a single key per account and region.
+        for _ in range(2):
+            self._cache.add(self.key, initial, None)
+            try:
+                return self._cache.incr(self.key, ticks)
+            except ValueError:
+                # The counter was evicted between add() and incr().
+                continue
+        return self._cache.incr(self.key, ticks)
+
+    def reserve(self, tokens=1):
+        """Take ``tokens`` and return the number of seconds to wait before using them."""
+        now = self._ticks(self._clock())
+        cost = self._ticks(tokens / self.rate)
+        earliest = now - self._ticks(self.capacity / self.rate)
+        allowed_at = self._incr(earliest, cost)
+        if allowed_at - cost < earliest:
+            # Nobody sent for a while; unused capacity does not accumulate.
+            allowed_at = earliest + cost
+            self._cache.set(self.key, allowed_at, None)
+
+        delay = max(0.0, (allowed_at - now) / 1000000)
+        if delay > 0:
+            self.waits += 1
+            self.total_wait += delay
+        return delay
+
+    def acquire(self, tokens=1, sleep=time.sleep):
+        """Take ``tokens``, sleeping until they are available. Returns the time waited."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+    @property
+    def level(self):
+        """The number of sends currently available (negative when callers are queued)."""
+        allowed_at = self._cache.get(self.key)
+        if allowed_at is None:
+            return self.capacity
+        return min(self.capacity, (self._ticks(self._clock()) - allowed_at) / 1000000 * self.rate)
+
+
+# Error codes SES uses when sends exceed the maximum send rate.
+THROTTLING_ERROR_CODES = frozenset(("Throttling", "ThrottlingException", "TooManyRequestsException"))
+
+
+def is_throttling_error(err):
+    """
+    Return True if ``err`` (a botocore ``ClientError``) means SES rejected the
+    request for exceeding the send rate, as opposed to the daily quota.
+    """
+    error = getattr(err, "response", {}).get("Error", {})
+    code = error.get("Code", "")
+    message = error.get("Message", "")
+    if code == "MaxSendRateExceeded":
+        return True
+    return code in THROTTLING_ERROR_CODES and "daily" not in message.lower()
+
+
+class AIMDController:
+    """
+    Adapts the fraction of the SES quota to send at (additive increase,
+    multiplicative decrease).
+
+    While sends succeed the factor grows by ``increase`` per second, up to
+    ``maximum``. At most ``max_interval`` seconds count between two successes,
+    so a single send after an idle period only raises it a little. Every
+    throttling error from SES multiplies it by ``decrease``, down to
+    ``minimum``.
+    """
+
+    def __init__(
+        self,
+        factor,
+        minimum=0.05,
+        maximum=1.0,
+        increase=0.02,
+        decrease=0.5,
+        max_interval=1.0,
+        clock=time.monotonic,
+    ):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.max_interval = max_interval
+        self.factor = min(max(factor, minimum), maximum)
+        self.throttled = 0
+        self._updated = clock()
+
+    def on_success(self):
+        with self._lock:
+            now = self._clock()
+            elapsed = min(max(0.0, now - self._updated), self.max_interval)
+            self.factor = min(self.maximum, self.factor + self.increase * elapsed)
+            self._updated = now
+
+    def on_throttled(self):
+        with self._lock:
+            self.factor = max(self.minimum, self.factor * self.decrease)
+            self.throttled += 1
+            self._updated = self._clock()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _create_rate_limiter(key, rate):
+    from django_ses.conf import settings
+
+    if settings.AWS_SES_RATE_LIMITER == "cache":
+        return CacheRateLimiter(key, rate, cache_alias=settings.AWS_SES_RATE_LIMITER_CACHE)
+    return TokenBucket(rate)
+
+
+def get_rate_limiter(key, rate):
+    """Return the process-wide limiter for ``key``, updated to ``rate`` sends per second.
+
+    ``AWS_SES_RATE_LIMITER`` selects a ``TokenBucket`` local to this process
+    (``"local"``, the default) or a ``CacheRateLimiter`` shared through the
+    Django cache (``"cache"``).
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = _create_rate_limiter(key, rate)
+            return limiter
+    if limiter.rate != rate:
+        limiter.set_rate(rate)
+    return limiter
+
+
+_controllers = {}
+
+
+def get_rate_controller(key, factor):
+    """Return the process-wide AIMD controller for ``key``, starting at ``factor``."""
+    with _limiters_lock:
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = _controllers[key] = AIMDController(factor)
+        return controller
+
+
+def clear_rate_limiters():
+    with _limiters_lock:
+        _limiters.clear()
+        _controllers.clear()
+
+
+@receiver(setting_changed)
+def clear_rate_limiters_on_setting_change(*, setting, **kwargs):
+    if setting in ("AWS_SES_RATE_LIMITER", "AWS_SES_RATE_LIMITER_CACHE", "AWS_SES_ADAPTIVE_THROTTLE", "CACHES"):
+        clear_rate_limiters()
@@ -1,9 +1,9 @@
 import base64
 import logging
 import re
+import threading
 import warnings
 from builtins import bytes
-from email.utils import parseaddr
 from urllib.error import URLError
 from urllib.parse import urlparse
 from urllib.request import urlopen
@@ -16,6 +16,9 @@ from django_ses.deprecation import RemovedInDjangoSES20Warning
 logger = logging.getLogger(__name__)
 
 _CERT_CACHE = {}
+# Held while downloading a certificate, so concurrent requests wait for the
+# first download instead of starting their own.
+_CERT_LOCK = threading.Lock()
 
 SES_REGEX_CERT_URL = re.compile(
     r"(?i)^https://sns\.[a-z0-9\-]+\.amazonaws\.com(\.cn)?/SimpleNotificationService\-[a-z0-9]+\.pem$"
@@ -127,6 +130,28 @@ class EventMessageVerifier(object):
         if cert_url in _CERT_CACHE:
             return _CERT_CACHE[cert_url]
 
+        with _CERT_LOCK:
+            if cert_url not in _CERT_CACHE:
+                _CERT_CACHE[cert_url] = self._load_certificate(cert_url)
+        return _CERT_CACHE[cert_url]
+
+    async def aload_certificate(self):
+        """
+        Download the certificate used to sign the event message, if it is not
+        cached yet, in a worker thread so that the event loop is not blocked.
+        """
+        from asgiref.sync import sync_to_async
+
+        cert_url = self._get_cert_url()
+        if cert_url and cert_url not in _CERT_CACHE:
+            await sync_to_async(lambda: self.certificate, thread_sensitive=False)()
+
+    async def ais_verified(self):
+        """Like ``is_verified()``, without blocking the event loop on the certificate download."""
+        await self.aload_certificate()
+        return self.is_verified()
+
+    def _load_certificate(self, cert_url):
         # Only load certificates from a certain domain?
         # Without some kind of trusted domain check, any old joe could
         # craft a event message and sign it using his own certificate
@@ -154,19 +179,16 @@ class EventMessageVerifier(object):
                 cert_url,
                 exc,
             )
-            _CERT_CACHE[cert_url] = None
-            return _CERT_CACHE[cert_url]
+            return None
 
         # Handle errors loading the certificate.
         # If the certificate is invalid then return
         # false as we couldn't verify the message.
         try:
-            _CERT_CACHE[cert_url] = x509.load_pem_x509_certificate(response.content)
+            return x509.load_pem_x509_certificate(response.content)
         except ValueError as e:
             logger.warning('Could not load certificate from %s: "%s"', cert_url, e)
-            _CERT_CACHE[cert_url] = None
-
-        return _CERT_CACHE[cert_url]
+            return None
 
     def _get_cert_url(self):
         """
@@ -272,6 +294,14 @@ def verify_event_message(notification):
     return verifier.is_verified()
 
 
+async def averify_event_message(notification):
+    """
+    Verify an SES/SNS event notification message from async code.
+    """
+    verifier = EventMessageVerifier(notification)
+    return await verifier.ais_verified()
+
+
 def verify_bounce_message(msg):
     """
     Verify an SES/SNS bounce(event) notification message.
@@ -308,6 +338,13 @@ def confirm_sns_subscription(notification):
         )
 
 
+async def aconfirm_sns_subscription(notification):
+    """Like ``confirm_sns_subscription()``, in a worker thread so that the event loop is not blocked."""
+    from asgiref.sync import sync_to_async
+
+    await sync_to_async(confirm_sns_subscription, thread_sensitive=False)(notification)
+
+
 def get_permanent_bounced_emails_from_bounce_obj(bounce_obj: dict) -> list:
     """Extracts permanent bounced email addresses only as a list of strings.
     https://docs.aws.amazon.com/ses/latest/DeveloperGuide/notification-contents.html#bounce-object
@@ -320,6 +357,18 @@ def get_permanent_bounced_emails_from_bounce_obj(bounce_obj: dict) -> list:
     ]
 
 
+def get_transient_bounced_emails_from_bounce_obj(bounce_obj: dict) -> list:
+    """Extracts transient bounced email addresses only as a list of strings.
+    https://docs.aws.amazon.com/ses/latest/DeveloperGuide/notification-contents.html#bounce-object
+    """
+    bounced_recipients = bounce_obj.get("bouncedRecipients", list())
+    return [
+        br.get("emailAddress")
+        for br in bounced_recipients
+        if br.get("status", "").startswith("4") or ("status" not in br and bounce_obj.get("bounceType") == "Transient")
+    ]
+
+
 def get_emails_from_complaint_obj(complaint_obj: dict) -> list:
     """Extracts complaint email addresses from complaint_obj
     https://docs.aws.amazon.com/ses/latest/DeveloperGuide/notification-contents.html#complaint-object
@@ -327,14 +376,82 @@ def get_emails_from_complaint_obj(complaint_obj: dict) -> list:
     return [cr.get("emailAddress") for cr in complaint_obj.get("complainedRecipients", list())]
 
 
-def filter_blacklisted_recipients(addresses):
-    from django_ses import models
+# The largest number of addresses looked up per query. SQLite allows 999 bind
+# parameters on older versions and Oracle 1000 values per IN list.
+BLACKLIST_QUERY_CHUNK_SIZE = 900
+
+
+def _normalize_addresses(addresses):
+    from django_ses.blacklist import normalize_email
 
-    """Remove blacklisted emails from addresses"""
     if isinstance(addresses, str):
         addresses = [addresses]
+    return [normalize_email(recipient) for recipient in addresses]
+
+
+def _get_in_query_chunk_size(using):
+    """Return how many values fit in one ``IN`` clause on the database ``using``."""
+    from django.db import connections
 
-    emails = [parseaddr(recipient)[1].lower() for recipient in addresses]
-    qs = models.BlacklistedEmail.objects.filter(email__in=emails)
-    excluded_emails = set(qs.values_list("email", flat=True))
-    return [email for email in emails if email not in excluded_emails]
+    connection = connections[using]
+    limits = [BLACKLIST_QUERY_CHUNK_SIZE, connection.features.max_query_params, connection.ops.max_in_list_size()]
+    return min(limit for limit in limits if limit)
+
+
+def get_blacklisted_emails(addresses):
+    """
+    Return the set of normalized ``addresses`` that are on the blacklist.
+
+    Addresses are looked up with one ``email__in`` query per chunk of
+    addresses, sized to stay under the bind parameter limits of the database,
+    and their domains with one query for the ``BlacklistedDomain`` rules that
+    may apply. With ``AWS_SES_BLACKLIST_CACHE`` only the addresses the
+    blacklist filter cannot rule out are looked up, and the domain rules are
+    kept in memory. With ``AWS_SES_BLACKLIST_DIGEST`` addresses are looked up
+    by digest rather than by address. Entries whose ``expires_at`` has passed
+    are ignored.
+    """
+    from django.db import router
+    from django.utils import timezone
+
+    from django_ses import models
+
+    emails = sorted(set(_normalize_addresses(addresses)))
+    if not emails:
+        return set()
+
+    from django_ses.blacklist import DomainMatcher, get_blacklist_cache, get_lookup, values_in
+
+    using = router.db_for_read(models.BlacklistedEmail)
+    blacklist_cache = get_blacklist_cache()
+    matcher = blacklist_cache.get_domain_matcher() if blacklist_cache is not None else None
+    if matcher is None:
+        matcher = DomainMatcher.for_emails(emails, using)
+
+    blacklisted = {email for email in emails if matcher.matches(email)}
+    emails = [email for email in emails if email not in blacklisted]
+    if blacklist_cache is not None:
+        emails = blacklist_cache.get_candidates(emails)
+    if not emails:
+        return blacklisted
+
+    # Expired entries are dropped here rather than in the query, so that it
+    # stays a plain lookup on the unique index.
+    now = timezone.now()
+    field, lookup = get_lookup(emails)
+    for value, expires_at in values_in(models.BlacklistedEmail, field, list(lookup), using, "expires_at"):
+        if expires_at is None or expires_at > now:
+            blacklisted.add(lookup[value])
+    return blacklisted
+
+
+def filter_blacklisted_recipients(addresses, blacklisted=None):
+    """Remove blacklisted emails from addresses
+
+    ``blacklisted`` is the result of ``get_blacklisted_emails()`` for a batch
+    of addresses including these. It is looked up if not given.
+    """
+    emails = _normalize_addresses(addresses)
+    if blacklisted is None:
+        blacklisted = get_blacklisted_emails(emails)
+    return [email for email in emails if email not in blacklisted]
@@ -1,13 +1,19 @@
+import base64
 import copy
+import gzip
+import hmac
 import importlib
 import json
 import logging
+import time
 import traceback
 import warnings
 from urllib.error import URLError
 from urllib.request import urlopen
 
 import boto3
+import django
+from asgiref.sync import async_to_sync, sync_to_async
 
 try:
     from zoneinfo import ZoneInfo
@@ -15,8 +21,8 @@ except ImportError:
     from backports.zoneinfo import ZoneInfo
 
 from django.core.cache import cache
-from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse, HttpResponseBadRequest
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -24,7 +30,9 @@ from django.views.decorators.http import require_POST
 from django.views.generic.base import TemplateView, View
 
 from django_ses import settings, signals, utils
+from django_ses.dedup import get_event_deduplicator
 from django_ses.deprecation import RemovedInDjangoSES20Warning
+from django_ses.events import build_view, enqueue_event, enqueue_events
 
 logger = logging.getLogger(__name__)
 
@@ -418,31 +426,68 @@ class SESEventWebhookView(View):
     be disabled by setting AWS_SES_VERIFY_EVENT_SIGNATURES to False.
     However, this is not recommended.
     See: http://docs.amazonwebservices.com/sns/latest/gsg/SendMessageToHttp.verify.signature.html
+
+    With AWS_SES_QUEUE_EVENTS, verified notifications are stored and
+    acknowledged, and the ses_process_events command sends the signals later.
+    With AWS_SES_EVENT_DEDUP_CACHE, redeliveries of a notification that was
+    already processed are acknowledged without being verified or processed.
     """
 
     def post(self, request, *args, **kwargs):
         raw_json = request.body
 
-        try:
-            notification = json.loads(raw_json.decode("utf-8"))
-        except ValueError as e:
-            # TODO: What kind of response should be returned here?
-            logger.warning('Received notification with bad JSON: "%s"', e)
+        notification = self.load_notification(raw_json)
+        if notification is None:
             return HttpResponseBadRequest("The request body could not be deserialized. Bad JSON.")
 
+        return self.handle_notification(notification, raw_json)
+
+    def handle_notification(self, notification, raw_json, verify=None, defer=None):
+        """
+        Deduplicate, verify and process a decoded notification, and return the
+        response for SNS. ``verify`` and ``defer`` default to the
+        AWS_SES_VERIFY_EVENT_SIGNATURES and AWS_SES_QUEUE_EVENTS settings.
+        """
+        if verify is None:
+            verify = settings.VERIFY_EVENT_SIGNATURES
+        if defer is None:
+            defer = settings.AWS_SES_QUEUE_EVENTS
+        return self._handle_notification(
+            notification, raw_json, verify, defer, self.verify_event_message, self.process_notification
+        )
+
+    def _handle_notification(self, notification, raw_json, verify, defer, verify_event_message, process_notification):
+        # Shared by AsyncSESEventWebhookView, which passes its async hooks.
+        # Acknowledge redeliveries of a processed notification before doing
+        # any work on them.
+        deduplicator, message_id = self.get_deduplicator(notification)
+        if message_id and deduplicator.is_duplicate(message_id):
+            return HttpResponse()
+
         # Verify the authenticity of the event message.
-        if settings.VERIFY_EVENT_SIGNATURES and not self.verify_event_message(notification):
-            # Don't send any info back when the notification is not
-            # verified. Simply, don't process it.
-            logger.info(
-                "Received unverified notification: Type: %s",
-                notification.get("Type"),
-                extra={
-                    "notification": notification,
-                },
-            )
-            return HttpResponseBadRequest("Signature verification failed.")
+        if verify and not verify_event_message(notification):
+            return self.unverified_response(notification)
 
+        if message_id and not deduplicator.claim(message_id):
+            return HttpResponse()
+        try:
+            if notification.get("Type") == "Notification" and defer:
+                # Acknowledge right away and leave the signals to the
+                # ses_process_events command.
+                enqueue_event(type(self), raw_json)
+            else:
+                process_notification(notification)
+        except Exception:
+            if message_id:
+                deduplicator.release(message_id)
+            raise
+
+        # AWS will consider anything other than 200 to be an error response and
+        # resend the SNS request. We don't need that so we return 200 here.
+        return HttpResponse()
+
+    def process_notification(self, notification):
+        """Send the signals for a verified notification."""
         if notification.get("Type") == "SubscriptionConfirmation":
             self.handle_subscription_confirmation(notification)
         elif notification.get("Type") == "UnsubscribeConfirmation":
@@ -481,9 +526,36 @@ class SESEventWebhookView(View):
         else:
             self.handle_unknown_notification_type(notification)
 
-        # AWS will consider anything other than 200 to be an error response and
-        # resend the SNS request. We don't need that so we return 200 here.
-        return HttpResponse()
+    def load_notification(self, raw_json):
+        """Return the decoded notification, or None if it is not valid JSON."""
+        try:
+            return json.loads(raw_json.decode("utf-8"))
+        except ValueError as e:
+            # TODO: What kind of response should be returned here?
+            logger.warning('Received notification with bad JSON: "%s"', e)
+            return None
+
+    def unverified_response(self, notification):
+        # Don't send any info back when the notification is not
+        # verified. Simply, don't process it.
+        logger.info(
+            "Received unverified notification: Type: %s",
+            notification.get("Type"),
+            extra={
+                "notification": notification,
+            },
+        )
+        return HttpResponseBadRequest("Signature verification failed.")
+
+    def get_deduplicator(self, notification):
+        """
+        Return the ``MessageDeduplicator`` configured by ``AWS_SES_EVENT_DEDUP_CACHE``
+        and the ``MessageId`` of the notification, or ``(None, None)``.
+        """
+        deduplicator = get_event_deduplicator()
+        if deduplicator is None or not notification.get("MessageId"):
+            return None, None
+        return deduplicator, str(notification["MessageId"])
 
     def verify_event_message(self, notification):
         return utils.verify_event_message(notification)
@@ -579,6 +651,9 @@ class SESEventWebhookView(View):
             logger.error(traceback.format_exc())
 
     def _handle_event(self, event_name, signal, notification, message):
+        signal.send(**self._get_event_signal_kwargs(event_name, notification, message))
+
+    def _get_event_signal_kwargs(self, event_name, notification, message):
         mail_obj = message.get("mail")
         event_obj = message.get(event_name, {})
 
@@ -601,7 +676,7 @@ class SESEventWebhookView(View):
             raw_message=self.request.body,
         )
         signal_kwargs["%s_obj" % event_name] = event_obj
-        signal.send(**signal_kwargs)
+        return signal_kwargs
 
     def handle_unknown_event_type(self, notification, message):
         # We received an unknown notification type. Just log and
@@ -612,3 +687,170 @@ class SESEventWebhookView(View):
                 "notification": notification,
             },
         )
+
+
+# The event types whose signals AsyncSESEventWebhookView sends with
+# Signal.asend(), unless a subclass overrides the handler method.
+ASYNC_EVENT_SIGNALS = {
+    "Bounce": ("bounce", signals.bounce_received, "handle_bounce"),
+    "Complaint": ("complaint", signals.complaint_received, "handle_complaint"),
+    "Delivery": ("delivery", signals.delivery_received, "handle_delivery"),
+    "Send": ("send", signals.send_received, "handle_send"),
+    "Open": ("open", signals.open_received, "handle_open"),
+    "Click": ("click", signals.click_received, "handle_click"),
+}
+
+
+class AsyncSESEventWebhookView(SESEventWebhookView):
+    """
+    An ``SESEventWebhookView`` for ASGI deployments.
+
+    Deduplication, verification and queueing run in a worker thread, like the
+    certificate download and the subscription confirmation, outside of the
+    event loop. Event signals are sent with ``Signal.asend()`` (Django 5.0+)
+    so that async receivers run concurrently without a thread. Other
+    notifications, and those whose ``handle_*()`` method a subclass
+    overrides, go through ``process_notification()`` in a thread.
+
+    Async class-based views need Django 4.1 or later; async receivers need
+    Django 5.0 or later, since older versions send the signals in a thread.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        if django.VERSION < (4, 1):
+            raise ImproperlyConfigured(f"{cls.__name__} requires Django 4.1 or later.")
+        return super().as_view(**initkwargs)
+
+    async def post(self, request, *args, **kwargs):
+        raw_json = request.body
+
+        notification = self.load_notification(raw_json)
+        if notification is None:
+            return HttpResponseBadRequest("The request body could not be deserialized. Bad JSON.")
+
+        return await sync_to_async(self._handle_notification)(
+            notification,
+            raw_json,
+            settings.VERIFY_EVENT_SIGNATURES,
+            settings.AWS_SES_QUEUE_EVENTS,
+            async_to_sync(self.averify_event_message),
+            async_to_sync(self.aprocess_notification),
+        )
+
+    async def averify_event_message(self, notification):
+        return await utils.averify_event_message(notification)
+
+    def _overrides(self, name):
+        return getattr(type(self), name) is not getattr(SESEventWebhookView, name)
+
+    async def aprocess_notification(self, notification):
+        """Send the signals for a verified notification."""
+        if not self._overrides("process_notification"):
+            if notification.get("Type") == "SubscriptionConfirmation":
+                if not self._overrides("handle_subscription_confirmation"):
+                    await utils.aconfirm_sns_subscription(notification)
+                    return
+
+            elif notification.get("Type") == "Notification":
+                try:
+                    message = json.loads(notification["Message"])
+                except ValueError:
+                    message = None
+                if isinstance(message, dict):
+                    event_type = message.get("eventType", message.get("notificationType"))
+                    if event_type in ASYNC_EVENT_SIGNALS:
+                        event_name, signal, handler = ASYNC_EVENT_SIGNALS[event_type]
+                        if not self._overrides(handler):
+                            await self._ahandle_event(event_name, signal, notification, message)
+                            return
+
+        await sync_to_async(self.process_notification)(notification)
+
+    async def _ahandle_event(self, event_name, signal, notification, message):
+        signal_kwargs = self._get_event_signal_kwargs(event_name, notification, message)
+        if hasattr(signal, "asend"):
+            await signal.asend(**signal_kwargs)
+        else:  # Django < 5.0
+            await sync_to_async(signal.send)(**signal_kwargs)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SESFirehoseEventView(View):
+    """
+    Handle a batch of email sending events delivered by a Kinesis Data
+    Firehose stream to an HTTP endpoint destination.
+
+    Each record holds one SES event, which is sent to the same handlers and
+    signals as in ``event_view_class``, a ``SESEventWebhookView`` (subclass).
+    The ``raw_message`` passed to the signals is the decoded record.
+    See: https://docs.aws.amazon.com/firehose/latest/dev/httpdeliveryrequestresponse.html
+
+    Requests are only accepted if their X-Amz-Firehose-Access-Key header
+    matches AWS_SES_FIREHOSE_ACCESS_KEY. When a record raises, the view
+    responds with an error and Firehose delivers the whole batch again.
+
+    With AWS_SES_QUEUE_EVENTS, the records are stored with one query and
+    acknowledged, and the ses_process_events command sends the signals later.
+    The ``raw_message`` of queued records is then the SNS-like notification
+    they are wrapped in.
+    """
+
+    event_view_class = SESEventWebhookView
+
+    def post(self, request, *args, **kwargs):
+        request_id = request.headers.get("X-Amz-Firehose-Request-Id", "")
+        if not self.is_authorized(request):
+            logger.warning("Received Firehose request with an invalid access key: %s", request_id)
+            return self.firehose_response(request_id, "Invalid access key.", status=401)
+
+        records = self.load_records(request)
+        if records is None:
+            return self.firehose_response(request_id, "The request body could not be deserialized.", status=400)
+
+        try:
+            self.process_records(records)
+        except Exception:
+            logger.exception("Could not process Firehose request: %s", request_id)
+            return self.firehose_response(request_id, "The records could not be processed.", status=500)
+        return self.firehose_response(request_id)
+
+    def is_authorized(self, request):
+        expected = settings.AWS_SES_FIREHOSE_ACCESS_KEY
+        if not expected:
+            return False
+        access_key = request.headers.get("X-Amz-Firehose-Access-Key", "")
+        return hmac.compare_digest(access_key.encode("utf-8"), expected.encode("utf-8"))
+
+    def load_records(self, request):
+        """Return the decoded data of every record, or None if the body is malformed."""
+        try:
+            body = request.body
+            if request.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return [base64.b64decode(record["data"], validate=True) for record in json.loads(body)["records"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # ValueError also covers bad JSON and bad base64.
+            logger.warning('Received Firehose request with a bad body: "%s"', e)
+            return None
+
+    def get_notification(self, record):
+        """Wrap an SES event like SNS does, for ``process_notification()``."""
+        return {"Type": "Notification", "Message": record.decode("utf-8")}
+
+    def process_records(self, records):
+        if settings.AWS_SES_QUEUE_EVENTS:
+            enqueue_events(
+                self.event_view_class,
+                [json.dumps(self.get_notification(record)).encode("utf-8") for record in records],
+            )
+            return
+        for record in records:
+            view = build_view(self.event_view_class, record)
+            view.process_notification(self.get_notification(record))
+
+    def firehose_response(self, request_id, error_message=None, status=200):
+        data = {"requestId": request_id, "timestamp": int(time.time() * 1000)}
+        if error_message is not None:
+            data["errorMessage"] = error_message
+        return JsonResponse(data, status=status)
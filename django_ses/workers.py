@@ -0,0 +1,98 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class BaseQueueWorker:
+    """
+    Claims batches of rows of ``model`` and hands them to ``process_rows()``.
+
+    Rows are claimed by setting ``claimed_by`` and ``claimed_at`` in a short
+    transaction, processed outside of any transaction, and then deleted or
+    released in a second one, so no lock is held while messages are sent or
+    receivers run, and a database error in one row cannot roll back the
+    others. On databases that support ``SELECT ... FOR UPDATE SKIP LOCKED``
+    concurrent workers skip each other's rows while claiming them; elsewhere
+    (e.g. SQLite, which serializes writes anyway) the claim is re-checked in
+    the ``UPDATE``. Claims older than ``claim_timeout`` are considered
+    abandoned by a crashed worker.
+
+    Failed rows are not retried before ``retry_delay``, doubled after every
+    attempt up to ``max_retry_delay``.
+
+    ``model`` needs the ``attempts``, ``last_error``, ``next_attempt_at``,
+    ``claimed_by`` and ``claimed_at`` fields of ``QueuedEmail``.
+    """
+
+    model = None
+
+    def __init__(
+        self,
+        batch_size=100,
+        max_attempts=5,
+        claim_timeout=timedelta(minutes=10),
+        retry_delay=timedelta(minutes=1),
+        max_retry_delay=timedelta(hours=1),
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.claim_timeout = claim_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.worker_id = uuid.uuid4().hex
+
+    def pending(self):
+        due = Q(next_attempt_at=None) | Q(next_attempt_at__lte=timezone.now())
+        return self.model.objects.filter(due, attempts__lt=self.max_attempts).order_by("pk")
+
+    def process_batch(self):
+        """Process one batch of queued rows and return how many rows were processed."""
+        rows = self.claim()
+        self._process(rows)
+        return len(rows)
+
+    def claim(self):
+        """Claim up to ``batch_size`` rows for this worker and return them."""
+        db = router.db_for_write(self.model)
+        now = timezone.now()
+        claimable = Q(claimed_by=None) | Q(claimed_at__lt=now - self.claim_timeout)
+        with transaction.atomic(using=db):
+            pending = self.pending().filter(claimable)
+            if connections[db].features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            pks = list(pending.values_list("pk", flat=True)[: self.batch_size])
+            # Re-check the claim in the UPDATE itself so two workers racing for
+            # the same rows cannot both win them.
+            self.model.objects.filter(claimable, pk__in=pks).update(claimed_by=self.worker_id, claimed_at=now)
+        return list(self.model.objects.filter(pk__in=pks, claimed_by=self.worker_id).order_by("pk"))
+
+    def process_rows(self, rows):
+        """Process ``rows`` and return the primary keys of those that succeeded."""
+        raise NotImplementedError
+
+    def _process(self, rows):
+        if not rows:
+            return
+
+        done = set(self.process_rows(rows))
+        failed = [row for row in rows if row.pk not in done]
+        for row in failed:
+            row.claimed_by = None
+            row.claimed_at = None
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            self.model.objects.filter(pk__in=done).delete()
+            if failed:
+                self.model.objects.bulk_update(
+                    failed, ["attempts", "last_error", "next_attempt_at", "claimed_by", "claimed_at"]
+                )
+
+    def record_failure(self, row, exc):
+        row.attempts += 1
+        row.last_error = repr(exc)
+        row.next_attempt_at = timezone.now() + min(self.retry_delay * 2 ** (row.attempts - 1), self.max_retry_delay)
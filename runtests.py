@@ -18,6 +18,11 @@ from django.core.management import call_command
 
 settings.configure(
     INSTALLED_APPS=[
+        "django.contrib.admin",
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "django.contrib.messages",
+        "django.contrib.sessions",
         "django_ses",
     ],
     DATABASES={
@@ -26,7 +31,26 @@ settings.configure(
             "NAME": ":memory:",
         }
     },
-    MIDDLEWARE_CLASSES=("django.middleware.common.CommonMiddleware", "django.middleware.csrf.CsrfViewMiddleware"),
+    MIDDLEWARE=(
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ),
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "context_processors": [
+                    "django.template.context_processors.request",
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                ],
+            },
+        }
+    ],
     ROOT_URLCONF="tests.test_urls",
     SECRET_KEY="not-secret",
 )
@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from django_ses import utils
+from django_ses.models import BlacklistedDomain, BlacklistedEmail
+
+
+class BlacklistedEmailAdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(self.user)
+        for email in ["a@example.com", "b@mail.example.com", "c@other.com"]:
+            BlacklistedEmail.objects.create(email=email)
+
+    def test_changelist(self):
+        response = self.client.get(reverse("admin:django_ses_blacklistedemail_changelist"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "c@other.com")
+        self.assertContains(response, reverse("admin:django_ses_blacklistedemail_import"))
+
+    def test_search(self):
+        url = reverse("admin:django_ses_blacklistedemail_changelist")
+
+        response = self.client.get(url, {"q": "*.example.com"})
+        self.assertEqual(
+            sorted(str(obj) for obj in response.context["cl"].result_list), ["a@example.com", "b@mail.example.com"]
+        )
+
+        response = self.client.get(url, {"q": "@other.com"})
+        self.assertEqual([str(obj) for obj in response.context["cl"].result_list], ["c@other.com"])
+
+    def test_import(self):
+        url = reverse("admin:django_ses_blacklistedemail_import")
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        upload = SimpleUploadedFile("emails.csv", b"\xef\xbb\xbfemail\nNew@example.com\na@example.com\n")
+        response = self.client.post(url, {"file": upload}, follow=True)
+
+        self.assertRedirects(response, reverse("admin:django_ses_blacklistedemail_changelist"))
+        self.assertEqual([str(message) for message in response.context["messages"]], ["Imported 2 emails."])
+        self.assertTrue(BlacklistedEmail.objects.filter(email="new@example.com").exists())
+        self.assertEqual(BlacklistedEmail.objects.count(), 4)
+
+    def test_import_requires_add_permission(self):
+        staff = User.objects.create_user("staff", "staff@example.com", "password", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(reverse("admin:django_ses_blacklistedemail_import"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_add_normalizes_the_address(self):
+        url = reverse("admin:django_ses_blacklistedemail_add")
+        response = self.client.post(url, {"email": "John@Example.com"})
+
+        self.assertRedirects(response, reverse("admin:django_ses_blacklistedemail_changelist"))
+        self.assertEqual(utils.get_blacklisted_emails(["john@example.com"]), {"john@example.com"})
+
+        response = self.client.post(url, {"email": "JOHN@example.com"})
+        self.assertContains(response, "already exists")
+
+    def test_add_requires_an_address(self):
+        response = self.client.post(reverse("admin:django_ses_blacklistedemail_add"), {"email": ""})
+
+        self.assertContains(response, "This field is required.")
+        self.assertEqual(BlacklistedEmail.objects.count(), 3)
+
+
+class BlacklistedDomainAdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(self.user)
+
+    def test_add_parses_the_rule(self):
+        response = self.client.post(reverse("admin:django_ses_blacklisteddomain_add"), {"domain": "*.Foo.com"})
+
+        self.assertRedirects(response, reverse("admin:django_ses_blacklisteddomain_changelist"))
+        rule = BlacklistedDomain.objects.get()
+        self.assertEqual((rule.domain, rule.include_subdomains), ("foo.com", True))
+        self.assertEqual(utils.get_blacklisted_emails(["u@foo.com", "u@bar.foo.com"]), {"u@foo.com", "u@bar.foo.com"})
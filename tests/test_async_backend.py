@@ -0,0 +1,179 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from botocore.config import Config
+from botocore.vendored.requests.packages.urllib3.exceptions import ResponseError
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage
+from django.test import TestCase, override_settings
+
+from django_ses import models, signals
+from django_ses.async_backend import AsyncSESBackend
+from django_ses.client_pool import async_client_pool
+
+
+class FakeAsyncSESClient:
+    outbox = []
+    opened = 0
+
+    async def __aenter__(self):
+        FakeAsyncSESClient.opened += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send_raw_email(self, **kwargs):
+        if "fail@example.com" in kwargs["Destinations"]:
+            raise ResponseError("rejected")
+        self.outbox.append(kwargs)
+        return {
+            "MessageId": "fake_message_id",
+            "ResponseMetadata": {
+                "RequestId": "fake_request_id",
+            },
+        }
+
+    async def send_email(self, **kwargs):
+        self.outbox.append(kwargs)
+        return {
+            "MessageId": "fake_message_id",
+            "ResponseMetadata": {
+                "RequestId": "fake_request_id",
+            },
+        }
+
+    async def get_send_quota(self):
+        return {"MaxSendRate": 10}
+
+
+class FakeAsyncSESBackend(AsyncSESBackend):
+    def create_async_client(self):
+        return FakeAsyncSESClient()
+
+
+@override_settings(AWS_SES_CONFIGURATION_SET=None)
+class AsyncSESBackendTest(TestCase):
+    def tearDown(self):
+        FakeAsyncSESClient.outbox = []
+        FakeAsyncSESClient.opened = 0
+        async_client_pool.clear()
+
+    async def test_send_messages_async(self):
+        sent_messages = []
+
+        def on_sent(sender, message, **kwargs):
+            sent_messages.append(message)
+
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        signals.message_sent.connect(on_sent)
+        try:
+            num_sent = await FakeAsyncSESBackend().send_messages_async([message])
+        finally:
+            signals.message_sent.disconnect(on_sent)
+
+        self.assertEqual(num_sent, 1)
+        self.assertEqual(FakeAsyncSESClient.outbox[0]["Destinations"], ["to@example.com"])
+        self.assertEqual(message.extra_headers["message_id"], "fake_message_id")
+        self.assertEqual(sent_messages, [message])
+
+    @override_settings(AWS_SES_SEND_CONCURRENCY=5, AWS_SES_AUTO_THROTTLE=None)
+    async def test_send_messages_async_concurrently(self):
+        messages = [EmailMessage("subject", "body", "from@example.com", [f"to{i}@example.com"]) for i in range(20)]
+        num_sent = await FakeAsyncSESBackend().send_messages_async(messages)
+
+        self.assertEqual(num_sent, 20)
+        self.assertEqual(len(FakeAsyncSESClient.outbox), 20)
+
+    @override_settings(USE_SES_V2=True)
+    async def test_send_messages_async_v2(self):
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        await FakeAsyncSESBackend().send_messages_async([message])
+
+        self.assertEqual(FakeAsyncSESClient.outbox[0]["FromEmailAddress"], "from@example.com")
+
+    @override_settings(AWS_SES_USE_BLACKLIST=True)
+    async def test_send_messages_async_blacklist(self):
+        await sync_to_async(models.BlacklistedEmail.objects.create)(email="blocked@example.com")
+        messages = [
+            EmailMessage("subject", "body", "from@example.com", ["blocked@example.com"]),
+            EmailMessage("subject", "body", "from@example.com", ["to@example.com", "blocked@example.com"]),
+        ]
+        num_sent = await FakeAsyncSESBackend().send_messages_async(messages)
+
+        self.assertEqual(num_sent, 1)
+        self.assertEqual(FakeAsyncSESClient.outbox[0]["Destinations"], ["to@example.com"])
+
+    async def test_send_messages_async_fail_silently(self):
+        messages = [
+            EmailMessage("subject", "body", "from@example.com", ["fail@example.com"]),
+            EmailMessage("subject", "body", "from@example.com", ["to@example.com"]),
+        ]
+        num_sent = await FakeAsyncSESBackend(fail_silently=True).send_messages_async(messages)
+        self.assertEqual(num_sent, 1)
+
+        with self.assertRaises(ResponseError):
+            await FakeAsyncSESBackend().send_messages_async(messages)
+
+    async def test_client_is_pooled_per_loop(self):
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        await FakeAsyncSESBackend().send_messages_async([message])
+        await FakeAsyncSESBackend().send_messages_async([message])
+
+        self.assertEqual(FakeAsyncSESClient.opened, 1)
+        self.assertEqual(len(async_client_pool), 1)
+
+        with mock.patch.object(FakeAsyncSESClient, "__aexit__", return_value=False) as aexit:
+            await async_client_pool.close()
+        aexit.assert_called_once_with(None, None, None)
+        self.assertEqual(len(async_client_pool), 0)
+
+    @override_settings(AWS_SES_CLIENT_POOL=False)
+    async def test_client_pool_disabled(self):
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        await FakeAsyncSESBackend().send_messages_async([message])
+        await FakeAsyncSESBackend().send_messages_async([message])
+
+        self.assertEqual(FakeAsyncSESClient.opened, 2)
+        self.assertEqual(len(async_client_pool), 0)
+
+    async def test_improperly_configured_is_raised_when_failing_silently(self):
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        backend = FakeAsyncSESBackend(fail_silently=True)
+        with mock.patch.object(backend, "create_async_client", side_effect=ImproperlyConfigured):
+            with self.assertRaises(ImproperlyConfigured):
+                await backend.send_messages_async([message])
+
+    @override_settings(AWS_SES_AUTO_THROTTLE=0.5, AWS_SES_RATE_LIMITER="cache")
+    async def test_cache_rate_limiter_runs_in_a_thread(self):
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def get_throttle_delay(rate_limit, sends=1):
+            threads.append(threading.get_ident())
+            return 0
+
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        backend = FakeAsyncSESBackend()
+        with mock.patch.object(backend, "_get_throttle_delay", side_effect=get_throttle_delay):
+            await backend.send_messages_async([message])
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+
+class AsyncSendConcurrencyTest(TestCase):
+    def test_defaults_to_the_http_pool_size(self):
+        backend = AsyncSESBackend()
+        self.assertEqual(backend._async_send_concurrency, 10)
+        # The synchronous send_messages still sends one message after another.
+        self.assertEqual(backend._send_concurrency, 1)
+
+        backend = AsyncSESBackend(aws_config=Config(max_pool_connections=25))
+        self.assertEqual(backend._async_send_concurrency, 25)
+
+    @override_settings(AWS_SES_SEND_CONCURRENCY=5)
+    def test_setting(self):
+        self.assertEqual(AsyncSESBackend()._async_send_concurrency, 5)
+        self.assertEqual(AsyncSESBackend(send_concurrency=3)._async_send_concurrency, 3)
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 
 import email
+from unittest import mock
 
+from botocore.exceptions import ClientError
+from botocore.vendored.requests.packages.urllib3.exceptions import ResponseError
 from django.core.mail import EmailMessage, send_mail
 from django.test import TestCase, override_settings
 from django.utils.encoding import smart_str
 
 import django_ses
-from django_ses import models
+from django_ses import models, signals, utils
+from django_ses.client_pool import client_pool
 from tests.helper import decode_email_header
 
 # random key generated with `openssl genrsa 512`
@@ -81,6 +85,18 @@ class FakeSESConnection:
             },
         }
 
+    def send_bulk_email(self, **kwargs):
+        self.outbox.append(kwargs)
+        return {
+            "BulkEmailEntryResults": [
+                {"Status": "SUCCESS", "MessageId": "fake_message_id_%d" % i}
+                for i, _ in enumerate(kwargs["BulkEmailEntries"])
+            ],
+            "ResponseMetadata": {
+                "RequestId": "fake_request_id",
+            },
+        }
+
     @classmethod
     def client(cls, *args, **kwargs):
         return cls(args, kwargs)
@@ -167,6 +183,34 @@ class SESBackendTest(TestCase):
         self.assertIn("foo3@bar.com", destinations)
         self.assertIn("foo4@bar.com", destinations)
 
+    @override_settings(AWS_SES_USE_BLACKLIST=True, AWS_SES_AUTO_THROTTLE=None)
+    def test_blacklist_is_queried_once_per_batch(self):
+        models.BlacklistedEmail.objects.create(email="blocked@bar.com")
+        messages = [
+            EmailMessage("Hello", "world", "from@email.com", ["to%d@bar.com" % i], cc=["Blocked <BLOCKED@bar.com>"])
+            for i in range(50)
+        ]
+        messages.append(EmailMessage("Hello", "world", "from@email.com", ["blocked@bar.com"]))
+
+        backend = FakeSESBackend()
+        # One query for the addresses and one for the domain rules.
+        with self.assertNumQueries(2):
+            prepared = backend._prepare_messages(messages)
+
+        self.assertEqual(len(prepared), 50)
+        self.assertEqual(messages[0].to, ["to0@bar.com"])
+        self.assertEqual(messages[0].cc, [])
+
+    @override_settings(AWS_SES_USE_BLACKLIST=True)
+    def test_blacklist_lookup_is_chunked(self):
+        models.BlacklistedEmail.objects.create(email="to3@bar.com")
+        models.BlacklistedEmail.objects.create(email="to9@bar.com")
+        addresses = ["to%d@bar.com" % i for i in range(10)]
+
+        with mock.patch("django_ses.utils.BLACKLIST_QUERY_CHUNK_SIZE", 4), self.assertNumQueries(4):
+            blacklisted = utils.get_blacklisted_emails(addresses)
+        self.assertEqual(blacklisted, {"to3@bar.com", "to9@bar.com"})
+
     @override_settings(AWS_SES_CONFIGURATION_SET=None)
     def test_send_mail_unicode_body(self):
         unicode_from_addr = "Unicode Name óóóóóó <from@example.com>"
@@ -471,3 +515,261 @@ class GlobalEndpointDefaultTest(TestCase):
         # Verify EndpointId is NOT included when not configured
         params = FakeSESConnection.outbox[0]
         self.assertNotIn("EndpointId", params)
+
+
+class CountingSESConnection(FakeSESConnection):
+    created = 0
+
+    @classmethod
+    def client(cls, *args, **kwargs):
+        cls.created += 1
+        return cls(args, kwargs)
+
+
+class CountingSESBackend(FakeSESBackend):
+    def create_session(self):
+        return CountingSESConnection
+
+
+@override_settings(EMAIL_BACKEND="tests.test_backend.CountingSESBackend")
+class ClientPoolTest(TestCase):
+    def setUp(self):
+        client_pool.clear()
+        CountingSESConnection.created = 0
+
+    def tearDown(self):
+        client_pool.clear()
+        FakeSESConnection.outbox = []
+
+    def test_client_is_shared_between_backends(self):
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+
+        self.assertEqual(CountingSESConnection.created, 1)
+        self.assertEqual(client_pool.misses, 1)
+        self.assertEqual(client_pool.hits, 2)
+        self.assertEqual(len(client_pool), 1)
+
+    def test_close_returns_client_to_pool(self):
+        backend = CountingSESBackend()
+        backend.open()
+        key = backend._get_client_pool_key()
+        self.assertEqual(client_pool.borrowed(key), 1)
+
+        backend.close()
+        self.assertIsNone(backend.connection)
+        self.assertEqual(client_pool.borrowed(key), 0)
+
+    def test_pool_is_keyed_by_configuration(self):
+        CountingSESBackend(aws_region_name="eu-west-1").open()
+        CountingSESBackend(aws_region_name="us-west-2").open()
+        CountingSESBackend(aws_region_name="eu-west-1").open()
+
+        self.assertEqual(CountingSESConnection.created, 2)
+        self.assertEqual(len(client_pool), 2)
+
+    def test_pool_is_reset_after_fork(self):
+        CountingSESBackend().open()
+        client_pool._pid = -1
+        CountingSESBackend().open()
+
+        self.assertEqual(CountingSESConnection.created, 2)
+
+    @override_settings(AWS_SES_CLIENT_POOL=False)
+    def test_pool_disabled(self):
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+
+        self.assertEqual(CountingSESConnection.created, 2)
+        self.assertEqual(len(client_pool), 0)
+
+
+class FailingSESConnection(FakeSESConnection):
+    """Rejects every message sent to ``fail@example.com``."""
+
+    def send_raw_email(self, **kwargs):
+        if "fail@example.com" in kwargs["Destinations"]:
+            raise ResponseError("rejected")
+        return super().send_raw_email(**kwargs)
+
+
+class FailingSESBackend(FakeSESBackend):
+    def create_session(self):
+        return FailingSESConnection
+
+
+@override_settings(AWS_SES_SEND_CONCURRENCY=4, AWS_SES_CLIENT_POOL=False, AWS_SES_AUTO_THROTTLE=None)
+class ConcurrentSendTest(TestCase):
+    def tearDown(self):
+        FakeSESConnection.outbox = []
+
+    def _messages(self, recipients):
+        return [EmailMessage("subject", "body", "from@example.com", [recipient]) for recipient in recipients]
+
+    def test_send_concurrently(self):
+        sent_messages = []
+
+        def on_sent(sender, message, **kwargs):
+            sent_messages.append(message)
+
+        messages = self._messages([f"to{i}@example.com" for i in range(20)])
+        signals.message_sent.connect(on_sent)
+        try:
+            num_sent = FakeSESBackend().send_messages(messages)
+        finally:
+            signals.message_sent.disconnect(on_sent)
+
+        self.assertEqual(num_sent, 20)
+        self.assertEqual(len(FakeSESConnection.outbox), 20)
+        self.assertEqual(len(sent_messages), 20)
+        for message in messages:
+            self.assertEqual(message.extra_headers["status"], 200)
+            self.assertEqual(message.extra_headers["message_id"], "fake_message_id")
+            self.assertEqual(message.extra_headers["request_id"], "fake_request_id")
+
+    def test_send_concurrently_fail_silently(self):
+        messages = self._messages(["to1@example.com", "fail@example.com", "to2@example.com"])
+        num_sent = FailingSESBackend(fail_silently=True).send_messages(messages)
+
+        self.assertEqual(num_sent, 2)
+        self.assertEqual(messages[0].extra_headers["status"], 200)
+        self.assertIsNone(messages[1].extra_headers["status"])
+        self.assertEqual(messages[2].extra_headers["status"], 200)
+
+    def test_send_concurrently_raises(self):
+        messages = self._messages(["to1@example.com", "fail@example.com", "to2@example.com"])
+        with self.assertRaises(ResponseError):
+            FailingSESBackend().send_messages(messages)
+
+    @override_settings(AWS_SES_SEND_CONCURRENCY=None)
+    def test_concurrency_disabled_by_default(self):
+        self.assertEqual(FakeSESBackend()._send_concurrency, 1)
+        self.assertEqual(FakeSESBackend(send_concurrency=8)._send_concurrency, 8)
+
+
+@override_settings(
+    USE_SES_V2=True,
+    AWS_SES_FROM_ARN=None,
+    AWS_SES_SOURCE_ARN=None,
+    AWS_SES_CONFIGURATION_SET=None,
+    AWS_SES_AUTO_THROTTLE=None,
+)
+class SendBulkTest(TestCase):
+    def tearDown(self):
+        FakeSESConnection.outbox = []
+
+    def test_send_bulk(self):
+        results = FakeSESBackend().send_bulk(
+            "welcome",
+            [
+                {"to": ["one@example.com"], "template_data": {"name": "One"}, "tags": {"campaign": "spring"}},
+                {"to": "two@example.com", "cc": ["cc@example.com"]},
+            ],
+            from_email="from@example.com",
+            template_data={"name": "friend"},
+        )
+
+        self.assertEqual(
+            results,
+            [
+                {"status": "SUCCESS", "message_id": "fake_message_id_0", "error": None},
+                {"status": "SUCCESS", "message_id": "fake_message_id_1", "error": None},
+            ],
+        )
+        params = FakeSESConnection.outbox.pop()
+        self.assertEqual(params["FromEmailAddress"], "from@example.com")
+        self.assertEqual(
+            params["DefaultContent"], {"Template": {"TemplateName": "welcome", "TemplateData": '{"name": "friend"}'}}
+        )
+        self.assertEqual(
+            params["BulkEmailEntries"],
+            [
+                {
+                    "Destination": {"ToAddresses": ["one@example.com"]},
+                    "ReplacementEmailContent": {"ReplacementTemplate": {"ReplacementTemplateData": '{"name": "One"}'}},
+                    "ReplacementTags": [{"Name": "campaign", "Value": "spring"}],
+                },
+                {"Destination": {"ToAddresses": ["two@example.com"], "CcAddresses": ["cc@example.com"]}},
+            ],
+        )
+        self.assertNotIn("ConfigurationSetName", params)
+        self.assertNotIn("FromEmailAddressIdentityArn", params)
+
+    def test_send_bulk_chunks_entries(self):
+        entries = [{"to": [f"to{i}@example.com"]} for i in range(120)]
+        results = FakeSESBackend().send_bulk("welcome", entries, from_email="from@example.com")
+
+        self.assertEqual([len(call["BulkEmailEntries"]) for call in FakeSESConnection.outbox], [50, 50, 20])
+        self.assertEqual(len(results), 120)
+        self.assertEqual(results[119]["message_id"], "fake_message_id_19")
+
+    @override_settings(
+        AWS_SES_FROM_ARN="arn:aws:ses:eu-central-1:222222222222:identity/example.com",
+        AWS_SES_CONFIGURATION_SET="test-set",
+    )
+    def test_send_bulk_settings(self):
+        FakeSESBackend().send_bulk(
+            "arn:aws:ses:eu-central-1:222222222222:template/welcome", [{"to": ["to@example.com"]}], "from@example.com"
+        )
+
+        params = FakeSESConnection.outbox.pop()
+        self.assertEqual(
+            params["FromEmailAddressIdentityArn"], "arn:aws:ses:eu-central-1:222222222222:identity/example.com"
+        )
+        self.assertEqual(params["ConfigurationSetName"], "test-set")
+        self.assertEqual(
+            params["DefaultContent"]["Template"]["TemplateArn"],
+            "arn:aws:ses:eu-central-1:222222222222:template/welcome",
+        )
+
+    @override_settings(AWS_SES_USE_BLACKLIST=True)
+    def test_send_bulk_blacklist(self):
+        models.BlacklistedEmail.objects.create(email="blocked@example.com")
+        results = FakeSESBackend().send_bulk(
+            "welcome",
+            [{"to": ["blocked@example.com"]}, {"to": ["to@example.com", "blocked@example.com"]}],
+            from_email="from@example.com",
+        )
+
+        self.assertEqual(results[0]["status"], "BLACKLISTED")
+        self.assertEqual(results[1]["status"], "SUCCESS")
+        params = FakeSESConnection.outbox.pop()
+        self.assertEqual(params["BulkEmailEntries"], [{"Destination": {"ToAddresses": ["to@example.com"]}}])
+
+    def test_send_bulk_error_keeps_results(self):
+        entries = [{"to": [f"to{i}@example.com"]} for i in range(120)]
+        calls = []
+
+        def send_bulk_email(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise ClientError({"Error": {"Code": "MessageRejected", "Message": "Rejected"}}, "SendBulkEmail")
+            return {
+                "BulkEmailEntryResults": [
+                    {"Status": "SUCCESS", "MessageId": "fake_message_id_%d" % i}
+                    for i, _ in enumerate(kwargs["BulkEmailEntries"])
+                ],
+                "ResponseMetadata": {"RequestId": "fake_request_id"},
+            }
+
+        backend = FakeSESBackend()
+        with mock.patch.object(FakeSESConnection, "send_bulk_email", side_effect=send_bulk_email):
+            with self.assertRaises(ClientError) as cm:
+                backend.send_bulk("welcome", entries, from_email="from@example.com")
+
+        self.assertEqual(len(calls), 3)
+        results = cm.exception.results
+        self.assertEqual(results[0], {"status": "MessageRejected", "message_id": None, "error": "Rejected"})
+        self.assertEqual(results[50]["status"], "SUCCESS")
+        self.assertEqual(results[119]["message_id"], "fake_message_id_19")
+
+        calls.clear()
+        with mock.patch.object(FakeSESConnection, "send_bulk_email", side_effect=send_bulk_email):
+            results = FakeSESBackend(fail_silently=True).send_bulk("welcome", entries, from_email="from@example.com")
+        self.assertEqual([result["status"] for result in results[49:51]], ["MessageRejected", "SUCCESS"])
+
+    @override_settings(USE_SES_V2=False)
+    def test_send_bulk_requires_v2(self):
+        with self.assertRaises(ValueError):
+            FakeSESBackend().send_bulk("welcome", [{"to": ["to@example.com"]}])
@@ -49,9 +49,9 @@ class LocalStackIntegrationTest(TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
-        super().setUpClass()
-
-        # Validate LocalStack is accessible before running tests
+        # Validate LocalStack is accessible before running tests. This happens
+        # before TestCase opens its class-wide transaction, which a SkipTest
+        # raised afterwards would leave open for the following tests.
         try:
             response = requests.get(f"{LOCALSTACK_ENDPOINT}/_localstack/health", timeout=1)
             response.raise_for_status()
@@ -64,6 +64,8 @@ class LocalStackIntegrationTest(TestCase):
         except requests.RequestException as e:
             raise SkipTest(f"LocalStack not accessible at {LOCALSTACK_ENDPOINT}: {e}")
 
+        super().setUpClass()
+
     def tearDown(self) -> None:
         """Clean up the local stack after each test"""
         # Delete all emails from LocalStack
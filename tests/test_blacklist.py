@@ -0,0 +1,433 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from django_ses import models, utils
+from django_ses.blacklist import (
+    BlacklistBuffer,
+    BloomFilter,
+    DomainMatcher,
+    _BufferedBatch,
+    blacklist_domains,
+    blacklist_emails,
+    email_digest,
+    get_blacklist_buffer,
+    get_blacklist_cache,
+    import_emails,
+    parse_domain_rule,
+    reverse_domain,
+    search_emails,
+    write_blacklist_entries,
+)
+from django_ses.paginator import EstimatedCountPaginator, estimated_count
+from django_ses.signals import _blacklist_recipients
+
+
+class BloomFilterTest(SimpleTestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        emails = ["user%d@example.com" % i for i in range(1000)]
+        for email in emails:
+            bloom.add(email)
+
+        self.assertEqual(len(bloom), 1000)
+        self.assertTrue(all(email in bloom for email in emails))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add("user%d@example.com" % i)
+
+        false_positives = sum(1 for i in range(10000) if "other%d@example.com" % i in bloom)
+        self.assertLess(false_positives, 300)
+
+
+class DomainMatcherTest(SimpleTestCase):
+    def test_parse_domain_rule(self):
+        self.assertEqual(parse_domain_rule("Example.com"), ("example.com", False))
+        self.assertEqual(parse_domain_rule("@example.com"), ("example.com", False))
+        self.assertEqual(parse_domain_rule("*.example.com"), ("example.com", True))
+        self.assertEqual(reverse_domain("mail.example.com"), "com.example.mail.")
+
+    def test_matches(self):
+        matcher = DomainMatcher([("dead.example", False), ("gone.example", True)])
+        self.assertTrue(matcher.matches("user@dead.example"))
+        self.assertFalse(matcher.matches("user@mail.dead.example"))
+        self.assertTrue(matcher.matches("user@gone.example"))
+        self.assertTrue(matcher.matches("user@a.b.gone.example"))
+        self.assertFalse(matcher.matches("user@notgone.example"))
+        self.assertFalse(matcher.matches("user@example"))
+
+
+class DomainBlacklistTest(TestCase):
+    def test_domain_rules(self):
+        blacklist_domains(["dead.example", "*.gone.example"])
+        models.BlacklistedEmail.objects.create(email="blocked@example.com")
+
+        with self.assertNumQueries(2):
+            blacklisted = utils.get_blacklisted_emails(
+                ["a@dead.example", "b@mail.gone.example", "c@alive.example", "blocked@example.com"]
+            )
+        self.assertEqual(blacklisted, {"a@dead.example", "b@mail.gone.example", "blocked@example.com"})
+
+    def test_command(self):
+        call_command("blacklist", "--add-domain", "*.Gone.example", verbosity=0)
+        rule = models.BlacklistedDomain.objects.get()
+        self.assertEqual(
+            (rule.domain, rule.include_subdomains, rule.reversed_domain), ("gone.example", True, "example.gone.")
+        )
+
+        call_command("blacklist", "--delete-domain", "gone.example", verbosity=0)
+        self.assertFalse(models.BlacklistedDomain.objects.exists())
+
+    def test_save_parses_the_rule(self):
+        models.BlacklistedDomain.objects.create(domain="*.Foo.com")
+        models.BlacklistedDomain.objects.create(domain="@Bar.com")
+
+        self.assertEqual(
+            sorted(models.BlacklistedDomain.objects.values_list("domain", "include_subdomains", "reversed_domain")),
+            [("bar.com", False, "com.bar."), ("foo.com", True, "com.foo.")],
+        )
+        self.assertEqual(
+            utils.get_blacklisted_emails(["u@foo.com", "u@bar.foo.com", "u@bar.com", "u@baz.bar.com"]),
+            {"u@foo.com", "u@bar.foo.com", "u@bar.com"},
+        )
+
+    def test_search_domain(self):
+        for email in ["a@example.com", "b@mail.example.com", "c@examples.com", "example.com@other.com"]:
+            models.BlacklistedEmail.objects.create(email=email)
+
+        out = StringIO()
+        call_command("blacklist", "--search-domain", "example.com", stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[1:], ["a@example.com", "b@mail.example.com"])
+
+        out = StringIO()
+        call_command("blacklist", "--search-prefix", "Example", stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[1:], ["example.com@other.com"])
+
+
+class BlacklistAdminHelpersTest(TestCase):
+    def setUp(self):
+        for email in ["a@example.com", "b@mail.example.com", "ab@examples.com"]:
+            models.BlacklistedEmail.objects.create(email=email)
+
+    def test_search_emails(self):
+        def search(term):
+            return sorted(str(obj) for obj in search_emails(models.BlacklistedEmail.objects.all(), term))
+
+        self.assertEqual(search("A"), ["a@example.com", "ab@examples.com"])
+        self.assertEqual(search("@Example.com"), ["a@example.com"])
+        self.assertEqual(search("*.example.com"), ["a@example.com", "b@mail.example.com"])
+        self.assertEqual(len(search("")), 3)
+
+    def test_paginator_counts_at_most_max_count(self):
+        paginator = EstimatedCountPaginator(models.BlacklistedEmail.objects.order_by("pk"), 1)
+        paginator.max_count = 2
+        self.assertEqual(paginator.count, 2)
+
+    def test_paginator_uses_estimate(self):
+        queryset = models.BlacklistedEmail.objects.order_by("pk")
+        with mock.patch("django_ses.paginator.estimated_count", return_value=5000000) as estimate:
+            with self.assertNumQueries(0):
+                self.assertEqual(EstimatedCountPaginator(queryset, 100).num_pages, 50000)
+            # Filtered querysets are never estimated.
+            self.assertEqual(EstimatedCountPaginator(queryset.filter(email__startswith="a"), 100).count, 2)
+        estimate.assert_called_once_with(models.BlacklistedEmail, "default")
+
+    def test_estimated_count_is_unavailable_on_sqlite(self):
+        self.assertIsNone(estimated_count(models.BlacklistedEmail))
+
+
+class ExpiringBlacklistTest(TestCase):
+    def test_expired_entries_are_ignored(self):
+        now = timezone.now()
+        models.BlacklistedEmail.objects.create(email="expired@example.com", expires_at=now - timedelta(seconds=1))
+        models.BlacklistedEmail.objects.create(email="soft@example.com", expires_at=now + timedelta(hours=1))
+        models.BlacklistedEmail.objects.create(email="hard@example.com")
+
+        blacklisted = utils.get_blacklisted_emails(["expired@example.com", "soft@example.com", "hard@example.com"])
+        self.assertEqual(blacklisted, {"soft@example.com", "hard@example.com"})
+
+    def test_expiry_is_extended_not_shortened(self):
+        now = timezone.now()
+        blacklist_emails(["a@example.com", "b@example.com"], now + timedelta(hours=1))
+        blacklist_emails(["a@example.com", "c@example.com"], now + timedelta(hours=2))
+        blacklist_emails(["b@example.com"], now - timedelta(hours=1))
+        blacklist_emails(["d@example.com"])
+        blacklist_emails(["d@example.com"], now + timedelta(hours=1))
+
+        expires = dict(models.BlacklistedEmail.objects.values_list("email", "expires_at"))
+        self.assertEqual(
+            expires,
+            {
+                "a@example.com": now + timedelta(hours=2),
+                "b@example.com": now + timedelta(hours=1),
+                "c@example.com": now + timedelta(hours=2),
+                "d@example.com": None,
+            },
+        )
+
+    def test_import_makes_entries_permanent(self):
+        soon = timezone.now() + timedelta(hours=1)
+        blacklist_emails(["a@example.com", "b@example.com"], soon)
+
+        self.assertEqual(import_emails(["A@example.com", "c@example.com"], batch_size=1), 2)
+
+        expires = dict(models.BlacklistedEmail.objects.values_list("email", "expires_at"))
+        self.assertEqual(expires, {"a@example.com": None, "b@example.com": soon, "c@example.com": None})
+
+    @override_settings(
+        AWS_SES_BLACKLIST_CACHE="default",
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_cache_skips_expired_entries(self):
+        caches["default"].clear()
+        models.BlacklistedEmail.objects.create(
+            email="expired@example.com", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        utils.get_blacklisted_emails(["warmup@example.com"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(utils.get_blacklisted_emails(["expired@example.com"]), set())
+
+        # Blacklisting it again brings it back.
+        with self.captureOnCommitCallbacks(execute=True):
+            blacklist_emails(["expired@example.com"], timezone.now() + timedelta(hours=1))
+        self.assertEqual(utils.get_blacklisted_emails(["expired@example.com"]), {"expired@example.com"})
+
+
+class BlacklistBufferTest(SimpleTestCase):
+    def test_concurrent_adds_are_written_together(self):
+        buffer = BlacklistBuffer(max_size=8, interval=5)
+        with mock.patch("django_ses.blacklist.write_blacklist_entries") as write:
+            threads = [
+                threading.Thread(target=buffer.add, args=(["To%d@example.com" % i, "shared@example.com"],))
+                for i in range(7)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        # The batch is written as soon as it holds max_size addresses.
+        write.assert_called_once()
+        entries = write.call_args[0][0]
+        self.assertEqual(len(entries), 8)
+        self.assertIn("to3@example.com", entries)
+        self.assertEqual(buffer.flushes, 1)
+
+    def test_entries_are_coalesced(self):
+        now = timezone.now()
+        batch = _BufferedBatch()
+        batch.add(["a@example.com", "b@example.com"], now)
+        batch.add(["a@example.com"], now + timedelta(hours=1))
+        batch.add(["b@example.com"], None)
+        batch.add(["b@example.com"], now)
+        self.assertEqual(batch.entries, {"a@example.com": now + timedelta(hours=1), "b@example.com": None})
+
+    def test_failed_write_falls_back_to_direct_writes(self):
+        buffer = BlacklistBuffer(interval=0)
+        with mock.patch("django_ses.blacklist.write_blacklist_entries", side_effect=DatabaseError):
+            with mock.patch("django_ses.blacklist.blacklist_emails", side_effect=DatabaseError) as blacklist:
+                with self.assertRaises(DatabaseError):
+                    buffer.add(["to@example.com"])
+        blacklist.assert_called_once_with(["to@example.com"], None)
+
+
+@override_settings(AWS_SES_BLACKLIST_BUFFER_INTERVAL=0)
+class BufferedBlacklistTest(TransactionTestCase):
+    def test_handlers_write_through_the_buffer(self):
+        models.BlacklistedEmail.objects.create(email="existing@example.com", expires_at=timezone.now())
+
+        with mock.patch("django_ses.blacklist.write_blacklist_entries", wraps=write_blacklist_entries) as write:
+            with CaptureQueriesContext(connection) as queries:
+                _blacklist_recipients(["new@example.com", "Existing@example.com"])
+
+        write.assert_called_once()
+        # One INSERT and one UPDATE. Django < 4.2 doesn't log BEGIN on SQLite.
+        statements = [query["sql"] for query in queries if query["sql"] not in ("BEGIN", "COMMIT")]
+        self.assertEqual(len(statements), 2, statements)
+
+        self.assertEqual(
+            dict(models.BlacklistedEmail.objects.values_list("email", "expires_at")),
+            {"existing@example.com": None, "new@example.com": None},
+        )
+        self.assertIsNotNone(get_blacklist_buffer())
+
+    def test_transactions_bypass_the_buffer(self):
+        with mock.patch("django_ses.blacklist.write_blacklist_entries") as write:
+            with transaction.atomic():
+                _blacklist_recipients(["new@example.com"])
+                self.assertTrue(models.BlacklistedEmail.objects.filter(email="new@example.com").exists())
+
+        write.assert_not_called()
+
+
+@override_settings(
+    AWS_SES_BLACKLIST_CACHE="default",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class BlacklistCacheTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        models.BlacklistedEmail.objects.create(email="blocked@example.com")
+
+    def test_negative_lookups_take_no_queries(self):
+        utils.get_blacklisted_emails(["warmup@example.com"])
+
+        with self.assertNumQueries(0):
+            blacklisted = utils.get_blacklisted_emails(["to%d@example.com" % i for i in range(100)])
+        self.assertEqual(blacklisted, set())
+
+    def test_hits_are_confirmed(self):
+        utils.get_blacklisted_emails(["warmup@example.com"])
+
+        with self.assertNumQueries(1):
+            blacklisted = utils.get_blacklisted_emails(["Blocked@Example.com", "to@example.com"])
+        self.assertEqual(blacklisted, {"blocked@example.com"})
+
+    def test_domain_rules_are_cached(self):
+        blacklist_domains(["*.gone.example"])
+        utils.get_blacklisted_emails(["warmup@example.com"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(utils.get_blacklisted_emails(["a@mail.gone.example"]), {"a@mail.gone.example"})
+
+    def test_filter_is_built_once(self):
+        blacklist_cache = get_blacklist_cache()
+        builds = blacklist_cache.builds
+        for _ in range(3):
+            utils.get_blacklisted_emails(["to@example.com"])
+        self.assertEqual(blacklist_cache.builds, builds + 1)
+
+    def test_blacklist_recipients_invalidates(self):
+        utils.get_blacklisted_emails(["warmup@example.com"])
+        with self.captureOnCommitCallbacks(execute=True):
+            _blacklist_recipients(["bounced@example.com"])
+        self.assertEqual(utils.get_blacklisted_emails(["bounced@example.com"]), {"bounced@example.com"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _blacklist_recipients(["bounced2@example.com", "bounced3@example.com"])
+        self.assertEqual(
+            utils.get_blacklisted_emails(["bounced2@example.com", "bounced3@example.com"]),
+            {"bounced2@example.com", "bounced3@example.com"},
+        )
+
+    def test_command_invalidates(self):
+        utils.get_blacklisted_emails(["warmup@example.com"])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("blacklist", "--add", "added@example.com", verbosity=0)
+        self.assertEqual(utils.get_blacklisted_emails(["added@example.com"]), {"added@example.com"})
+
+    def test_invalidated_on_commit(self):
+        utils.get_blacklisted_emails(["warmup@example.com"])
+        version = caches["default"].get("django_ses:blacklist:version")
+        with self.captureOnCommitCallbacks() as callbacks:
+            blacklist_emails(["later@example.com"])
+            # Until the transaction commits, other processes keep the old version.
+            self.assertEqual(caches["default"].get("django_ses:blacklist:version"), version)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(caches["default"].get("django_ses:blacklist:version"), version)
+
+    def test_filter_is_built_from_the_primary(self):
+        with mock.patch("django.db.router.db_for_write", return_value="default") as db_for_write:
+            get_blacklist_cache().get_filter()
+        db_for_write.assert_called_once_with(models.BlacklistedEmail, consistent_read=True)
+
+    def test_lookups_during_rebuild_query_the_database(self):
+        blacklist_cache = get_blacklist_cache()
+        blacklist_domains(["gone.example"])
+        building = threading.Event()
+        release = threading.Event()
+        built = blacklist_cache._build()
+
+        def slow_build():
+            building.set()
+            release.wait(5)
+            return built
+
+        # The rebuilding thread cannot read the rows of this test's transaction.
+        matcher = DomainMatcher.load()
+        with mock.patch.object(blacklist_cache, "_build", side_effect=slow_build):
+            with mock.patch.object(DomainMatcher, "load", return_value=matcher):
+                thread = threading.Thread(target=blacklist_cache.get_filter)
+                thread.start()
+                building.wait(5)
+                try:
+                    self.assertIsNone(blacklist_cache.get_filter())
+                    self.assertEqual(
+                        utils.get_blacklisted_emails(["blocked@example.com", "a@gone.example", "to@example.com"]),
+                        {"blocked@example.com", "a@gone.example"},
+                    )
+                finally:
+                    release.set()
+                    thread.join()
+        self.assertIsNotNone(blacklist_cache.get_filter())
+
+    def test_other_process_invalidation(self):
+        blacklist_cache = get_blacklist_cache()
+        utils.get_blacklisted_emails(["warmup@example.com"])
+        builds = blacklist_cache.builds
+        # Simulate another process changing the table and bumping the version.
+        models.BlacklistedEmail.objects.create(email="elsewhere@example.com")
+        caches["default"].set("django_ses:blacklist:version", "other", None)
+
+        self.assertEqual(utils.get_blacklisted_emails(["elsewhere@example.com"]), {"elsewhere@example.com"})
+        self.assertEqual(blacklist_cache.builds, builds + 1)
+
+    @override_settings(AWS_SES_BLACKLIST_CACHE=None)
+    def test_disabled(self):
+        self.assertIsNone(get_blacklist_cache())
+        with self.assertNumQueries(2):
+            utils.get_blacklisted_emails(["to@example.com"])
+
+
+@override_settings(AWS_SES_BLACKLIST_DIGEST=True, AWS_SES_BLACKLIST_STORE_EMAIL=False)
+class DigestBlacklistTest(TestCase):
+    def test_blacklist_recipients_stores_digests(self):
+        _blacklist_recipients(["Bounced@example.com"])
+        _blacklist_recipients(["bounced@example.com", "other@example.com"])
+
+        self.assertEqual(models.BlacklistedEmail.objects.count(), 2)
+        blacklisted = models.BlacklistedEmail.objects.get(email_digest=email_digest("bounced@example.com"))
+        self.assertIsNone(blacklisted.email)
+        # The domain is kept for both single and bulk inserts.
+        self.assertEqual(
+            set(models.BlacklistedEmail.objects.values_list("reversed_domain", flat=True)), {"com.example."}
+        )
+
+    def test_lookup_by_digest(self):
+        _blacklist_recipients(["bounced@example.com"])
+        # Rows saved with a plain text address get a digest as well.
+        models.BlacklistedEmail.objects.create(email="Plain@example.com")
+
+        blacklisted = utils.get_blacklisted_emails(
+            ["Bounced <BOUNCED@example.com>", "plain@example.com", "to@example.com"]
+        )
+        self.assertEqual(blacklisted, {"bounced@example.com", "plain@example.com"})
+
+    @override_settings(
+        AWS_SES_BLACKLIST_CACHE="default",
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_cache_uses_digests(self):
+        _blacklist_recipients(["bounced@example.com"])
+        utils.get_blacklisted_emails(["warmup@example.com"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(utils.get_blacklisted_emails(["to@example.com"]), set())
+        self.assertEqual(utils.get_blacklisted_emails(["bounced@example.com"]), {"bounced@example.com"})
+
+    def test_unblacklist(self):
+        call_command("blacklist", "--add", "foo@example.com", verbosity=0)
+        call_command("blacklist", "--delete", "FOO@example.com", verbosity=0)
+        self.assertFalse(models.BlacklistedEmail.objects.exists())
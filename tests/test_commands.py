@@ -1,11 +1,21 @@
 import datetime
+import json
+import os
+import tempfile
+import threading
 from io import StringIO
+from unittest import mock
 
 from django.core.management import call_command
-from django.test import TestCase
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
+from django_ses.blacklist import email_digest
 from django_ses.management.commands import get_ses_statistics as mod_get_ses_statistics
-from django_ses.models import BlacklistedEmail, SESStat
+from django_ses.models import BlacklistedEmail, SESStat, SuppressionListSync
+from django_ses.signals import delivery_received, send_received
+from tests.mocks import get_mock_delivery, get_mock_send
 
 data_points = [
     {
@@ -196,3 +206,319 @@ class BlacklistCommandRTest(TestCase):
         self.assertEqual(len(lines), 55)
         for i in range(55):
             self.assertIn(f"foo{i}@bar.com", lines)
+
+
+class BackfillBlacklistDigestsCommandTest(TestCase):
+    def test_backfill(self):
+        BlacklistedEmail.objects.bulk_create(
+            [BlacklistedEmail(email=f"foo{i}@bar.com") for i in range(5)]
+            + [BlacklistedEmail(email="Foo1@bar.com"), BlacklistedEmail(email="other@bar.com")]
+        )
+        # A row saved before addresses were normalized on save().
+        BlacklistedEmail.objects.bulk_create(
+            [
+                BlacklistedEmail(
+                    email="FOO2@bar.com", email_digest=email_digest("foo2@bar.com"), reversed_domain="com.bar."
+                )
+            ]
+        )
+
+        out = StringIO()
+        call_command("ses_backfill_blacklist_digests", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(
+            out.getvalue().strip(), "Stored 5 digests and 5 domains, removed 2 duplicates, cleared 0 emails"
+        )
+        self.assertFalse(BlacklistedEmail.objects.filter(email_digest__isnull=True).exists())
+        for email in ["foo0@bar.com", "foo1@bar.com", "foo2@bar.com", "other@bar.com"]:
+            self.assertTrue(BlacklistedEmail.objects.filter(email_digest=email_digest(email)).exists())
+
+    def test_clear_emails(self):
+        BlacklistedEmail.objects.create(email="foo@bar.com")
+
+        call_command("ses_backfill_blacklist_digests", "--clear-emails", stdout=StringIO())
+
+        blacklisted = BlacklistedEmail.objects.get()
+        self.assertIsNone(blacklisted.email)
+        self.assertEqual(blacklisted.email_digest, email_digest("foo@bar.com"))
+
+
+class BlacklistImportExportCommandTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_import_csv(self):
+        BlacklistedEmail.objects.create(email="existing@bar.com")
+        path = os.path.join(self.tmpdir.name, "emails.csv")
+        with open(path, "w") as f:
+            f.write("email,reason\n")
+            f.write("Foo <FOO@bar.com>,bounce\n")
+            for i in range(10):
+                f.write(f"foo{i}@bar.com,complaint\n")
+            f.write("existing@bar.com,bounce\nfoo@bar.com\n\n")
+
+        err = StringIO()
+        call_command("blacklist", "--import", path, "--batch-size", "4", stderr=err)
+
+        self.assertEqual(err.getvalue().strip(), "Imported 13 emails")
+        self.assertEqual(BlacklistedEmail.objects.count(), 12)
+        self.assertTrue(BlacklistedEmail.objects.filter(email="foo@bar.com").exists())
+
+    def test_import_in_transaction(self):
+        path = os.path.join(self.tmpdir.name, "emails.txt")
+        with open(path, "w") as f:
+            for i in range(5):
+                f.write(f"foo{i}@bar.com\n")
+
+        # On PostgreSQL every batch creates the same temporary table.
+        with transaction.atomic():
+            call_command("blacklist", "--import", path, "--batch-size", "2", stderr=StringIO())
+
+        self.assertEqual(BlacklistedEmail.objects.count(), 5)
+
+    def test_export(self):
+        for i in range(7):
+            BlacklistedEmail.objects.create(email=f"foo{i}@bar.com")
+        BlacklistedEmail.objects.create(email=None, email_digest=email_digest("hidden@bar.com"))
+        path = os.path.join(self.tmpdir.name, "emails.txt")
+
+        err = StringIO()
+        with self.assertNumQueries(4):
+            call_command("blacklist", "--export", path, "--batch-size", "3", stderr=err)
+
+        self.assertEqual(err.getvalue().strip(), "Exported 7 emails")
+        with open(path) as f:
+            self.assertEqual(f.read().splitlines(), [f"foo{i}@bar.com" for i in range(7)])
+
+    def test_export_to_stdout(self):
+        BlacklistedEmail.objects.create(email="foo@bar.com")
+
+        out = StringIO()
+        call_command("blacklist", "--export", "-", stdout=out, stderr=StringIO())
+        self.assertEqual(out.getvalue(), "foo@bar.com\n")
+
+
+class PurgeBlacklistCommandTest(TestCase):
+    def test_purge(self):
+        now = timezone.now()
+        for i in range(5):
+            BlacklistedEmail.objects.create(email=f"expired{i}@example.com", expires_at=now - datetime.timedelta(1))
+        BlacklistedEmail.objects.create(email="later@example.com", expires_at=now + datetime.timedelta(1))
+        BlacklistedEmail.objects.create(email="permanent@example.com")
+
+        out = StringIO()
+        call_command("ses_purge_blacklist", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "Purged 5 expired emails")
+        self.assertEqual(
+            set(BlacklistedEmail.objects.values_list("email", flat=True)),
+            {"later@example.com", "permanent@example.com"},
+        )
+
+
+class FakeSESv2Client:
+    pages = []
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def list_suppressed_destinations(self, **params):
+        self.calls.append(params)
+        index = int(params.get("NextToken", 0))
+        response = {
+            "SuppressedDestinationSummaries": [
+                {"EmailAddress": email, "Reason": "BOUNCE", "LastUpdateTime": params["EndDate"]}
+                for email in self.pages[index]
+            ]
+        }
+        if index + 1 < len(self.pages):
+            response["NextToken"] = str(index + 1)
+        return response
+
+
+class SyncSuppressionsCommandTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch("boto3.Session")
+        self.session = patcher.start()
+        self.session.return_value.client.side_effect = FakeSESv2Client
+        self.addCleanup(patcher.stop)
+        FakeSESv2Client.pages = [["One@example.com", "two@example.com"], ["three@example.com"]]
+        FakeSESv2Client.calls = []
+
+    def test_sync(self):
+        BlacklistedEmail.objects.create(email="two@example.com")
+
+        out = StringIO()
+        call_command("ses_sync_suppressions", "--page-size", "2", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "Synced 3 suppressed addresses")
+        self.assertEqual(
+            sorted(BlacklistedEmail.objects.values_list("email", flat=True)),
+            ["one@example.com", "three@example.com", "two@example.com"],
+        )
+        self.assertEqual(len(FakeSESv2Client.calls), 2)
+        self.assertNotIn("StartDate", FakeSESv2Client.calls[0])
+        self.assertEqual(FakeSESv2Client.calls[0]["PageSize"], 2)
+        self.assertEqual(FakeSESv2Client.calls[1]["NextToken"], "1")
+
+    def test_incremental_sync(self):
+        call_command("ses_sync_suppressions", stdout=StringIO())
+        synced_until = SuppressionListSync.objects.get().synced_until
+        self.assertEqual(synced_until, FakeSESv2Client.calls[0]["EndDate"])
+
+        FakeSESv2Client.pages = [["four@example.com"]]
+        FakeSESv2Client.calls = []
+        call_command("ses_sync_suppressions", "--reason", "BOUNCE", "--overlap", "60", stdout=StringIO())
+
+        params = FakeSESv2Client.calls[0]
+        self.assertNotIn("StartDate", params)
+        self.assertEqual(params["Reasons"], ["BOUNCE"])
+
+        FakeSESv2Client.calls = []
+        call_command("ses_sync_suppressions", "--overlap", "60", stdout=StringIO())
+        self.assertEqual(FakeSESv2Client.calls[0]["StartDate"], synced_until - datetime.timedelta(seconds=60))
+        self.assertTrue(BlacklistedEmail.objects.filter(email="four@example.com").exists())
+
+    @override_settings(AWS_SESSION_PROFILE="ses-profile", AWS_SES_REGION_NAME="eu-west-1")
+    def test_client_is_created_like_the_backend(self):
+        call_command("ses_sync_suppressions", stdout=StringIO())
+
+        self.session.assert_called_once_with(profile_name="ses-profile")
+        self.session.return_value.client.assert_called_once_with(
+            "sesv2", region_name="eu-west-1", endpoint_url="https://email.eu-west-1.amazonaws.com", config=None
+        )
+
+    def test_failed_sync_keeps_cursor(self):
+        FakeSESv2Client.pages = [["one@example.com"], None]
+        with self.assertRaises(TypeError):
+            call_command("ses_sync_suppressions", stdout=StringIO())
+        self.assertFalse(SuppressionListSync.objects.exists())
+
+
+class FakeSQSClient:
+    messages = []
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def receive_message(self, **params):
+        with self.lock:
+            self.calls.append(("receive_message", params))
+            batch = self.messages[: params["MaxNumberOfMessages"]]
+            del self.messages[: len(batch)]
+        return {"Messages": batch} if batch else {}
+
+    def delete_message_batch(self, **params):
+        with self.lock:
+            self.calls.append(("delete_message_batch", params))
+        return {"Successful": [{"Id": entry["Id"]} for entry in params["Entries"]], "Failed": []}
+
+
+@override_settings(AWS_SES_VERIFY_EVENT_SIGNATURES=True)
+class ConsumeSQSCommandTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch("boto3.Session")
+        self.session = patcher.start()
+        self.session.return_value.client.side_effect = FakeSQSClient
+        self.addCleanup(patcher.stop)
+        FakeSQSClient.messages = []
+        FakeSQSClient.calls = []
+
+        self.received = []
+        delivery_received.connect(self._receiver)
+        send_received.connect(self._receiver)
+        self.addCleanup(delivery_received.disconnect, self._receiver)
+        self.addCleanup(send_received.disconnect, self._receiver)
+
+    def _receiver(self, sender, mail_obj, raw_message, **kwargs):
+        self.received.append(raw_message)
+
+    def _sqs_message(self, i, body):
+        return {"MessageId": "sqs-%d" % i, "ReceiptHandle": "handle-%d" % i, "Body": body}
+
+    def _notifications(self, count):
+        notifications = []
+        for i in range(count):
+            notification = (get_mock_delivery() if i % 2 else get_mock_send())[2]
+            notification["MessageId"] = "sns-%d" % i
+            notifications.append(notification)
+        return notifications
+
+    def _deleted(self):
+        return sorted(
+            entry["ReceiptHandle"]
+            for name, params in FakeSQSClient.calls
+            if name == "delete_message_batch"
+            for entry in params["Entries"]
+        )
+
+    @mock.patch("django_ses.utils.verify_event_message", return_value=True)
+    def test_consume(self, verify):
+        notifications = self._notifications(12)
+        FakeSQSClient.messages = [self._sqs_message(i, json.dumps(n)) for i, n in enumerate(notifications)]
+
+        out = StringIO()
+        call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "Processed 12 messages")
+        self.assertEqual(len(self.received), 12)
+        self.assertEqual(verify.call_count, 12)
+        self.assertEqual(self._deleted(), sorted("handle-%d" % i for i in range(12)))
+        receives = [params for name, params in FakeSQSClient.calls if name == "receive_message"]
+        self.assertEqual(receives[0]["MaxNumberOfMessages"], 10)
+        self.assertEqual(receives[0]["QueueUrl"], "https://sqs.example.com/queue")
+        self.assertEqual(len(receives), 3)
+
+    @mock.patch("django_ses.utils.verify_event_message", return_value=True)
+    def test_consume_with_threads(self, verify):
+        FakeSQSClient.messages = [self._sqs_message(i, json.dumps(n)) for i, n in enumerate(self._notifications(25))]
+
+        out = StringIO()
+        call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", "--threads", "3", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "Processed 25 messages")
+        self.assertEqual(len(self._deleted()), 25)
+
+    @mock.patch("django_ses.utils.verify_event_message")
+    def test_raw_message_delivery(self, verify):
+        FakeSQSClient.messages = [self._sqs_message(i, n["Message"]) for i, n in enumerate(self._notifications(3))]
+
+        call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", "--raw", stdout=StringIO())
+
+        verify.assert_not_called()
+        self.assertEqual(len(self.received), 3)
+        self.assertEqual(json.loads(self.received[0])["eventType"], "Send")
+        self.assertEqual(len(self._deleted()), 3)
+
+    @mock.patch("django_ses.utils.verify_event_message", return_value=False)
+    def test_unverified_and_failed_messages(self, verify):
+        notifications = self._notifications(2)
+        FakeSQSClient.messages = [self._sqs_message(i, json.dumps(n)) for i, n in enumerate(notifications)]
+        FakeSQSClient.messages.append(self._sqs_message(2, "not json"))
+
+        out = StringIO()
+        call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", stdout=out)
+
+        # Messages that can never be processed are deleted all the same.
+        self.assertEqual(self.received, [])
+        self.assertEqual(self._deleted(), ["handle-0", "handle-1", "handle-2"])
+
+        FakeSQSClient.messages = [self._sqs_message(3, json.dumps(notifications[0]))]
+        FakeSQSClient.calls = []
+        with mock.patch.object(send_received, "send", side_effect=RuntimeError("receiver failed")):
+            call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", "--no-verify", stdout=out)
+
+        # A failed message is left for SQS to deliver again.
+        self.assertEqual(self._deleted(), [])
+        self.assertEqual(out.getvalue().strip().splitlines()[-1], "Processed 0 messages")
+
+    @override_settings(AWS_SESSION_PROFILE="ses-profile", AWS_SES_REGION_NAME="eu-west-1")
+    def test_client_is_created_from_the_backend_session(self):
+        call_command("ses_consume_sqs", "https://sqs.example.com/queue", "--once", stdout=StringIO())
+
+        self.session.assert_called_once_with(profile_name="ses-profile")
+        self.session.return_value.client.assert_called_once_with("sqs", region_name="eu-west-1", config=None)
@@ -0,0 +1,110 @@
+import json
+import unittest
+from unittest import mock
+
+import django
+from django.core.cache import caches
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from django_ses import utils as ses_utils
+from django_ses.dedup import MessageDeduplicator, clear_event_deduplicator, get_event_deduplicator
+from django_ses.signals import bounce_received
+from tests.mocks import get_mock_bounce
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MessageDeduplicatorTest(SimpleTestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_claim(self):
+        deduplicator = MessageDeduplicator(ttl=60)
+        self.assertFalse(deduplicator.is_duplicate("m1"))
+        self.assertTrue(deduplicator.claim("m1"))
+        self.assertFalse(deduplicator.claim("m1"))
+        self.assertTrue(deduplicator.is_duplicate("m1"))
+        self.assertEqual(deduplicator.stats, {"lru_hits": 0, "cache_hits": 2, "misses": 1})
+
+        deduplicator.release("m1")
+        self.assertFalse(deduplicator.is_duplicate("m1"))
+
+    def test_shared_through_the_cache(self):
+        MessageDeduplicator().claim("m1")
+        self.assertTrue(MessageDeduplicator().is_duplicate("m1"))
+
+    def test_lru(self):
+        deduplicator = MessageDeduplicator(lru_size=2)
+        for message_id in ["m1", "m2", "m3"]:
+            deduplicator.claim(message_id)
+
+        with mock.patch.object(MessageDeduplicator, "cache") as cache:
+            self.assertTrue(deduplicator.is_duplicate("m3"))
+            self.assertTrue(deduplicator.is_duplicate("m2"))
+            cache.get.assert_not_called()
+        # The oldest ID was evicted from memory but is still in the cache.
+        self.assertFalse(deduplicator.seen_locally("m1"))
+        self.assertTrue(deduplicator.is_duplicate("m1"))
+        self.assertEqual(deduplicator.stats, {"lru_hits": 2, "cache_hits": 1, "misses": 0})
+
+
+@override_settings(CACHES=LOCMEM_CACHES, AWS_SES_EVENT_DEDUP_CACHE="default", AWS_SES_EVENT_DEDUP_LRU_SIZE=100)
+class WebhookDeduplicationTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        clear_event_deduplicator(setting="AWS_SES_EVENT_DEDUP_CACHE")
+        self.received = []
+        bounce_received.connect(self._receiver)
+
+    def tearDown(self):
+        bounce_received.disconnect(self._receiver)
+
+    def _receiver(self, sender, **kwargs):
+        self.received.append(kwargs)
+
+    def test_redeliveries_are_not_verified_or_processed(self):
+        _, _, notification = get_mock_bounce("eventType")
+
+        with mock.patch.object(ses_utils, "verify_event_message", return_value=True) as verify:
+            for _ in range(3):
+                response = self.client.post(
+                    reverse("event_webhook"), json.dumps(notification), content_type="application/json"
+                )
+                self.assertEqual(response.status_code, 200)
+
+        verify.assert_called_once()
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(get_event_deduplicator().stats["lru_hits"], 2)
+
+    def test_unverified_notifications_are_not_remembered(self):
+        _, _, notification = get_mock_bounce("eventType")
+        with mock.patch.object(ses_utils, "verify_event_message", return_value=False):
+            self.client.post(reverse("event_webhook"), json.dumps(notification), content_type="application/json")
+        self.assertFalse(get_event_deduplicator().is_duplicate(notification["MessageId"]))
+
+    def test_failures_are_released(self):
+        _, _, notification = get_mock_bounce("eventType")
+        with mock.patch.object(ses_utils, "verify_event_message", return_value=True):
+            with mock.patch.object(bounce_received, "send", side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    self.client.post(
+                        reverse("event_webhook"), json.dumps(notification), content_type="application/json"
+                    )
+        self.assertFalse(get_event_deduplicator().is_duplicate(notification["MessageId"]))
+
+    @unittest.skipIf(django.VERSION < (4, 1), "Async class-based views require Django 4.1+")
+    async def test_async_view(self):
+        _, _, notification = get_mock_bounce("eventType")
+        client = AsyncClient()
+
+        with mock.patch.object(ses_utils, "averify_event_message", mock.AsyncMock(return_value=True)) as verify:
+            for _ in range(2):
+                response = await client.post(
+                    reverse("async_event_webhook"), json.dumps(notification), content_type="application/json"
+                )
+                self.assertEqual(response.status_code, 200)
+
+        verify.assert_called_once()
+        self.assertEqual(len(self.received), 1)
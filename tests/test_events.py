@@ -0,0 +1,85 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_ses import utils as ses_utils
+from django_ses.events import EventWorker
+from django_ses.models import QueuedEvent
+from django_ses.signals import bounce_received, complaint_received
+from tests.mocks import get_mock_bounce, get_mock_complaint
+
+
+@override_settings(AWS_SES_QUEUE_EVENTS=True)
+@mock.patch.object(ses_utils, "verify_event_message", return_value=True)
+class QueuedEventsTest(TestCase):
+    def setUp(self):
+        self.received = []
+        bounce_received.connect(self._receiver)
+        complaint_received.connect(self._receiver)
+
+    def tearDown(self):
+        bounce_received.disconnect(self._receiver)
+        complaint_received.disconnect(self._receiver)
+
+    def _receiver(self, sender, mail_obj, raw_message, **kwargs):
+        self.received.append((mail_obj, raw_message, kwargs))
+
+    def _post(self, notification):
+        return self.client.post(reverse("event_webhook"), json.dumps(notification), content_type="application/json")
+
+    def test_notifications_are_queued(self, verify):
+        _, _, notification = get_mock_bounce("eventType")
+
+        response = self._post(notification)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.received, [])
+        queued = QueuedEvent.objects.get()
+        self.assertEqual(queued.handler, "django_ses.views.SESEventWebhookView")
+        self.assertEqual(bytes(queued.raw_message), json.dumps(notification).encode())
+
+    def test_unverified_notifications_are_not_queued(self, verify):
+        verify.return_value = False
+        _, _, notification = get_mock_bounce("eventType")
+
+        self.assertEqual(self._post(notification).status_code, 400)
+        self.assertFalse(QueuedEvent.objects.exists())
+
+    def test_command_sends_signals(self, verify):
+        mail_obj, bounce_obj, bounce = get_mock_bounce("eventType")
+        _, complaint_obj, complaint = get_mock_complaint("eventType")
+        self._post(bounce)
+        self._post(complaint)
+
+        out = StringIO()
+        call_command("ses_process_events", "--once", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "Processed 2 queued events")
+        self.assertFalse(QueuedEvent.objects.exists())
+        self.assertEqual(len(self.received), 2)
+        self.assertEqual(self.received[0][0], mail_obj)
+        self.assertEqual(self.received[0][1], json.dumps(bounce).encode())
+        self.assertEqual(self.received[0][2]["bounce_obj"], bounce_obj)
+        self.assertEqual(self.received[1][2]["complaint_obj"], complaint_obj)
+
+    def test_failures_are_retried(self, verify):
+        self._post(get_mock_bounce("eventType")[2])
+        worker = EventWorker(max_attempts=2)
+
+        with mock.patch.object(bounce_received, "send", side_effect=RuntimeError("receiver failed")):
+            self.assertEqual(worker.process_batch(), 1)
+        queued = QueuedEvent.objects.get()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("receiver failed", queued.last_error)
+        self.assertGreater(queued.next_attempt_at, queued.created_at)
+
+        # Not retried before its backoff has passed.
+        self.assertEqual(worker.process_batch(), 0)
+        QueuedEvent.objects.update(next_attempt_at=None)
+        worker.process_batch()
+        self.assertFalse(QueuedEvent.objects.exists())
+        self.assertEqual(len(self.received), 1)
@@ -0,0 +1,171 @@
+import pickle
+from io import StringIO
+from unittest import mock
+
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from django_ses.models import BlacklistedEmail, QueuedEmail
+from django_ses.outbound import QueueWorker, deserialize_message
+from django_ses.utils import get_blacklisted_emails
+from tests.test_backend import FailingSESBackend, FakeSESConnection
+
+
+@override_settings(
+    EMAIL_BACKEND="django_ses.outbound.QueuedSESBackend",
+    AWS_SES_QUEUE_SEND_BACKEND="tests.test_backend.FailingSESBackend",
+    AWS_SES_AUTO_THROTTLE=None,
+    AWS_SES_CONFIGURATION_SET=None,
+)
+class QueuedSESBackendTest(TestCase):
+    def tearDown(self):
+        FakeSESConnection.outbox = []
+
+    def test_send_mail_is_queued(self):
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+
+        self.assertEqual(FakeSESConnection.outbox, [])
+        queued = QueuedEmail.objects.get()
+        self.assertIn(b"Subject: subject", queued.message_data)
+        self.assertEqual(
+            queued.envelope, {"from_email": "from@example.com", "to": ["to@example.com"], "cc": [], "bcc": []}
+        )
+        message = deserialize_message(queued)
+        self.assertEqual(message.subject, "subject")
+        self.assertEqual(message.to, ["to@example.com"])
+
+    @override_settings(AWS_SES_CONFIGURATION_SET="queued-set")
+    def test_worker_sends_stored_mime(self):
+        message = EmailMessage(
+            "Sübject", "bödy", "from@example.com", ["to@example.com"], bcc=["bcc@example.com"], headers={"X-Tag": "t"}
+        )
+        message.attach("data.bin", bytes(range(256)), "application/octet-stream")
+        get_connection().send_messages([message])
+        stored = bytes(QueuedEmail.objects.get().message_data)
+
+        QueueWorker().process_batch()
+
+        (sent,) = FakeSESConnection.outbox
+        self.assertEqual(sent["Source"], "from@example.com")
+        self.assertEqual(sent["Destinations"], ["to@example.com", "bcc@example.com"])
+        data = sent["RawMessage"]["Data"]
+        self.assertIn(b"X-SES-CONFIGURATION-SET: queued-set\r\n", data)
+        self.assertEqual(data.replace(b"X-SES-CONFIGURATION-SET: queued-set\r\n", b""), stored)
+
+    @override_settings(AWS_SES_USE_BLACKLIST=True)
+    def test_worker_sends_the_batch_at_once(self):
+        BlacklistedEmail.objects.create(email="blocked@example.com")
+        for recipient in ["to1@example.com", "blocked@example.com", "to2@example.com"]:
+            send_mail("subject", "body", "from@example.com", [recipient])
+
+        worker = QueueWorker()
+        with mock.patch.object(worker.backend, "send_messages", wraps=worker.backend.send_messages) as send_messages:
+            with mock.patch("django_ses.utils.get_blacklisted_emails", wraps=get_blacklisted_emails) as lookup:
+                self.assertEqual(worker.process_batch(), 3)
+
+        send_messages.assert_called_once()
+        lookup.assert_called_once()
+        self.assertEqual(QueuedEmail.objects.count(), 0)
+        self.assertEqual(
+            [kwargs["Destinations"] for kwargs in FakeSESConnection.outbox], [["to1@example.com"], ["to2@example.com"]]
+        )
+
+    def test_pickles_are_not_loaded(self):
+        QueuedEmail.objects.create(message_data=pickle.dumps(EmailMessage("subject", "body", "from@example.com")))
+
+        with mock.patch("pickle.loads") as loads:
+            QueueWorker().process_batch()
+
+        loads.assert_not_called()
+        self.assertEqual(QueuedEmail.objects.get().attempts, 1)
+
+    def test_send_messages_bulk_inserts(self):
+        messages = [EmailMessage("subject", "body", "from@example.com", [f"to{i}@example.com"]) for i in range(10)]
+        with self.assertNumQueries(1):
+            num_queued = get_connection().send_messages(messages)
+
+        self.assertEqual(num_queued, 10)
+        self.assertEqual(QueuedEmail.objects.count(), 10)
+
+    def test_worker_sends_and_deletes(self):
+        for i in range(5):
+            send_mail("subject", "body", "from@example.com", [f"to{i}@example.com"])
+
+        worker = QueueWorker(batch_size=2)
+        self.assertEqual(worker.process_batch(), 2)
+        self.assertEqual(QueuedEmail.objects.count(), 3)
+        self.assertEqual(worker.process_batch(), 2)
+        self.assertEqual(worker.process_batch(), 1)
+        self.assertEqual(worker.process_batch(), 0)
+
+        self.assertEqual(
+            [kwargs["Destinations"] for kwargs in FakeSESConnection.outbox],
+            [
+                ["to0@example.com"],
+                ["to1@example.com"],
+                ["to2@example.com"],
+                ["to3@example.com"],
+                ["to4@example.com"],
+            ],
+        )
+
+    def test_worker_records_failures(self):
+        send_mail("subject", "body", "from@example.com", ["fail@example.com"])
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+
+        worker = QueueWorker(backend=FailingSESBackend(), max_attempts=2)
+        self.assertEqual(worker.process_batch(), 2)
+        failed = QueuedEmail.objects.get()
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("rejected", failed.last_error)
+        self.assertIsNone(failed.claimed_by)
+        self.assertIsNotNone(failed.next_attempt_at)
+
+        # Not retried before its backoff has passed, so --once terminates.
+        self.assertEqual(worker.process_batch(), 0)
+        QueuedEmail.objects.update(next_attempt_at=None)
+        self.assertEqual(worker.process_batch(), 1)
+        QueuedEmail.objects.update(next_attempt_at=None)
+        # Exhausted messages stay in the queue but are no longer picked up.
+        self.assertEqual(worker.process_batch(), 0)
+        self.assertEqual(QueuedEmail.objects.get().attempts, 2)
+
+    def test_worker_skips_rows_claimed_by_another_worker(self):
+        send_mail("subject", "body", "from@example.com", ["to@example.com"])
+        QueuedEmail.objects.update(claimed_by="other-worker", claimed_at=QueuedEmail.objects.get().created_at)
+
+        worker = QueueWorker()
+        self.assertEqual(worker.process_batch(), 0)
+
+        # Once the claim has expired the message is picked up again.
+        worker.claim_timeout = -worker.claim_timeout
+        self.assertEqual(worker.process_batch(), 1)
+
+    def test_worker_claims_rows_before_processing_them(self):
+        for i in range(3):
+            send_mail("subject", "body", "from@example.com", [f"to{i}@example.com"])
+        worker = QueueWorker()
+        claims = []
+
+        def process_rows(rows):
+            claims.extend(QueuedEmail.objects.values_list("claimed_by", flat=True))
+            return [rows[0].pk]
+
+        with mock.patch.object(worker, "process_rows", side_effect=process_rows):
+            self.assertEqual(worker.process_batch(), 3)
+
+        self.assertEqual(claims, [worker.worker_id] * 3)
+        # Rows that were not processed are released by the second transaction.
+        self.assertEqual(list(QueuedEmail.objects.values_list("claimed_by", flat=True)), [None, None])
+
+    def test_send_worker_command(self):
+        for i in range(3):
+            send_mail("subject", "body", "from@example.com", [f"to{i}@example.com"])
+
+        out = StringIO()
+        call_command("ses_send_worker", "--once", stdout=out)
+
+        self.assertEqual(QueuedEmail.objects.count(), 0)
+        self.assertEqual(len(FakeSESConnection.outbox), 3)
+        self.assertIn("Processed 3 queued emails", out.getvalue())
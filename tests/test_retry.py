@@ -0,0 +1,130 @@
+from unittest import mock
+
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_ses.retry import RetryBudget, RetryPolicy, is_retryable
+from tests.test_backend import FakeSESBackend, FakeSESConnection
+
+
+def client_error(code, message="", status=400):
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, "ResponseMetadata": {"HTTPStatusCode": status, "RequestId": "r"}},
+        "SendRawEmail",
+    )
+
+
+class RetryPolicyTest(SimpleTestCase):
+    def test_is_retryable(self):
+        self.assertTrue(is_retryable(client_error("Throttling", "Maximum sending rate exceeded.")))
+        self.assertTrue(is_retryable(client_error("ServiceUnavailable", status=503)))
+        self.assertTrue(is_retryable(client_error("SomethingNew", status=502)))
+        self.assertTrue(is_retryable(EndpointConnectionError(endpoint_url="https://email.example.com")))
+        self.assertTrue(is_retryable(ReadTimeoutError(endpoint_url="https://email.example.com")))
+        self.assertFalse(is_retryable(client_error("Throttling", "Daily message quota exceeded.")))
+        self.assertFalse(is_retryable(client_error("MessageRejected", "Email address is not verified.")))
+        self.assertFalse(is_retryable(ValueError()))
+
+    def test_backoff_is_capped_with_full_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, random=lambda: 1.0)
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+        policy = RetryPolicy(base_delay=1, max_delay=5, random=lambda: 0.5)
+        self.assertEqual(policy.backoff(3), 2)
+
+    def test_get_delay(self):
+        policy = RetryPolicy(max_retries=2, base_delay=1, random=lambda: 1.0)
+        budget = RetryBudget(10)
+        throttled = client_error("Throttling")
+        self.assertEqual(policy.get_delay(throttled, 1, budget), 1)
+        self.assertEqual(policy.get_delay(throttled, 2, budget), 2)
+        self.assertIsNone(policy.get_delay(throttled, 3, budget))
+        self.assertIsNone(policy.get_delay(client_error("MessageRejected"), 1, budget))
+        self.assertEqual(budget.remaining, 8)
+
+    def test_budget(self):
+        policy = RetryPolicy(max_retries=3, budget_ratio=0.1)
+        self.assertEqual(policy.budget(1).remaining, 3)
+        self.assertEqual(policy.budget(1000).remaining, 100)
+
+        budget = RetryBudget(1)
+        self.assertTrue(budget.consume())
+        self.assertFalse(budget.consume())
+
+
+class FlakySESConnection(FakeSESConnection):
+    """Fails every send with the errors queued in ``errors`` before accepting it."""
+
+    errors = {}
+
+    def send_raw_email(self, **kwargs):
+        pending = self.errors.get(kwargs["Destinations"][0])
+        if pending:
+            raise pending.pop(0)
+        return super().send_raw_email(**kwargs)
+
+
+class FlakySESBackend(FakeSESBackend):
+    def create_session(self):
+        return FlakySESConnection
+
+
+@override_settings(AWS_SES_AUTO_THROTTLE=None, AWS_SES_CLIENT_POOL=False, AWS_SES_SEND_CONCURRENCY=None)
+@mock.patch("django_ses.sleep")
+class RetrySendTest(TestCase):
+    def tearDown(self):
+        FakeSESConnection.outbox = []
+        FlakySESConnection.errors = {}
+
+    def _messages(self, recipients):
+        return [EmailMessage("subject", "body", "from@example.com", [recipient]) for recipient in recipients]
+
+    def test_transient_errors_are_retried(self, sleep):
+        FlakySESConnection.errors = {
+            "to1@example.com": [client_error("Throttling"), client_error("ServiceUnavailable", status=503)],
+        }
+        backend = FlakySESBackend()
+        messages = self._messages(["to1@example.com", "to2@example.com"])
+
+        self.assertEqual(backend.send_messages(messages), 2)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual([outcome.attempts for outcome in backend.outcomes], [3, 1])
+        self.assertTrue(all(outcome.sent for outcome in backend.outcomes))
+        self.assertEqual(messages[0].extra_headers["status"], 200)
+
+    def test_permanent_error_does_not_stop_the_batch(self, sleep):
+        rejected = client_error("MessageRejected", "Email address is not verified.")
+        FlakySESConnection.errors = {"to1@example.com": [rejected]}
+        backend = FlakySESBackend()
+        messages = self._messages(["to1@example.com", "to2@example.com", "to3@example.com"])
+
+        with self.assertRaises(ClientError):
+            backend.send_messages(messages)
+        sleep.assert_not_called()
+        self.assertEqual(len(FakeSESConnection.outbox), 2)
+        self.assertEqual([outcome.sent for outcome in backend.outcomes], [False, True, True])
+        self.assertIs(backend.outcomes[0].error, rejected)
+        self.assertEqual(messages[0].extra_headers["status"], 400)
+        self.assertEqual(messages[0].extra_headers["error_code"], "MessageRejected")
+
+    @override_settings(AWS_SES_MAX_RETRIES=5, AWS_SES_RETRY_BUDGET=0)
+    def test_retry_budget_is_shared_by_the_batch(self, sleep):
+        FlakySESConnection.errors = {
+            "to1@example.com": [client_error("Throttling") for _ in range(4)],
+            "to2@example.com": [client_error("Throttling") for _ in range(4)],
+        }
+        backend = FlakySESBackend(fail_silently=True)
+
+        self.assertEqual(backend.send_messages(self._messages(["to1@example.com", "to2@example.com"])), 1)
+        self.assertEqual([outcome.attempts for outcome in backend.outcomes], [5, 2])
+        self.assertEqual(sleep.call_count, 5)
+
+    @override_settings(AWS_SES_SEND_CONCURRENCY=4)
+    def test_concurrent_outcomes_keep_message_order(self, sleep):
+        FlakySESConnection.errors = {"to3@example.com": [client_error("Throttling")]}
+        backend = FlakySESBackend()
+        messages = self._messages([f"to{i}@example.com" for i in range(8)])
+
+        self.assertEqual(backend.send_messages(messages), 8)
+        self.assertEqual([outcome.message for outcome in backend.outcomes], messages)
+        self.assertEqual(backend.outcomes[3].attempts, 2)
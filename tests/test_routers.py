@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from django_ses import models
+from django_ses.routers import SESRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(AWS_SES_READ_DB="replica", AWS_SES_WRITE_DB="primary", AWS_SES_READ_AFTER_WRITE_DELAY=5)
+class SESRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.router = SESRouter(clock=self.clock)
+
+    def test_reads_go_to_the_replica(self):
+        self.assertEqual(self.router.db_for_read(models.BlacklistedEmail), "replica")
+        self.assertEqual(self.router.db_for_read(models.SESStat), "replica")
+        self.assertEqual(self.router.db_for_write(models.BlacklistedEmail), "primary")
+
+    def test_reads_follow_local_writes(self):
+        self.router.db_for_write(models.BlacklistedEmail)
+        self.clock.now = 4.9
+        self.assertEqual(self.router.db_for_read(models.BlacklistedEmail), "primary")
+        self.assertEqual(self.router.db_for_read(models.BlacklistedDomain), "replica")
+        self.clock.now = 5
+        self.assertEqual(self.router.db_for_read(models.BlacklistedEmail), "replica")
+
+    def test_queue_writes_do_not_move_reads(self):
+        self.router.db_for_write(models.QueuedEmail)
+        self.router.db_for_write(models.QueuedEvent)
+        self.assertEqual(self.router.db_for_read(models.BlacklistedEmail), "replica")
+        self.assertEqual(self.router.last_writes, {})
+
+    def test_consistent_read(self):
+        self.assertEqual(self.router.db_for_write(models.BlacklistedEmail, consistent_read=True), "primary")
+        self.assertEqual(self.router.db_for_read(models.BlacklistedEmail), "replica")
+
+    def test_queue_is_never_read_from_the_replica(self):
+        self.assertEqual(self.router.db_for_read(models.QueuedEmail), "primary")
+
+    def test_other_apps_are_not_routed(self):
+        class OtherModel:
+            _meta = SimpleNamespace(app_label="other", model_name="othermodel")
+
+        self.assertIsNone(self.router.db_for_read(OtherModel))
+        self.assertIsNone(self.router.db_for_write(OtherModel))
+        self.assertEqual(self.router.last_writes, {})
+
+    def test_allow_migrate(self):
+        self.assertFalse(self.router.allow_migrate("replica", "django_ses"))
+        self.assertIsNone(self.router.allow_migrate("primary", "django_ses"))
+        self.assertIsNone(self.router.allow_migrate("replica", "auth"))
+
+    @override_settings(AWS_SES_READ_DB=None, AWS_SES_WRITE_DB=None)
+    def test_disabled(self):
+        self.assertIsNone(self.router.db_for_read(models.BlacklistedEmail))
+        self.assertIsNone(self.router.db_for_write(models.BlacklistedEmail))
@@ -1,6 +1,10 @@
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase, override_settings
 
 from django_ses import settings
+from django_ses.conf import SesSettings
 
 
 class SettingsImportTest(TestCase):
@@ -43,3 +47,33 @@ class SettingsImportTest(TestCase):
     def test_ses_region_to_endpoint_set_given(self):
         self.assertEqual(settings.AWS_SES_REGION_NAME, "eu-west-1")
         self.assertEqual(settings.AWS_SES_REGION_ENDPOINT, "email.eu-west-1.amazonaws.com")
+
+    def test_settings_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            settings.AWS_SES_REGION_NAME = "eu-west-1"
+        with self.assertRaises(AttributeError):
+            settings.NOT_A_SETTING
+
+    def test_snapshot_is_cached(self):
+        settings.reload()
+        with mock.patch.object(SesSettings, "AWS_SES_USE_BLACKLIST", new_callable=mock.PropertyMock) as use_blacklist:
+            use_blacklist.return_value = True
+            for _ in range(3):
+                self.assertIs(settings.AWS_SES_USE_BLACKLIST, True)
+        use_blacklist.assert_called_once_with()
+
+        settings.reload()
+        self.assertIs(settings.AWS_SES_USE_BLACKLIST, False)
+
+    def test_snapshot_follows_setting_changes(self):
+        self.assertIsNone(settings.AWS_SES_CONFIGURATION_SET)
+        with override_settings(AWS_SES_CONFIGURATION_SET="<<config_set>>"):
+            self.assertEqual(settings.AWS_SES_CONFIGURATION_SET, "<<config_set>>")
+        self.assertIsNone(settings.AWS_SES_CONFIGURATION_SET)
+
+    def test_store_email_requires_digest(self):
+        with override_settings(AWS_SES_BLACKLIST_STORE_EMAIL=False):
+            with self.assertRaises(ImproperlyConfigured):
+                settings.AWS_SES_REGION_NAME
+        with override_settings(AWS_SES_BLACKLIST_STORE_EMAIL=False, AWS_SES_BLACKLIST_DIGEST=True):
+            self.assertIs(settings.AWS_SES_BLACKLIST_STORE_EMAIL, False)
@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from django.core.mail import send_mail
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from django_ses import models, signals
 from tests.mocks import (
@@ -77,6 +80,21 @@ class SignalsTestCase(TestCase):
         count = models.BlacklistedEmail.objects.all().count()
         self.assertEqual(count, 0)
 
+    @override_settings(AWS_SES_ADD_BOUNCE_TO_BLACKLIST=True, AWS_SES_TRANSIENT_BOUNCE_BLACKLIST_TTL=3600)
+    def test_bounce_handler_transient_ttl(self):
+        mail_obj, bounce_obj, notification = get_mock_bounce("eventType")
+        signals.bounce_handler(None, mail_obj, bounce_obj, notification)
+
+        permanent, transient = models.BlacklistedEmail.objects.order_by("pk")
+        self.assertIsNone(permanent.expires_at)
+        self.assertIsNotNone(transient.expires_at)
+        self.assertGreater(transient.expires_at, timezone.now() + timedelta(seconds=3500))
+
+        # A later permanent bounce makes the entry permanent.
+        signals._blacklist_recipients([transient.email])
+        transient.refresh_from_db()
+        self.assertIsNone(transient.expires_at)
+
     def test_complaint_handler(self):
         count = models.BlacklistedEmail.objects.all().count()
         self.assertEqual(count, 0)
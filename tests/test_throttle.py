@@ -0,0 +1,316 @@
+import threading
+from unittest import mock
+
+from botocore.exceptions import ClientError
+from django.core.cache import caches
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, override_settings
+
+import django_ses
+from django_ses.throttle import (
+    AIMDController,
+    CacheRateLimiter,
+    TokenBucket,
+    clear_rate_limiters,
+    get_rate_limiter,
+    is_throttling_error,
+)
+from tests.test_backend import FakeSESBackend, FakeSESConnection
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=5, clock=self.clock)
+
+    def test_burst_up_to_capacity(self):
+        for _ in range(5):
+            self.assertEqual(self.bucket.reserve(), 0)
+        self.assertEqual(self.bucket.level, 0)
+        self.assertEqual(self.bucket.waits, 0)
+
+    def test_waits_are_queued(self):
+        for _ in range(5):
+            self.bucket.reserve()
+
+        self.assertAlmostEqual(self.bucket.reserve(), 0.2)
+        self.assertAlmostEqual(self.bucket.reserve(), 0.4)
+        self.assertAlmostEqual(self.bucket.level, -2)
+        self.assertEqual(self.bucket.waits, 2)
+        self.assertAlmostEqual(self.bucket.total_wait, 0.6)
+
+    def test_refill(self):
+        for _ in range(5):
+            self.bucket.reserve()
+        self.clock.now += 0.4
+        self.assertAlmostEqual(self.bucket.level, 2)
+
+        # The bucket never holds more than its capacity.
+        self.clock.now += 60
+        self.assertEqual(self.bucket.level, 5)
+
+    def test_clock_going_backwards(self):
+        self.bucket.reserve()
+        self.clock.now -= 10
+        self.assertEqual(self.bucket.level, 4)
+
+    def test_reserve_many(self):
+        self.assertAlmostEqual(self.bucket.reserve(15), 2.0)
+
+    def test_set_rate(self):
+        self.bucket.set_rate(2)
+        self.assertEqual(self.bucket.capacity, 2)
+        self.assertEqual(self.bucket.level, 2)
+
+    def test_acquire_sleeps(self):
+        slept = []
+        for _ in range(5):
+            self.bucket.acquire(sleep=slept.append)
+        self.assertEqual(slept, [])
+        self.assertAlmostEqual(self.bucket.acquire(sleep=slept.append), 0.2)
+        self.assertEqual(len(slept), 1)
+
+    def test_thread_safety(self):
+        bucket = TokenBucket(rate=1000, capacity=1000, clock=self.clock)
+
+        def take():
+            for _ in range(100):
+                bucket.reserve()
+
+        threads = [threading.Thread(target=take) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(bucket.level, 0)
+
+
+class BackendRateLimiterTest(SimpleTestCase):
+    def setUp(self):
+        clear_rate_limiters()
+        django_ses.cached_rate_limits.clear()
+
+    def tearDown(self):
+        clear_rate_limiters()
+        django_ses.cached_rate_limits.clear()
+
+    @override_settings(AWS_SES_AUTO_THROTTLE=0.5)
+    def test_limiter_uses_throttle_factor(self):
+        backend = FakeSESBackend()
+        self.assertIsNone(backend.rate_limiter)
+
+        backend._get_throttle_delay(backend.get_rate_limit())
+        django_ses.cached_rate_limits[backend._access_key_id] = 10
+        limiter = backend.rate_limiter
+        self.assertEqual(limiter.rate, 5)
+        self.assertAlmostEqual(limiter.level, 4, places=2)
+
+    @override_settings(AWS_SES_AUTO_THROTTLE=None)
+    def test_no_limiter_without_throttle(self):
+        self.assertIsNone(FakeSESBackend().rate_limiter)
+
+    def test_limiters_are_shared(self):
+        self.assertIs(get_rate_limiter("key", 5), get_rate_limiter("key", 5))
+        self.assertEqual(get_rate_limiter("key", 7).rate, 7)
+
+
+def client_error(code, message=""):
+    return ClientError({"Error": {"Code": code, "Message": message}}, "SendRawEmail")
+
+
+class AIMDControllerTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = AIMDController(0.5, clock=self.clock)
+
+    def test_multiplicative_decrease(self):
+        self.controller.on_throttled()
+        self.assertEqual(self.controller.factor, 0.25)
+        for _ in range(10):
+            self.controller.on_throttled()
+        self.assertEqual(self.controller.factor, 0.05)
+        self.assertEqual(self.controller.throttled, 11)
+
+    def test_additive_increase(self):
+        for _ in range(50):
+            self.clock.now += 0.1
+            self.controller.on_success()
+        self.assertAlmostEqual(self.controller.factor, 0.6)
+        for _ in range(100):
+            self.clock.now += 0.5
+            self.controller.on_success()
+        self.assertEqual(self.controller.factor, 1.0)
+
+    def test_idle_time_does_not_count(self):
+        self.clock.now += 3600
+        self.controller.on_success()
+        self.assertAlmostEqual(self.controller.factor, 0.52)
+
+    def test_increase_restarts_after_throttling(self):
+        self.clock.now += 0.5
+        self.controller.on_throttled()
+        self.controller.on_success()
+        self.assertEqual(self.controller.factor, 0.25)
+
+    def test_is_throttling_error(self):
+        self.assertTrue(is_throttling_error(client_error("Throttling", "Maximum sending rate exceeded.")))
+        self.assertTrue(is_throttling_error(client_error("MaxSendRateExceeded")))
+        self.assertTrue(is_throttling_error(client_error("TooManyRequestsException")))
+        self.assertFalse(is_throttling_error(client_error("Throttling", "Daily message quota exceeded.")))
+        self.assertFalse(is_throttling_error(client_error("MessageRejected")))
+
+
+class ThrottledSESConnection(FakeSESConnection):
+    def send_raw_email(self, **kwargs):
+        raise client_error("Throttling", "Maximum sending rate exceeded.")
+
+
+class ThrottledSESBackend(FakeSESBackend):
+    def create_session(self):
+        return ThrottledSESConnection
+
+
+@override_settings(AWS_SES_AUTO_THROTTLE=0.5, AWS_SES_ADAPTIVE_THROTTLE=True, AWS_SES_CLIENT_POOL=False)
+class AdaptiveThrottleTest(SimpleTestCase):
+    def setUp(self):
+        clear_rate_limiters()
+
+    def tearDown(self):
+        clear_rate_limiters()
+        FakeSESConnection.outbox = []
+
+    @override_settings(AWS_SES_MAX_RETRIES=0)
+    def test_throttling_error_halves_rate(self):
+        backend = ThrottledSESBackend()
+        message = EmailMessage("subject", "body", "from@example.com", ["to@example.com"])
+        with self.assertRaises(ClientError):
+            backend.send_messages([message])
+        self.assertEqual(backend.rate_controller.factor, 0.25)
+        self.assertEqual(backend._get_throttle_factor(), 0.25)
+
+    def test_success_feeds_controller(self):
+        backend = FakeSESBackend()
+        with mock.patch.object(AIMDController, "on_success") as on_success:
+            backend.send_messages([EmailMessage("subject", "body", "from@example.com", ["to@example.com"])])
+        on_success.assert_called_once_with()
+
+    @override_settings(AWS_SES_ADAPTIVE_THROTTLE=False)
+    def test_disabled(self):
+        self.assertIsNone(FakeSESBackend().rate_controller)
+
+
+class RateLimitTTLTest(SimpleTestCase):
+    def setUp(self):
+        django_ses.cached_rate_limits.clear()
+        django_ses.rate_limits_fetched_at.clear()
+
+    tearDown = setUp
+
+    def _backend(self):
+        backend = django_ses.SESBackend()
+        backend.connection = mock.Mock()
+        backend.connection.get_send_quota.return_value = {"MaxSendRate": 14.0}
+        backend.connection.get_account.return_value = {"SendQuota": {"MaxSendRate": 14.0}}
+        return backend
+
+    @override_settings(AWS_SES_RATE_LIMIT_TTL=60)
+    def test_quota_is_refreshed(self):
+        backend = self._backend()
+        with mock.patch("django_ses.monotonic", return_value=1000):
+            self.assertEqual(backend.get_rate_limit(), 14)
+        with mock.patch("django_ses.monotonic", return_value=1030):
+            backend.get_rate_limit()
+        self.assertEqual(self._calls(backend), 1)
+        with mock.patch("django_ses.monotonic", return_value=1061):
+            backend.get_rate_limit()
+        self.assertEqual(self._calls(backend), 2)
+
+    @override_settings(AWS_SES_RATE_LIMIT_TTL=None)
+    def test_quota_cached_forever(self):
+        backend = self._backend()
+        with mock.patch("django_ses.monotonic", return_value=1000):
+            backend.get_rate_limit()
+        with mock.patch("django_ses.monotonic", return_value=10**9):
+            backend.get_rate_limit()
+        self.assertEqual(self._calls(backend), 1)
+
+    def _calls(self, backend):
+        return backend.connection.get_send_quota.call_count + backend.connection.get_account.call_count
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CacheRateLimiterTest(SimpleTestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.clock = FakeClock()
+
+    def test_limit_is_shared_between_limiters(self):
+        # Two limiters with the same key act like two processes sharing a quota.
+        first = CacheRateLimiter("account:region", rate=2, clock=self.clock)
+        second = CacheRateLimiter("account:region", rate=2, clock=self.clock)
+
+        self.assertEqual(first.reserve(), 0)
+        self.assertEqual(second.reserve(), 0)
+        self.assertEqual(first.level, 0)
+        self.assertEqual(first.reserve(), 0.5)
+        self.assertEqual(second.reserve(), 1.0)
+        self.assertEqual(first.reserve(), 1.5)
+        self.assertEqual(first.level, -3)
+        self.assertEqual(first.waits, 2)
+        self.assertEqual(first.total_wait, 2.0)
+
+    def test_keys_are_isolated(self):
+        first = CacheRateLimiter("account:eu-west-1", rate=1, clock=self.clock)
+        second = CacheRateLimiter("account:us-east-1", rate=1, clock=self.clock)
+
+        self.assertEqual(first.reserve(), 0)
+        self.assertEqual(second.reserve(), 0)
+
+    def test_reserve_many(self):
+        limiter = CacheRateLimiter("key", rate=5, clock=self.clock)
+        self.assertAlmostEqual(limiter.reserve(12), 1.4)
+        self.assertAlmostEqual(limiter.reserve(), 1.6)
+        self.assertAlmostEqual(limiter.reserve(3), 2.2)
+
+    def test_slow_rate(self):
+        limiter = CacheRateLimiter("key", rate=0.5, clock=self.clock)
+        self.assertEqual(limiter.capacity, 1)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 2.0)
+
+    def test_capacity_refills(self):
+        limiter = CacheRateLimiter("key", rate=1, clock=self.clock)
+        limiter.reserve()
+        self.clock.now += 1
+        self.assertEqual(limiter.reserve(), 0)
+
+    def test_idle_time_does_not_accumulate(self):
+        limiter = CacheRateLimiter("key", rate=2, clock=self.clock)
+        limiter.reserve(2)
+        self.clock.now += 3600
+        self.assertEqual(limiter.level, 2)
+
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0.5)
+
+    def test_long_queue(self):
+        limiter = CacheRateLimiter("key", rate=1, clock=self.clock)
+        limiter.reserve(5000)
+        self.assertAlmostEqual(limiter.reserve(), 5000.0)
+
+    @override_settings(AWS_SES_RATE_LIMITER="cache")
+    def test_get_rate_limiter_setting(self):
+        self.assertIsInstance(get_rate_limiter("key", 5), CacheRateLimiter)
+
+        with override_settings(AWS_SES_RATE_LIMITER="local"):
+            self.assertIsInstance(get_rate_limiter("key", 5), TokenBucket)
@@ -1,9 +1,22 @@
+import django
+from django.contrib import admin
 from django.urls import path
 
-from django_ses.views import DashboardView, SESEventWebhookView, handle_bounce
+from django_ses.views import (
+    AsyncSESEventWebhookView,
+    DashboardView,
+    SESEventWebhookView,
+    SESFirehoseEventView,
+    handle_bounce,
+)
 
 urlpatterns = [
+    path("admin/", admin.site.urls),
     path("dashboard/", DashboardView.as_view(), name="django_ses_stats"),
     path("bounce/", handle_bounce, name="django_ses_bounce"),
     path("event-webhook/", SESEventWebhookView.as_view(), name="event_webhook"),
+    path("firehose/", SESFirehoseEventView.as_view(), name="firehose_events"),
 ]
+
+if django.VERSION >= (4, 1):
+    urlpatterns.append(path("async-event-webhook/", AsyncSESEventWebhookView.as_view(), name="async_event_webhook"))
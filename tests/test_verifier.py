@@ -13,9 +13,13 @@ try:
 except ImportError:
     x509 = None
 
+import threading
+import time
 from unittest import TestCase, skipIf
 
-from django_ses.utils import BounceMessageVerifier, clear_cert_cache
+from asgiref.sync import async_to_sync
+
+from django_ses.utils import BounceMessageVerifier, EventMessageVerifier, clear_cert_cache
 
 
 class BounceMessageVerifierTest(TestCase):
@@ -181,6 +185,43 @@ class BounceMessageVerifierTest(TestCase):
             verifier.certificate
             request_get.assert_called_once()
 
+    @skipIf(requests is None, "requests is not installed")
+    @skipIf(x509 is None, "cryptography is not installed")
+    def test_async_verification(self):
+        """Is the certificate downloaded outside of the event loop?"""
+        verifier = EventMessageVerifier(self.valid_msg)
+        threads = []
+
+        def get(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return mock.Mock(status_code=200, content=self.VALID_CERT)
+
+        with mock.patch.object(requests, "get", get):
+            self.assertTrue(async_to_sync(verifier.ais_verified)())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    @skipIf(requests is None, "requests is not installed")
+    @skipIf(x509 is None, "cryptography is not installed")
+    def test_concurrent_downloads_are_shared(self):
+        """Do concurrent requests wait for the first download of a certificate?"""
+
+        def get(*args, **kwargs):
+            get.calls += 1
+            time.sleep(0.05)
+            return mock.Mock(status_code=200, content=b"Spam")
+
+        get.calls = 0
+        with mock.patch.object(requests, "get", get), mock.patch.object(x509, "load_pem_x509_certificate"):
+            threads = [
+                threading.Thread(target=lambda: EventMessageVerifier(self.valid_msg).certificate) for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(get.calls, 1)
+
     def test_get_cert_url(self):
         """
         Test url trust verification
@@ -1,4 +1,7 @@
+import base64
+import gzip
 import json
+import unittest
 import weakref
 
 try:
@@ -7,10 +10,19 @@ except ImportError:
     import mock
 
 import django
-from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import (
+    AsyncClient,
+    AsyncRequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
 from django.urls import reverse
 
 from django_ses import utils as ses_utils
+from django_ses.events import EventWorker
 from django_ses.inbound import BaseHandler
 from django_ses.signals import (
     bounce_received,
@@ -20,6 +32,7 @@ from django_ses.signals import (
     open_received,
     send_received,
 )
+from django_ses.views import AsyncSESEventWebhookView
 from tests.mocks import (
     get_mock_bounce,
     get_mock_click,
@@ -384,3 +397,216 @@ class HandleEventTestCase(TestCase):
             )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.content, "Signature verification failed.".encode())
+
+
+@unittest.skipIf(django.VERSION < (4, 1), "Async class-based views require Django 4.1+")
+@override_settings(AWS_SES_QUEUE_EVENTS=False)
+class AsyncHandleEventTestCase(TestCase):
+    """
+    Test the async event web hook handler.
+    """
+
+    def setUp(self):
+        self._old_bounce_receivers = bounce_received.receivers
+        bounce_received.receivers = []
+        self.client = AsyncClient()
+
+    def tearDown(self):
+        bounce_received.receivers = self._old_bounce_receivers
+
+    async def _post(self, notification):
+        with mock.patch.object(ses_utils, "averify_event_message", mock.AsyncMock(return_value=True)):
+            return await self.client.post(
+                reverse("async_event_webhook"), json.dumps(notification), content_type="application/json"
+            )
+
+    async def test_handle_bounce_event(self):
+        req_mail_obj, req_bounce_obj, notification = get_mock_bounce("eventType")
+        received = []
+
+        def sync_handler(sender, mail_obj, bounce_obj, raw_message, **kwargs):
+            received.append(("sync", mail_obj, bounce_obj, raw_message))
+
+        bounce_received.connect(sync_handler)
+
+        response = await self._post(notification)
+
+        self.assertEqual(response.status_code, 200)
+        raw_message = json.dumps(notification).encode()
+        self.assertEqual(received, [("sync", req_mail_obj, req_bounce_obj, raw_message)])
+
+    @unittest.skipIf(django.VERSION < (5, 0), "Async receivers require Signal.asend(), Django 5.0+")
+    async def test_handle_bounce_event_async_receiver(self):
+        req_mail_obj, req_bounce_obj, notification = get_mock_bounce("eventType")
+        received = []
+
+        def sync_handler(sender, mail_obj, bounce_obj, raw_message, **kwargs):
+            received.append(("sync", mail_obj, bounce_obj, raw_message))
+
+        async def async_handler(sender, mail_obj, bounce_obj, raw_message, **kwargs):
+            received.append(("async", mail_obj, bounce_obj, raw_message))
+
+        bounce_received.connect(sync_handler)
+        bounce_received.connect(async_handler)
+
+        response = await self._post(notification)
+
+        self.assertEqual(response.status_code, 200)
+        raw_message = json.dumps(notification).encode()
+        self.assertCountEqual(
+            received,
+            [
+                ("sync", req_mail_obj, req_bounce_obj, raw_message),
+                ("async", req_mail_obj, req_bounce_obj, raw_message),
+            ],
+        )
+
+    async def test_send_without_asend(self):
+        """Without Signal.asend() (Django < 5.0) the signal is sent in a thread."""
+        _, _, notification = get_mock_bounce("eventType")
+        signal = mock.Mock(spec=["send"])
+        with mock.patch.dict("django_ses.views.ASYNC_EVENT_SIGNALS", {"Bounce": ("bounce", signal, "handle_bounce")}):
+            response = await self._post(notification)
+        self.assertEqual(response.status_code, 200)
+        signal.send.assert_called_once()
+
+    async def test_subscription_confirmation(self):
+        notification = {"Type": "SubscriptionConfirmation", "SubscribeURL": "https://sns.example.com/confirm"}
+        with mock.patch.object(ses_utils, "confirm_sns_subscription") as confirm:
+            response = await self._post(notification)
+        self.assertEqual(response.status_code, 200)
+        confirm.assert_called_once_with(notification)
+
+    async def test_overridden_handlers(self):
+        calls = []
+
+        class WebhookView(AsyncSESEventWebhookView):
+            def handle_bounce(self, notification, message):
+                calls.append(("bounce", message["eventType"]))
+
+            def handle_subscription_confirmation(self, notification):
+                calls.append(("subscription", notification["SubscribeURL"]))
+
+        bounce_received.connect(self._fail)
+        view = WebhookView.as_view()
+        notifications = [
+            get_mock_bounce("eventType")[2],
+            {"Type": "SubscriptionConfirmation", "SubscribeURL": "https://sns.example.com/confirm"},
+        ]
+        with mock.patch.object(ses_utils, "averify_event_message", mock.AsyncMock(return_value=True)):
+            for notification in notifications:
+                request = AsyncRequestFactory().post("/", json.dumps(notification), content_type="application/json")
+                response = await view(request)
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(calls, [("bounce", "Bounce"), ("subscription", "https://sns.example.com/confirm")])
+
+    def _fail(self, **kwargs):
+        raise AssertionError("The overridden handler should have been called instead.")
+
+    async def test_received_event_uses_sync_dispatch(self):
+        _, _, _, notification = get_mock_received_sns()
+        with mock.patch("django_ses.views.SESEventWebhookView.handle_received") as handle_received:
+            response = await self._post(notification)
+        self.assertEqual(response.status_code, 200)
+        handle_received.assert_called_once()
+
+    async def test_bad_signature(self):
+        _, _, notification = get_mock_click()
+        with mock.patch.object(ses_utils, "averify_event_message", mock.AsyncMock(return_value=False)):
+            response = await self.client.post(
+                reverse("async_event_webhook"), json.dumps(notification), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(AWS_SES_FIREHOSE_ACCESS_KEY="s3cret", AWS_SES_QUEUE_EVENTS=False)
+class FirehoseEventTestCase(TestCase):
+    """
+    Test the Kinesis Data Firehose event handler.
+    """
+
+    def setUp(self):
+        self._old_bounce_receivers = bounce_received.receivers
+        bounce_received.receivers = []
+        self.addCleanup(setattr, bounce_received, "receivers", self._old_bounce_receivers)
+        self.received = []
+        bounce_received.connect(self._receiver)
+        delivery_received.connect(self._receiver)
+        self.addCleanup(delivery_received.disconnect, self._receiver)
+
+    def _receiver(self, sender, mail_obj, raw_message, **kwargs):
+        self.received.append((mail_obj, raw_message))
+
+    def _records(self):
+        messages = [
+            json.loads(get_mock_bounce("eventType")[2]["Message"]),
+            json.loads(get_mock_delivery()[2]["Message"]),
+        ]
+        return [(json.dumps(message) + "\n").encode() for message in messages]
+
+    def _post(self, records, access_key="s3cret", gzipped=False):
+        body = json.dumps(
+            {
+                "requestId": "req-1",
+                "timestamp": 1578090901599,
+                "records": [{"data": base64.b64encode(record).decode()} for record in records],
+            }
+        ).encode()
+        headers = {"HTTP_X_AMZ_FIREHOSE_REQUEST_ID": "req-1", "HTTP_X_AMZ_FIREHOSE_ACCESS_KEY": access_key}
+        if gzipped:
+            body = gzip.compress(body)
+            headers["HTTP_CONTENT_ENCODING"] = "gzip"
+        return self.client.post(reverse("firehose_events"), body, content_type="application/json", **headers)
+
+    def test_handle_records(self):
+        records = self._records()
+        response = self._post(records)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["requestId"], "req-1")
+        self.assertIsInstance(response.json()["timestamp"], int)
+        self.assertNotIn("errorMessage", response.json())
+        self.assertEqual([raw_message for mail_obj, raw_message in self.received], records)
+        self.assertEqual(self.received[0][0], get_mock_bounce("eventType")[0])
+
+    def test_gzipped_request(self):
+        response = self._post(self._records(), gzipped=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.received), 2)
+
+    def test_invalid_access_key(self):
+        response = self._post(self._records(), access_key="wrong")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("errorMessage", response.json())
+        with override_settings(AWS_SES_FIREHOSE_ACCESS_KEY=None):
+            self.assertEqual(self._post(self._records(), access_key="").status_code, 401)
+        self.assertEqual(self.received, [])
+
+    def test_bad_body(self):
+        response = self.client.post(
+            reverse("firehose_events"), "{}", content_type="application/json", HTTP_X_AMZ_FIREHOSE_ACCESS_KEY="s3cret"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_failed_record(self):
+        with mock.patch.object(delivery_received, "send", side_effect=RuntimeError("receiver failed")):
+            response = self._post(self._records())
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["errorMessage"], "The records could not be processed.")
+
+    @override_settings(AWS_SES_QUEUE_EVENTS=True)
+    def test_queue_records(self):
+        with self.assertNumQueries(1):
+            response = self._post(self._records())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.received, [])
+        self.assertEqual(EventWorker().process_batch(), 2)
+        self.assertEqual(len(self.received), 2)
+
+
+class AsyncViewRequirementTestCase(SimpleTestCase):
+    def test_refused_before_django_4_1(self):
+        with mock.patch.object(django, "VERSION", (4, 0, 10, "final", 0)):
+            with self.assertRaisesMessage(ImproperlyConfigured, "requires Django 4.1 or later"):
+                AsyncSESEventWebhookView.as_view()